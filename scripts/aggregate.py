@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+내부자 거래 집계
+"""
+
+import heapq
+from datetime import date, timedelta
+
+EPOCH = date(1970, 1, 1)
+
+def parse_date(date_str):
+    """YYYYMMDD / YYYY-MM-DD 문자열을 date로 변환"""
+    clean = date_str.replace("-", "")
+    return date(int(clean[:4]), int(clean[4:6]), int(clean[6:8]))
+
+def epoch_day(date_str):
+    """날짜 문자열 -> 1970-01-01 기준 일수"""
+    return (parse_date(date_str) - EPOCH).days
+
+def _cumulate(daily):
+    """일별 값 -> 앞에 0을 붙인 누적합 (길이 len(daily) + 1)"""
+    prefix = [0] * (len(daily) + 1)
+    total = 0
+    for i, value in enumerate(daily):
+        total += value
+        prefix[i + 1] = total
+    return prefix
+
+def build_period_sums(trades):
+    """종목/섹터별 일별 누적합 (prefix sum)
+
+    dates는 거래가 있는 날짜(1970-01-01 기준 일수)를 정렬한 공통 축이고,
+    buy/sell/count 배열은 길이 len(dates) + 1의 누적합이다 (P[k] = dates[:k] 구간 합).
+    임의의 [from, to] 기간 합은 두 항목의 차 P[hi] - P[lo]로 구한다.
+    """
+    days = sorted({epoch_day(t["report_date"]) for t in trades})
+    day_index = {d: i for i, d in enumerate(days)}
+    n = len(days)
+
+    stocks = {}
+    sectors = {}
+
+    def bucket(groups, key, **info):
+        if key not in groups:
+            groups[key] = dict(info, buy=[0] * n, sell=[0] * n, count=[0] * n)
+        return groups[key]
+
+    for t in trades:
+        i = day_index[epoch_day(t["report_date"])]
+        sector = t.get("sector") or "기타"
+        targets = (
+            bucket(stocks, t["stock_code"], stock_code=t["stock_code"], name=t["corp_name"], sector=sector),
+            bucket(sectors, sector, sector=sector),
+        )
+        for target in targets:
+            target["count"][i] += 1
+            if t["trade_type"] == "매수":
+                target["buy"][i] += t["amount"]
+            elif t["trade_type"] == "매도":
+                target["sell"][i] += t["amount"]
+
+    for group in (stocks, sectors):
+        for entry in group.values():
+            for field in ("buy", "sell", "count"):
+                entry[field] = _cumulate(entry[field])
+
+    return {
+        "dates": days,
+        "stocks": list(stocks.values()),
+        "sectors": list(sectors.values()),
+    }
+
+RESOLUTIONS = ("daily", "weekly", "monthly")
+
+def bucket_start(day, resolution):
+    """일수가 속한 구간(일/주/월)의 시작일 (주는 월요일 시작)"""
+    if resolution == "weekly":
+        return day - (EPOCH + timedelta(days=day)).weekday()
+    if resolution == "monthly":
+        d = EPOCH + timedelta(days=day)
+        return (date(d.year, d.month, 1) - EPOCH).days
+    return day
+
+def build_chart_series(trades):
+    """일/주/월 해상도별 매수·매도 합계 시계열
+
+    각 해상도는 {"start": [...], "buy": [...], "sell": [...]} 형태이며 start는 구간 시작일
+    (1970-01-01 기준 일수)이다. 매수/매도가 없는 구간은 포함하지 않는다.
+    """
+    flows = [
+        (epoch_day(t["report_date"]), t["trade_type"] == "매수", t["amount"])
+        for t in trades if t["trade_type"] in ("매수", "매도")
+    ]
+    series = {}
+    for resolution in RESOLUTIONS:
+        buckets = {}
+        for day, is_buy, amount in flows:
+            bucket = buckets.setdefault(bucket_start(day, resolution), [0, 0])
+            bucket[0 if is_buy else 1] += amount
+        starts = sorted(buckets)
+        series[resolution] = {
+            "start": starts,
+            "buy": [buckets[s][0] for s in starts],
+            "sell": [buckets[s][1] for s in starts],
+        }
+    return series
+
+def _sentiment(net_amount):
+    if net_amount > 0:
+        return "bullish"
+    if net_amount < 0:
+        return "bearish"
+    return "neutral"
+
+def _add_flow(groups, key, info, t):
+    g = groups.get(key)
+    if g is None:
+        g = groups[key] = dict(info, net_amount=0, buy_amount=0, sell_amount=0, count=0)
+    g["count"] += 1
+    if t["trade_type"] == "매수":
+        g["buy_amount"] += t["amount"]
+    elif t["trade_type"] == "매도":
+        g["sell_amount"] += t["amount"]
+
+def _finish_flows(groups):
+    """키별 매수/매도/순매수 합계 (등장 순서 유지)"""
+    for g in groups.values():
+        g["net_amount"] = g["buy_amount"] - g["sell_amount"]
+        g["sentiment"] = _sentiment(g["net_amount"])
+    return list(groups.values())
+
+class Aggregator:
+    """거래를 받는 대로 누적하는 대시보드 집계 (스트리밍 수집용)
+
+    종목/섹터/일별 합계는 dict에 더하고 큰손 거래는 크기 top_n인 최소 힙으로만 들고 있으므로
+    add()는 거래당 O(log top_n)이고, result()는 정렬만 남는다.
+    같은 순서로 넣으면 build_aggregates와 결과가 같다 (금액이 같으면 먼저 들어온 거래가 앞).
+    """
+
+    def __init__(self, top_n=20):
+        self.top_n = top_n
+        self.stocks = {}
+        self.sectors = {}
+        self.daily = {}
+        self.big = []  # (금액, -순번, 거래) 최소 힙
+        self.count = 0
+
+    def add(self, t):
+        self.count += 1
+        sector = t.get("sector") or "기타"
+        _add_flow(self.stocks, t["stock_code"], {"stock_code": t["stock_code"], "name": t["corp_name"]}, t)
+        _add_flow(self.sectors, sector, {"sector": sector}, t)
+
+        entry = (t["amount"], -self.count, t)
+        if len(self.big) < self.top_n:
+            heapq.heappush(self.big, entry)
+        elif self.big and entry > self.big[0]:
+            heapq.heapreplace(self.big, entry)
+
+        if t["trade_type"] in ("매수", "매도"):
+            day = self.daily.get(t["report_date"])
+            if day is None:
+                day = self.daily[t["report_date"]] = {"date": t["report_date"], "buy": 0, "sell": 0}
+            day["buy" if t["trade_type"] == "매수" else "sell"] += t["amount"]
+
+    def extend(self, trades):
+        for t in trades:
+            self.add(t)
+
+    def result(self):
+        """대시보드 집계 (summary, hotStocks, bigPlayers, sectorSentiment, dailyData)"""
+        stocks = _finish_flows(self.stocks)
+        sectors = _finish_flows(self.sectors)
+
+        total_buy = sum(s["buy_amount"] for s in stocks)
+        total_sell = sum(s["sell_amount"] for s in stocks)
+        net_amount = total_buy - total_sell
+        summary = {
+            "total_buy": total_buy,
+            "total_sell": total_sell,
+            "net_amount": net_amount,
+            "buy_stocks": sum(1 for s in stocks if s["net_amount"] > 0),
+            "sell_stocks": sum(1 for s in stocks if s["net_amount"] < 0),
+            "total_trades": self.count,
+            "sentiment": _sentiment(net_amount),
+        }
+
+        by_abs_net = lambda g: -abs(g["net_amount"])
+        hot_stocks = sorted(stocks, key=by_abs_net)[:self.top_n]
+        sector_sentiment = sorted(sectors, key=by_abs_net)
+
+        big_players = [
+            {
+                "name": t["insider_name"],
+                "corp_name": t["corp_name"],
+                "position": t["position"],
+                "type": t["trade_type"],
+                "amount": t["amount"],
+                "date": t["report_date"],
+            }
+            for _, _, t in sorted(self.big, key=lambda e: (-e[0], -e[1]))
+        ]
+
+        return {
+            "summary": summary,
+            "hotStocks": hot_stocks,
+            "bigPlayers": big_players,
+            "sectorSentiment": sector_sentiment,
+            "dailyData": [self.daily[d] for d in sorted(self.daily)],
+        }
+
+def build_aggregates(trades, top_n=20):
+    """대시보드 집계 (summary, hotStocks, bigPlayers, sectorSentiment, dailyData)"""
+    aggregator = Aggregator(top_n)
+    aggregator.extend(trades)
+    return aggregator.result()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+다년치 거래 열 지향 아카이브 (numpy memmap)
+
+    python scripts/archive.py build      # data/trades 파티션 -> data/archive (바뀐 날부터 이어서)
+    python scripts/archive.py stats      # 전체 기간 집계 (콜드 스타트 시간, RSS 출력)
+
+    data/archive/meta.json        행 수, 열 dtype, 날짜별 (파티션 [크기, 수정 시각], 첫 행)
+    data/archive/strings.json     사전 인코딩 문자열 표 (종목, 보고자, 직위, 분류, 거래 유형)
+    data/archive/<열>.npy         고정 폭 열 (공시일 순 정렬)
+
+열은 .npy 파일을 np.load(mmap_mode="r")로 열어 복사 없이 읽는다. 페이지 캐시에 올라온
+부분만 메모리를 쓰고, 집계는 CHUNK_ROWS행씩 잘라 계산하므로 임시 배열도 청크 크기로 제한된다.
+공시일 순이라 날짜 범위는 day 열의 searchsorted로 행 범위가 된다.
+변동 사유(change_reason) 원문은 담지 않는다 (분류 category만 유지).
+
+numpy가 필요하다 (pip install numpy). 일일 파이프라인은 이 모듈을 쓰지 않는다.
+"""
+
+import argparse
+import json
+import resource
+import sys
+import time
+from array import array
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from aggregate import EPOCH, epoch_day
+from store import TRADES_DIR, partition_days, partition_path, partition_stamp, read_partition
+from trade import Trade
+
+ROOT = Path(__file__).parent.parent
+ARCHIVE_DIR = ROOT / "data" / "archive"
+CHUNK_ROWS = 1 << 20
+
+# 열 이름 -> dtype (array 모듈 형식 문자와 같은 폭)
+COLUMNS = {
+    "day": "i4",            # 1970-01-01 기준 일수
+    "stock": "i4",          # strings["stock"] 인덱스
+    "insider": "i4",        # strings["insider"] 인덱스
+    "position": "i4",
+    "category": "i1",
+    "trade_type": "i1",
+    "shares_before": "i8",
+    "shares_after": "i8",
+    "shares_change": "i8",
+    "price": "i8",
+    "amount": "i8",
+    "rcept_no": "i8",       # 14자리 접수번호 (없으면 0)
+}
+TYPECODES = {"i1": "b", "i4": "i", "i8": "q"}
+TABLES = ("stock", "insider", "position", "category", "trade_type")
+
+# 거래 필드 -> (문자열 표, 표 항목 안 위치) / 수치 열
+STRING_FIELDS = {
+    "stock_code": ("stock", 0),
+    "corp_code": ("stock", 1),
+    "corp_name": ("stock", 2),
+    "sector": ("stock", 3),
+    "insider_name": ("insider", None),
+    "position": ("position", None),
+    "category": ("category", None),
+    "trade_type": ("trade_type", None),
+}
+NUMERIC_FIELDS = ("shares_before", "shares_after", "shares_change", "price", "amount")
+
+class Encoder:
+    """값 -> 정수 id (처음 나온 순서)"""
+
+    def __init__(self, values=()):
+        self.values = [tuple(v) if isinstance(v, list) else v for v in values]
+        self.ids = {v: i for i, v in enumerate(self.values)}
+
+    def __call__(self, value):
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+def load_meta(archive_dir=ARCHIVE_DIR):
+    path = archive_dir / "meta.json"
+    if not path.exists():
+        return {"rows": 0, "days": [], "columns": COLUMNS}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_strings(archive_dir=ARCHIVE_DIR):
+    path = archive_dir / "strings.json"
+    if not path.exists():
+        return {name: [] for name in TABLES}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def encode_trades(trades, encoders, buffers):
+    """거래 목록을 열 버퍼에 덧붙인다 (추가한 행 수 반환)"""
+    stock, insider = encoders["stock"], encoders["insider"]
+    position, category, trade_type = encoders["position"], encoders["category"], encoders["trade_type"]
+    n = 0
+    for t in trades:
+        buffers["day"].append(epoch_day(t["report_date"]))
+        buffers["stock"].append(stock((t["stock_code"], t["corp_code"], t["corp_name"], t.get("sector") or "기타")))
+        buffers["insider"].append(insider(t["insider_name"]))
+        buffers["position"].append(position(t["position"]))
+        buffers["category"].append(category(t["category"]))
+        buffers["trade_type"].append(trade_type(t["trade_type"]))
+        buffers["shares_before"].append(t["shares_before"])
+        buffers["shares_after"].append(t["shares_after"])
+        buffers["shares_change"].append(t["shares_change"])
+        buffers["price"].append(t["price"])
+        buffers["amount"].append(t["amount"])
+        rcept_no = t.get("rcept_no") or ""
+        buffers["rcept_no"].append(int(rcept_no) if rcept_no.isdigit() else 0)
+        n += 1
+    return n
+
+def write_column(path, keep, old, buffer, dtype):
+    """기존 열 앞 keep행 + 새 버퍼 -> .npy (임시 파일에 쓰고 교체)"""
+    tmp = path.with_suffix(".tmp.npy")
+    column = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.dtype("<" + dtype), shape=(keep + len(buffer),))
+    if keep:
+        column[:keep] = old[:keep]
+    if len(buffer):
+        column[keep:] = np.frombuffer(buffer, dtype=np.dtype(dtype))
+    column.flush()
+    del column
+    tmp.replace(path)
+
+def build_archive(trades_dir=TRADES_DIR, archive_dir=ARCHIVE_DIR):
+    """파티션 -> 아카이브 (크기/수정 시각이 같은 앞쪽 날짜는 유지하고 바뀐 날부터 다시 인코딩)
+
+    반환: (전체 행 수, 새로 인코딩한 행 수)
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    meta = load_meta(archive_dir)
+    current = [(day, partition_stamp(partition_path(day, trades_dir))) for day in partition_days(trades_dir)]
+
+    keep_days = 0
+    for (day, stamp, _), now in zip(meta["days"], current):
+        if (day, stamp) != now:
+            break
+        keep_days += 1
+    keep = meta["days"][keep_days][2] if keep_days < len(meta["days"]) else meta["rows"]
+
+    encoders = {name: Encoder(values) for name, values in load_strings(archive_dir).items()}
+    buffers = {name: array(TYPECODES[dtype]) for name, dtype in COLUMNS.items()}
+    days = [list(entry) for entry in meta["days"][:keep_days]]
+    rows = keep
+    for day, stamp in current[keep_days:]:
+        days.append([day, stamp, rows])
+        rows += encode_trades(read_partition(partition_path(day, trades_dir)), encoders, buffers)
+
+    _save(archive_dir, keep, buffers, encoders, rows, days)
+    return rows, rows - keep
+
+def write_archive(trades, archive_dir):
+    """공시일 순 거래 -> 새 아카이브 (파티션 없이, 벤치마크용 - 다음 build는 전체를 다시 인코딩)"""
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    encoders = {name: Encoder() for name in TABLES}
+    buffers = {name: array(TYPECODES[dtype]) for name, dtype in COLUMNS.items()}
+    rows = encode_trades(trades, encoders, buffers)
+    _save(archive_dir, 0, buffers, encoders, rows, [])
+    return rows
+
+def _save(archive_dir, keep, buffers, encoders, rows, days):
+    for name, dtype in COLUMNS.items():
+        path = archive_dir / f"{name}.npy"
+        old = np.load(path, mmap_mode="r") if keep else None
+        write_column(path, keep, old, buffers[name], dtype)
+        del old
+        buffers[name] = None  # 쓴 버퍼는 바로 해제
+
+    with open(archive_dir / "strings.json", "w", encoding="utf-8") as f:
+        json.dump({name: encoders[name].values for name in TABLES}, f, ensure_ascii=False)
+    with open(archive_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"rows": rows, "columns": COLUMNS, "days": days}, f)
+
+class Archive:
+    """memmap 열 + 문자열 표 (읽기 전용)"""
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        meta = load_meta(archive_dir)
+        if not meta["rows"]:
+            raise FileNotFoundError(f"아카이브가 없습니다: {archive_dir} (python scripts/archive.py build)")
+        self.rows = meta["rows"]
+        self.columns = {name: np.load(archive_dir / f"{name}.npy", mmap_mode="r") for name in meta["columns"]}
+        self.strings = load_strings(archive_dir)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row_range(self, start=None, end=None):
+        """날짜 범위 [start, end] -> 행 범위 [lo, hi) (day 열 이분 탐색)"""
+        day = self.columns["day"]
+        lo = int(np.searchsorted(day, epoch_day(start), "left")) if start else 0
+        hi = int(np.searchsorted(day, epoch_day(end), "right")) if end else self.rows
+        return lo, max(lo, hi)
+
+    def ids(self, field, match):
+        """문자열 필드 값이 match(값)를 만족하는 표 id 배열"""
+        table, position = STRING_FIELDS[field]
+        values = self.strings[table]
+        if position is not None:
+            values = [v[position] for v in values]
+        return np.array([i for i, v in enumerate(values) if match(v)], dtype=np.int32)
+
+    def condition(self, field, op, value):
+        """조건 -> 청크 판별 함수 f(lo, hi) -> bool 배열
+
+        op: "in"/"not in"(값 집합), "~"(부분 문자열), 비교 연산(수치 필드)
+        """
+        if field in STRING_FIELDS:
+            column = self.columns[STRING_FIELDS[field][0]]
+            if op == "~":
+                ids = self.ids(field, lambda v: value in v)
+            elif op in ("in", "not in"):
+                ids = self.ids(field, lambda v: v in value)
+            else:
+                raise ValueError(f"문자열 필드에 쓸 수 없는 연산: {field} {op}")
+            invert = op == "not in"
+            return lambda lo, hi: np.isin(column[lo:hi], ids, invert=invert)
+        if field in NUMERIC_FIELDS:
+            column, compare = self.columns[field], _COMPARE[op]
+            return lambda lo, hi: compare(column[lo:hi], value)
+        raise ValueError(f"아카이브에 없는 필드: {field}")
+
+    def select(self, start=None, end=None, conditions=()):
+        """조건에 맞는 행 번호 (int64 배열, 날짜 순)"""
+        lo, hi = self.row_range(start, end)
+        checks = [self.condition(*c) for c in conditions]
+        if not checks:
+            return np.arange(lo, hi, dtype=np.int64)
+        found = []
+        for a in range(lo, hi, CHUNK_ROWS):
+            b = min(hi, a + CHUNK_ROWS)
+            mask = checks[0](a, b)
+            for check in checks[1:]:
+                mask &= check(a, b)
+            found.append(np.flatnonzero(mask) + a)
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def page(self, rows, limit=None, sort="date"):
+        """행 번호 -> 표시 순서의 Trade 목록 (최신순 또는 금액순, limit건만 만든다)"""
+        if sort == "amount":
+            rows = rows[np.argsort(-self.columns["amount"][rows], kind="stable")]
+        else:
+            rows = rows[::-1]
+        return [self.trade(int(i)) for i in rows[:limit]]
+
+    def total(self, rows, field="amount"):
+        return int(self.columns[field][rows].sum())
+
+    def trade(self, i):
+        """행 하나 -> Trade (표시용, change_reason은 비어 있음)"""
+        c = {name: int(column[i]) for name, column in self.columns.items()}
+        stock_code, corp_code, corp_name, sector = self.strings["stock"][c["stock"]]
+        return Trade(
+            rcept_no=f"{c['rcept_no']:014d}" if c["rcept_no"] else "",
+            corp_name=corp_name,
+            corp_code=corp_code,
+            report_date=(EPOCH + timedelta(days=c["day"])).isoformat(),
+            insider_name=self.strings["insider"][c["insider"]],
+            position=self.strings["position"][c["position"]],
+            shares_before=c["shares_before"],
+            shares_after=c["shares_after"],
+            shares_change=c["shares_change"],
+            trade_type=self.strings["trade_type"][c["trade_type"]],
+            stock_code=stock_code,
+            sector=sector,
+            price=c["price"],
+            amount=c["amount"],
+            category=self.strings["category"][c["category"]],
+        )
+
+_COMPARE = {
+    ">=": np.greater_equal, ">": np.greater, "<=": np.less_equal,
+    "<": np.less, "=": np.equal, "!=": np.not_equal,
+}
+
+def _type_id(archive, name):
+    values = archive.strings["trade_type"]
+    return values.index(name) if name in values else -1
+
+def summarize(archive, start=None, end=None, top_n=20):
+    """기간 전체 집계: 매수/매도 합계, 월별 순매수, 종목별 매수 상위 (청크 단위)"""
+    lo, hi = archive.row_range(start, end)
+    buy_id, sell_id = _type_id(archive, "매수"), _type_id(archive, "매도")
+    n_stocks = len(archive.strings["stock"])
+    day, kind, amount, stock = archive["day"], archive["trade_type"], archive["amount"], archive["stock"]
+
+    totals = {"매수": 0, "매도": 0}
+    monthly = {}
+    stock_buy = np.zeros(n_stocks, dtype=np.int64)
+    stock_sell = np.zeros(n_stocks, dtype=np.int64)
+    for a in range(lo, hi, CHUNK_ROWS):
+        b = min(hi, a + CHUNK_ROWS)
+        kinds, amounts = kind[a:b], amount[a:b]
+        buys = np.where(kinds == buy_id, amounts, 0)
+        sells = np.where(kinds == sell_id, amounts, 0)
+        totals["매수"] += int(buys.sum())
+        totals["매도"] += int(sells.sum())
+
+        # 공시일 순이라 월 경계는 이분 탐색으로, 월별 합은 reduceat으로 (int64 정확 합)
+        days = day[a:b]
+        first, last = EPOCH + timedelta(days=int(days[0])), EPOCH + timedelta(days=int(days[-1]))
+        months = []
+        m = date(first.year, first.month, 1)
+        while m <= last:
+            months.append(m)
+            m = date(m.year + m.month // 12, m.month % 12 + 1, 1)
+        bounds = np.searchsorted(days, [(m - EPOCH).days for m in months])
+        nonempty = bounds < np.r_[bounds[1:], len(days)]  # reduceat은 빈 구간에 0을 주지 않으므로 제외
+        months = [m for m, keep in zip(months, nonempty) if keep]
+        bounds = bounds[nonempty]
+        for m, buy, sell in zip(months, np.add.reduceat(buys, bounds), np.add.reduceat(sells, bounds)):
+            key = m.strftime("%Y-%m")
+            entry = monthly.setdefault(key, [0, 0])
+            entry[0] += int(buy)
+            entry[1] += int(sell)
+
+        # 종목별 합: 정수 정확도를 위해 정렬 후 reduceat
+        stocks = stock[a:b]
+        order = np.argsort(stocks, kind="stable")
+        sorted_stocks = stocks[order]
+        starts = np.flatnonzero(np.r_[True, sorted_stocks[1:] != sorted_stocks[:-1]])
+        keys = sorted_stocks[starts]
+        stock_buy[keys] += np.add.reduceat(buys[order], starts)
+        stock_sell[keys] += np.add.reduceat(sells[order], starts)
+
+    top = np.argsort(-stock_buy, kind="stable")[:top_n]
+    return {
+        "rows": hi - lo,
+        "from": (EPOCH + timedelta(days=int(day[lo]))).isoformat() if hi > lo else None,
+        "to": (EPOCH + timedelta(days=int(day[hi - 1]))).isoformat() if hi > lo else None,
+        "buyAmount": totals["매수"],
+        "sellAmount": totals["매도"],
+        "monthly": [{"month": k, "buy": v[0], "sell": v[1], "net": v[0] - v[1]} for k, v in sorted(monthly.items())],
+        "topBuys": [
+            {
+                "stock_code": archive.strings["stock"][i][0],
+                "name": archive.strings["stock"][i][2],
+                "buy": int(stock_buy[i]),
+                "sell": int(stock_sell[i]),
+            }
+            for i in top if stock_buy[i] > 0
+        ],
+    }
+
+def peak_rss_mb():
+    """이 프로세스의 최대 RSS (ru_maxrss는 exec 전 부모 값을 물려받으므로 /proc의 VmHWM 우선)"""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="열 지향 거래 아카이브")
+    parser.add_argument("command", choices=("build", "stats"))
+    parser.add_argument("--dir", type=Path, default=ARCHIVE_DIR, help="아카이브 디렉터리")
+    parser.add_argument("--from", dest="start", help="집계 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="집계 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--json", action="store_true", help="집계 결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "build":
+        rows, added = build_archive(archive_dir=args.dir)
+        print(f"✅ 아카이브 {rows:,}행 (새로 인코딩 {added:,}행, {time.perf_counter() - started:.1f}s): {args.dir}")
+        return 0
+
+    archive = Archive(args.dir)
+    summary = summarize(archive, args.start, args.end)
+    elapsed = time.perf_counter() - started
+    size = sum(column.nbytes for column in archive.columns.values())
+    rss = peak_rss_mb()
+    if args.json:
+        print(json.dumps(dict(summary, seconds=round(elapsed, 3), peak_rss_mb=round(rss, 1), column_bytes=size),
+                         ensure_ascii=False))
+        return 0
+    print(f"📦 {summary['rows']:,}행 ({summary['from']} ~ {summary['to']}), 열 {size / 2**20:,.0f}MB")
+    print(f"   매수 {summary['buyAmount']:,}원 · 매도 {summary['sellAmount']:,}원")
+    for entry in summary["topBuys"][:10]:
+        print(f"   {entry['name']:<12} 매수 {entry['buy']:,}원")
+    print(f"⏱️ {elapsed:.2f}s · 최대 RSS {rss:,.0f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+과거 내부자 거래 백필 (병렬, 체크포인트, 재개 가능)
+
+    python scripts/backfill.py --since 2016-01-01 --workers 4 --rate 600 --max-calls 18000
+
+작업 단위는 (종목 × 보고서 종류)이다. DART majorstock/elestock API는 기간 조건 없이
+종목의 전체 공시를 돌려주므로 월 단위로 더 나누면 같은 응답을 여러 번 받게 된다.
+완료된 단위는 data/backfill/units/에 파싱된 거래로 저장되어 그 자체가 체크포인트가 되고,
+다시 실행하면 남은 단위만 조회한다. 요청은 분당 --rate 이하로 제한하며 일일 한도
+초과(status 020)나 --max-calls 소진 시 진행 중인 단위만 마치고 멈춘다.
+
+모든 단위가 끝나면 daily 작업과 같은 저장소(data/trades/ 일별 파티션)에 거래를 덧붙이고
+전체 기간 요약을 data/history.json에 저장한다. 철회 공시는 백필한 종목의 --since 이후
+것만 지우므로 --companies로 일부 종목만 백필해도 다른 종목의 파티션은 그대로 남는다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import requests
+
+import metrics
+from trade import as_dict, loads_trades
+from fetch_data import (
+    COMPANIES_PATH, REPORTS, QuotaExceeded, build_data, fetch_reports, load_companies, parse_report, save_data,
+)
+from store import TRADES_DIR
+
+ROOT = Path(__file__).parent.parent
+BACKFILL_DIR = ROOT / "data" / "backfill"
+HISTORY_PATH = ROOT / "data" / "history.json"
+DEFAULT_SINCE = "2016-01-01"
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 600  # 분당 요청 수
+
+class RateLimiter:
+    """스레드 공용 요청 간격 제한 (분당 rate회)"""
+
+    def __init__(self, rate_per_minute):
+        self.interval = 60 / rate_per_minute
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+class LimitedSession:
+    """스레드별 requests.Session + 공용 RateLimiter + 요청 예산"""
+
+    def __init__(self, limiter, max_calls=None):
+        self.limiter = limiter
+        self.max_calls = max_calls
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            if self.max_calls is not None and self.calls >= self.max_calls:
+                raise QuotaExceeded(f"요청 예산 {self.max_calls}건 소진")
+            self.calls += 1
+        self.limiter.acquire()
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session.get(url, **kwargs)
+
+def unit_path(corp_code, report, backfill_dir=BACKFILL_DIR):
+    return backfill_dir / "units" / f"{corp_code}_{report}.json"
+
+def pending_units(companies, backfill_dir=BACKFILL_DIR):
+    """체크포인트가 없는 (종목, 보고서) 작업 단위"""
+    return [
+        (company, report)
+        for company in companies
+        for report in REPORTS
+        if not unit_path(company["corp_code"], report, backfill_dir).exists()
+    ]
+
+def write_atomic(path, payload):
+    """임시 파일에 쓴 뒤 교체 (중단되어도 반쯤 쓴 체크포인트가 남지 않음)"""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def run_unit(session, api_key, company, report, since, backfill_dir=BACKFILL_DIR):
+    """작업 단위 하나 조회 후 체크포인트 저장 (저장한 거래 수 반환)"""
+    rows = fetch_reports(session, api_key, report, company["corp_code"])
+    trades = [parse_report(report, row, company) for row in rows]
+    trades = [t for t in trades if t["report_date"] >= since]
+    write_atomic(unit_path(company["corp_code"], report, backfill_dir), [as_dict(t) for t in trades])
+    metrics.count("units_done")
+    metrics.count("trades_out", len(trades))
+    return len(trades)
+
+def run_backfill(api_key, companies, since, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                 max_calls=None, backfill_dir=BACKFILL_DIR, session=None):
+    """남은 작업 단위를 병렬 조회 (모든 단위 완료 여부 반환)"""
+    (backfill_dir / "units").mkdir(parents=True, exist_ok=True)
+    units = pending_units(companies, backfill_dir)
+    total = len(companies) * len(REPORTS)
+    print(f"📦 작업 단위 {total - len(units)}/{total} 완료, {len(units)}개 남음")
+    if not units:
+        return True
+
+    session = session or LimitedSession(RateLimiter(rate), max_calls)
+    stop = threading.Event()
+    done = [0]
+    lock = threading.Lock()
+
+    def work(unit):
+        if stop.is_set():
+            return
+        company, report = unit
+        try:
+            run_unit(session, api_key, company, report, since, backfill_dir)
+        except QuotaExceeded as e:
+            with lock:
+                if not stop.is_set():
+                    print(f"⏸️ {e} - 다음 실행에서 이어서 진행")
+                    stop.set()
+            return
+        except (requests.RequestException, RuntimeError, ValueError) as e:
+            metrics.count("fetch_errors")
+            print(f"⚠️ {company['corp_name']} {report} 조회 실패: {e}")
+            return
+        with lock:
+            done[0] += 1
+            if done[0] % 100 == 0:
+                print(f"  {done[0]}/{len(units)} 단위 완료")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(work, units))
+
+    remaining = len(pending_units(companies, backfill_dir))
+    print(f"✅ 이번 실행 {done[0]}개 단위 완료, {remaining}개 남음")
+    return remaining == 0
+
+def merge_units(companies, backfill_dir=BACKFILL_DIR):
+    """체크포인트를 daily 작업과 같은 순서(종목 순, 종목 안에서는 날짜 순)로 합친다"""
+    trades = []
+    for company in companies:
+        company_trades = []
+        for report in REPORTS:
+            company_trades.extend(loads_trades(unit_path(company["corp_code"], report, backfill_dir).read_bytes()))
+        company_trades.sort(key=lambda t: (t["report_date"], t["rcept_no"]))
+        trades.extend(company_trades)
+    return trades
+
+def save_history(companies, since, output=HISTORY_PATH, backfill_dir=BACKFILL_DIR, trades_dir=TRADES_DIR):
+    """체크포인트를 파티션에 반영하고 요약 저장 (백필한 종목의 since 이후만 정답 집합으로, 거래 목록 반환)"""
+    trades = merge_units(companies, backfill_dir)
+    checked = [c["corp_code"] for c in companies]
+    save_data(build_data(trades, period=f"{since}~"), output, trades_dir, checked, since)
+    return trades
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DART 내부자 거래 과거 데이터 백필")
+    parser.add_argument("--since", default=DEFAULT_SINCE, help="수집 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="분당 최대 요청 수")
+    parser.add_argument("--max-calls", type=int, help="이번 실행의 요청 예산 (일일 한도 이하로)")
+    parser.add_argument("--companies", type=Path, default=COMPANIES_PATH)
+    parser.add_argument("--output", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 지우고 처음부터")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("DART_API_KEY")
+    if not api_key:
+        raise SystemExit("❌ DART_API_KEY 환경변수가 없습니다")
+    since = date.fromisoformat(args.since).isoformat()
+    if args.reset:
+        shutil.rmtree(BACKFILL_DIR / "units", ignore_errors=True)
+
+    metrics.start_run("backfill")
+    try:
+        companies = load_companies(args.companies)
+        with metrics.stage("fetch"):
+            complete = run_backfill(api_key, companies, since, args.workers, args.rate, args.max_calls)
+        if not complete:
+            return 2
+        with metrics.stage("aggregate"):
+            trades = save_history(companies, since, args.output)
+        print(f"✅ 백필 저장 완료: {args.output} ({len(trades)}건)")
+        return 0
+    finally:
+        metrics.write_metrics()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
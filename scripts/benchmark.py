@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+수집 → 집계 → HTML 생성 벤치마크
+
+합성 데이터(synthetic_data)로 DART 응답을 흉내 내는 스텁 세션을 만들고,
+거래 규모별로 단계별 소요 시간과 출력 크기를 측정해 JSON으로 저장한다.
+
+    python scripts/benchmark.py --sizes 10000,100000 --check benchmarks/thresholds.json
+    python scripts/benchmark.py --codec --sizes 1000000 --output benchmarks/codec.json
+    python scripts/benchmark.py --archive --sizes 10000000 --output benchmarks/archive.json
+    python scripts/benchmark.py --sizes 100000 --latency 2   # 요청당 2ms 지연으로 수집/집계 겹침 확인
+"""
+
+import argparse
+import gzip
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fetch_data import KST, DataBuilder, build_data, fetch_trades, iter_company_trades
+from generate_html import render_html
+from stream import bounded
+from synthetic_data import END_DATE, default_company_count, generate_companies, generate_trades
+from trade import BACKEND, as_dict, dumps_trade, loads_trades
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results.json"
+
+class StubResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+class StubSession:
+    """DART 지분공시 API 스텁 (corp_code별 majorstock/elestock 응답을 미리 직렬화)"""
+
+    def __init__(self, trades, latency=0.0):
+        rows = defaultdict(list)
+        for t in trades:
+            report = "elestock" if t["position"] else "majorstock"
+            rows[(report, t["corp_code"])].append(to_dart_row(report, t))
+        self.responses = {
+            key: json.dumps({"status": "000", "message": "정상", "list": value}, ensure_ascii=False).encode("utf-8")
+            for key, value in rows.items()
+        }
+        self.empty = json.dumps({"status": "013", "message": "조회된 데이타가 없습니다."}).encode("utf-8")
+        self.calls = 0
+        self.latency = latency  # 요청당 지연 (초, 네트워크 대기 흉내)
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        report = url.rsplit("/", 1)[-1].split(".")[0]
+        return StubResponse(self.responses.get((report, params["corp_code"]), self.empty))
+
+def to_dart_row(report, trade):
+    """거래 레코드 -> DART 응답 행 (parse_report의 역변환)"""
+    signed = trade["shares_after"] - trade["shares_before"]
+    row = {
+        "rcept_no": trade["rcept_no"],
+        "rcept_dt": trade["report_date"].replace("-", ""),
+        "corp_code": trade["corp_code"],
+        "corp_name": trade["corp_name"],
+        "repror": trade["insider_name"],
+    }
+    if report == "elestock":
+        row.update({
+            "isu_exctv_rgist_at": "등기임원",
+            "isu_exctv_ofcps": trade["position"],
+            "isu_main_shrholdr": "-",
+            "sp_stock_lmp_cnt": f"{trade['shares_after']:,}",
+            "sp_stock_lmp_irds_cnt": f"{signed:,}",
+        })
+    else:
+        row.update({
+            "report_tp": "일반",
+            "stkqy": f"{trade['shares_after']:,}",
+            "stkqy_irds": f"{signed:,}",
+            "report_resn": trade["change_reason"],
+        })
+    return row
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round(time.perf_counter() - start, 3)
+
+def stream_build(companies, session, now):
+    """수집과 집계를 겹쳐 돌린 insider.json 데이터 (pipeline fetch와 같은 방식)"""
+    builder = DataBuilder()
+    for _, company_trades in bounded(iter_company_trades("stub", companies, session=session, today=END_DATE)):
+        builder.add(company_trades)
+    return builder.build(now=now)
+
+def run_size(n_trades, seed=42, latency=0.0):
+    """거래 n_trades건 규모의 단계별 측정 (stream_s: 수집+집계를 겹쳐 돌린 시간)"""
+    start = time.perf_counter()
+    companies = generate_companies(default_company_count(n_trades), seed)
+    session = StubSession(generate_trades(n_trades, companies, seed), latency)
+    generate_s = round(time.perf_counter() - start, 3)
+    now = datetime.combine(END_DATE, datetime.min.time(), KST)
+
+    streamed, stream_s = timed(stream_build, companies, session, now)
+    streamed = {key: streamed[key] for key in ("summary", "hotStocks", "bigPlayers", "dailyData")}
+    session.calls = 0
+
+    trades, fetch_s = timed(fetch_trades, "stub", companies, session=session, today=END_DATE)
+    if len(trades) != n_trades:
+        raise RuntimeError(f"스텁 수집 결과 불일치: {len(trades)} != {n_trades}")
+    api_calls = session.calls
+    del session
+
+    data, aggregate_s = timed(build_data, trades, now=now)
+    if any(data[key] != value for key, value in streamed.items()):
+        raise RuntimeError("스트리밍 집계 결과 불일치")
+    del streamed
+    html, render_s = timed(render_html, data)
+
+    html_bytes = html.encode("utf-8")
+    del html
+    html_size = (len(html_bytes), len(gzip.compress(html_bytes, 6)))
+    del html_bytes
+    data["trades"] = [as_dict(t) for t in data["trades"]]
+    json_bytes = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    json_size = (len(json_bytes), len(gzip.compress(json_bytes, 6)))
+    return {
+        "trades": n_trades,
+        "companies": len(companies),
+        "api_calls": api_calls,
+        "generate_s": generate_s,
+        "fetch_s": fetch_s,
+        "aggregate_s": aggregate_s,
+        "stream_s": stream_s,
+        "render_s": render_s,
+        "html_bytes": html_size[0],
+        "html_gzip_bytes": html_size[1],
+        "json_bytes": json_size[0],
+        "json_gzip_bytes": json_size[1],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def traced_bytes(fn, *args):
+    """fn 결과가 차지하는 메모리 (tracemalloc 기준 바이트)"""
+    tracemalloc.start()
+    result = fn(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+def run_codec(n_trades, seed=42):
+    """파티션 형식 n_trades건 로드: 표준 json dict 목록 vs Trade 목록"""
+    companies = generate_companies(default_company_count(n_trades), seed)
+    lines = ",\n".join(dumps_trade(t) for t in generate_trades(n_trades, companies, seed))
+    raw = f"[\n{lines}\n]\n".encode("utf-8")
+    del lines
+
+    _, dict_load_s = timed(json.loads, raw)
+    _, trade_load_s = timed(loads_trades, raw)
+    return {
+        "trades": n_trades,
+        "backend": BACKEND,
+        "raw_bytes": len(raw),
+        "dict_load_s": dict_load_s,
+        "trade_load_s": trade_load_s,
+        "dict_bytes_per_trade": round(traced_bytes(json.loads, raw) / n_trades),
+        "trade_bytes_per_trade": round(traced_bytes(loads_trades, raw) / n_trades),
+    }
+
+ARCHIVE_BATCH = 1_000_000  # 합성 거래를 90일 구간 단위로 나눠 만들어 메모리를 제한
+
+def _history(n_trades, companies, seed):
+    """n_trades건 다년치 합성 거래 (오래된 구간부터, 공시일 순)"""
+    batches = -(-n_trades // ARCHIVE_BATCH)
+    for k in reversed(range(batches)):
+        size = min(ARCHIVE_BATCH, n_trades - k * ARCHIVE_BATCH)
+        batch = generate_trades(size, companies, seed + k, end=END_DATE - timedelta(days=91 * k))
+        batch.sort(key=lambda t: (t["report_date"], t["rcept_no"]))
+        yield from batch
+        del batch
+
+def run_archive(n_trades, seed=42):
+    """n_trades건 열 아카이브: 쓰기 시간, 새 프로세스에서 전체 기간 집계 시간/RSS"""
+    from archive import write_archive
+
+    companies = generate_companies(default_company_count(min(n_trades, ARCHIVE_BATCH)), seed)
+    archive_dir = Path(tempfile.mkdtemp(prefix="archive-"))
+    try:
+        rows, write_s = timed(write_archive, _history(n_trades, companies, seed), archive_dir)
+        stats = subprocess.run(
+            [sys.executable, str(Path(__file__).parent / "archive.py"), "stats", "--dir", str(archive_dir), "--json"],
+            check=True, capture_output=True, text=True,
+        )
+        summary = json.loads(stats.stdout)
+    finally:
+        shutil.rmtree(archive_dir)
+    return {
+        "trades": rows,
+        "write_s": write_s,
+        "column_bytes": summary["column_bytes"],
+        "summarize_s": summary["seconds"],
+        "summarize_rss_mb": summary["peak_rss_mb"],
+        "months": len(summary["monthly"]),
+    }
+
+def check_thresholds(results, thresholds):
+    """임계값 초과 항목 목록 (thresholds: {"거래 수": {"지표": 최대값}})"""
+    failures = []
+    for result in results:
+        limits = thresholds.get(str(result["trades"]), {})
+        for metric, limit in limits.items():
+            value = result.get(metric)
+            if value is not None and value > limit:
+                failures.append(f"{result['trades']:,}건 {metric}: {value} > {limit}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내부자 거래 파이프라인 벤치마크")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="거래 건수 목록 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("--check", type=Path, help="임계값 JSON: 초과 시 종료 코드 1")
+    parser.add_argument("--codec", action="store_true", help="파이프라인 대신 거래 로드 시간/메모리 측정")
+    parser.add_argument("--archive", action="store_true", help="열 아카이브 쓰기와 콜드 스타트 집계 측정 (numpy 필요)")
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 요청당 지연 (ms, 네트워크 대기 흉내)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"⏱️ {size:,}건 측정 중...")
+        if args.archive:
+            result = run_archive(size, args.seed)
+            print(f"   쓰기 {result['write_s']}s · 열 {result['column_bytes'] / 2**20:,.0f}MB · "
+                  f"집계 {result['summarize_s']}s, rss {result['summarize_rss_mb']}MB")
+        elif args.codec:
+            result = run_codec(size, args.seed)
+            print(f"   json dict {result['dict_load_s']}s, {result['dict_bytes_per_trade']}B/건 · "
+                  f"Trade({result['backend']}) {result['trade_load_s']}s, {result['trade_bytes_per_trade']}B/건")
+        else:
+            result = run_size(size, args.seed, args.latency / 1000)
+            print(f"   fetch {result['fetch_s']}s · aggregate {result['aggregate_s']}s · "
+                  f"stream {result['stream_s']}s · "
+                  f"render {result['render_s']}s · html {result['html_bytes']:,}B "
+                  f"(gzip {result['html_gzip_bytes']:,}B) · rss {result['peak_rss_mb']}MB")
+        results.append(result)
+
+    report = {
+        "generatedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "mode": "archive" if args.archive else "codec" if args.codec else "pipeline",
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 벤치마크 결과 저장: {args.output}")
+
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            failures = check_thresholds(results, json.load(f))
+        if failures:
+            print("❌ 임계값 초과:")
+            for failure in failures:
+                print(f"   {failure}")
+            return 1
+        print("✅ 임계값 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
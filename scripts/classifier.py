@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+보고 사유(change_reason) 분류
+
+DART 대량보유 보고의 사유는 "- 보유주식수 변동\n- 유가증권신탁(보유형태 변경 포함)"처럼
+여러 줄의 자유 서술이다. 규칙별 패턴을 이름 있는 그룹으로 묶은 정규식 하나로 컴파일해
+한 번의 스캔으로 걸리는 규칙을 모두 찾고, 우선순위가 가장 높은 분류를 고른다.
+결과는 사유 문자열별로 캐시하므로 같은 사유가 수백만 건 반복되어도 정규식은 한 번만 돈다.
+
+분류 -> 거래 유형(trade_type):
+    매수: 장내매수, 장외취득, 취득, 스톡옵션
+    매도: 장내매도, 처분
+    기타: 신탁, 증여, 대차, 계약변경, 보고, 기타
+    장내매매/매매(매수·매도가 함께 적힌 사유)는 보유 수량 변동 부호로 방향을 정한다.
+    "장내매수, 장내매도"나 "처분 및 취득"처럼 양쪽 규칙이 모두 걸리면 우선순위와 관계없이
+    장내매매/매매로 본다.
+"""
+
+import re
+from functools import lru_cache
+
+# (분류, 패턴) - 앞에 있을수록 우선
+RULES = (
+    ("스톡옵션", r"주식매수선택권|스톡\s*옵션"),
+    ("신탁", r"신탁"),
+    ("증여", r"증여|수증|상속"),
+    ("장내매수", r"장내[^\n]{0,20}?매수|장내\s*취득"),
+    ("장내매도", r"장내[^\n]{0,20}?매도|장내\s*처분"),
+    ("장내매매", r"장내\s*매매"),
+    ("장외취득", r"유상증자|제3자\s*배정|신주인수권\s*행사"),
+    ("매매", r"취득\s*/\s*처분|매수\s*,\s*(?:주식)?매도"),
+    ("취득", r"취득|매수"),
+    ("처분", r"처분|매도"),
+    ("대차", r"대차|대여|차입|담보|질권"),
+    ("계약변경", r"계약[^\n]{0,4}변경"),
+    ("보고", r"신규\s*보고|보고자|특별관계자|지분\s*변동|보유주식\s*수?\s*변동|보유형태"),
+)
+
+TRADE_TYPE = {
+    "장내매수": "매수",
+    "장외취득": "매수",
+    "취득": "매수",
+    "스톡옵션": "매수",
+    "장내매도": "매도",
+    "처분": "매도",
+}
+
+# 방향을 수량 변동 부호로 정하는 분류 -> (증가, 감소)
+SIGNED = {
+    "장내매매": ("장내매수", "장내매도"),
+    "매매": ("취득", "처분"),
+    "": ("장내매수", "장내매도"),  # 사유 없는 임원 보고 (elestock)
+}
+
+_PATTERN = re.compile("|".join(f"(?P<r{i}>{pattern})" for i, (_, pattern) in enumerate(RULES)))
+
+# 매수/매도 쪽 규칙 (둘 다 적힌 사유는 매매로 보고 수량 변동 부호로 방향을 정함)
+_RULE_PATTERNS = {name: re.compile(pattern) for name, pattern in RULES}
+BUY_RULES = ("장내매수", "취득")
+SELL_RULES = ("장내매도", "처분")
+
+def _mixed(reason):
+    """매수와 매도가 함께 적힌 사유면 장내매매/매매, 아니면 None
+
+    규칙 정규식 하나로 스캔하면 "장내매도 및 장내매수"처럼 한 매치가 다른 쪽을 삼킬 수 있어
+    방향 규칙은 따로 검사한다.
+    """
+    found = {name for name in BUY_RULES + SELL_RULES if _RULE_PATTERNS[name].search(reason)}
+    if not (found & set(BUY_RULES) and found & set(SELL_RULES)):
+        return None
+    return "장내매매" if found & {"장내매수", "장내매도"} else "매매"
+
+@lru_cache(maxsize=None)
+def _match(reason):
+    """사유 -> 우선순위가 가장 높은 분류 ("" = 빈 사유)"""
+    if not reason.strip():
+        return ""
+    best = len(RULES)
+    for m in _PATTERN.finditer(reason):
+        best = min(best, int(m.lastgroup[1:]))
+    if best == len(RULES):
+        return "기타"
+    category = RULES[best][0]
+    if category in BUY_RULES + SELL_RULES:
+        return _mixed(reason) or category
+    return category
+
+def classify_reason(reason, shares_change=0):
+    """사유와 부호 있는 수량 변동 -> 분류"""
+    category = _match(reason or "")
+    if category in SIGNED:
+        up, down = SIGNED[category]
+        if shares_change > 0:
+            return up
+        if shares_change < 0:
+            return down
+        return category or "기타"
+    return category
+
+def trade_type(category, reason=""):
+    """분류 -> 매수/매도/기타 (방향을 모르는 매매는 사유에 먼저 나온 쪽)"""
+    if category in TRADE_TYPE:
+        return TRADE_TYPE[category]
+    if category in ("장내매매", "매매"):
+        buy = re.search(r"취득|매수", reason)
+        sell = re.search(r"처분|매도", reason)
+        if buy and (not sell or buy.start() < sell.start()):
+            return "매수"
+        return "매도" if sell else "기타"
+    return "기타"
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+내부자 동반 매수(cluster buy) 탐지
+
+같은 회사에서 서로 다른 내부자 여러 명이 짧은 기간 안에 순매수하면 신호로 본다.
+거래를 (종목, 공시일) 순으로 정렬한 뒤 종목마다 두 포인터 슬라이딩 윈도우를 돌린다.
+
+- 윈도우: 마지막 거래 기준 WINDOW_DAYS 거래일 안의 매수/매도 (주말만 제외한 영업일 기준,
+  공휴일은 반영하지 않음)
+- 거래를 넣을 때 윈도우 밖으로 밀려난 앞쪽 거래를 빼면서 내부자별 순매수 금액과
+  순매수 내부자 수를 O(1)로 갱신한다
+- 순매수 내부자 MIN_INSIDERS명 이상이고 윈도우 순매수 합이 양수면 클러스터이고,
+  앞 클러스터와 기간이 겹치면 하나로 합친다
+
+정렬 O(n log n) + 윈도우 O(n)이다. ClusterDetector는 종목별로 공시일이 늘어나는 순서로만
+거래를 받으면 되므로, 일별 파티션처럼 날짜 순으로 새 거래가 들어오면 이어서 add()만 하면 된다.
+"""
+
+from collections import deque
+
+from aggregate import epoch_day
+
+WINDOW_DAYS = 10
+MIN_INSIDERS = 3
+MAX_NAMES = 10
+MAX_CLUSTERS = 30  # insider.json에 남기는 최근 클러스터 수
+
+def business_day(date_str):
+    """날짜 -> 영업일 번호 (주말은 다음 월요일과 같은 번호, 1970-01-01 목요일 기준)"""
+    shifted = epoch_day(date_str) + 3  # 월요일 = 0
+    return shifted // 7 * 5 + min(shifted % 7, 5)
+
+class _StockWindow:
+    """종목 하나의 윈도우 상태와 진행 중인 클러스터"""
+
+    def __init__(self, trade):
+        self.stock_code = trade["stock_code"]
+        self.name = trade["corp_name"]
+        self.sector = trade.get("sector") or "기타"
+        self.window = deque()   # (영업일, 순번, 보고자, 부호 금액, 공시일)
+        self.net = {}           # 보고자 -> 윈도우 안 순매수 금액
+        self.buyers = 0         # 순매수 > 0인 보고자 수
+        self.total = 0          # 윈도우 순매수 합
+        self.last_day = None
+        self.seq = 0
+        self.current = None     # 진행 중인 클러스터
+        self.closed = []
+
+    def _shift(self, insider, amount):
+        before = self.net.get(insider, 0)
+        after = before + amount
+        if after:
+            self.net[insider] = after
+        else:
+            self.net.pop(insider, None)
+        self.buyers += (after > 0) - (before > 0)
+        self.total += amount
+
+    def add(self, trade, window_days, min_insiders):
+        day = business_day(trade["report_date"])
+        if self.last_day is not None and day < self.last_day:
+            raise ValueError(f"{self.stock_code}: 공시일 역순 거래 {trade['report_date']}")
+        self.last_day = day
+        amount = trade["amount"] if trade["trade_type"] == "매수" else -trade["amount"]
+        self.seq += 1
+        self.window.append((day, self.seq, trade["insider_name"], amount, trade["report_date"]))
+        self._shift(trade["insider_name"], amount)
+        while day - self.window[0][0] >= window_days:
+            _, _, insider, old_amount, _ = self.window.popleft()
+            self._shift(insider, -old_amount)
+
+        if self.buyers >= min_insiders and self.total > 0:
+            self._mark()
+
+    def _mark(self):
+        """현재 윈도우를 클러스터로 기록 (겹치면 진행 중인 클러스터에 합침)"""
+        first_day = self.window[0][0]
+        cluster = self.current
+        if cluster is None or first_day > cluster["_end_day"]:
+            if cluster is not None:
+                self.closed.append(cluster)
+            cluster = self.current = {
+                "start": self.window[0][4], "_end_day": first_day, "_seq": 0,
+                "names": set(), "trades": 0, "buy": 0, "net": 0,
+            }
+        for _, seq, _, amount, _ in reversed(self.window):
+            if seq <= cluster["_seq"]:
+                break
+            cluster["trades"] += 1
+            cluster["net"] += amount
+            if amount > 0:
+                cluster["buy"] += amount
+        cluster["_seq"] = self.window[-1][1]
+        cluster["_end_day"] = self.window[-1][0]
+        cluster["end"] = self.window[-1][4]
+        cluster["names"].update(name for name, net in self.net.items() if net > 0)
+
+    def clusters(self):
+        done = self.closed + ([self.current] if self.current else [])
+        return [
+            {
+                "stock_code": self.stock_code,
+                "name": self.name,
+                "sector": self.sector,
+                "start": c["start"],
+                "end": c["end"],
+                "insiders": len(c["names"]),
+                "names": sorted(c["names"])[:MAX_NAMES],
+                "trades": c["trades"],
+                "buyAmount": c["buy"],
+                "netAmount": c["net"],
+            }
+            for c in done
+        ]
+
+class ClusterDetector:
+    """종목별 슬라이딩 윈도우 (종목 안에서는 공시일 순으로 add)"""
+
+    def __init__(self, window_days=WINDOW_DAYS, min_insiders=MIN_INSIDERS):
+        self.window_days = window_days
+        self.min_insiders = min_insiders
+        self.stocks = {}
+
+    def add(self, trade):
+        if trade["trade_type"] not in ("매수", "매도"):
+            return
+        stock = self.stocks.get(trade["stock_code"])
+        if stock is None:
+            stock = self.stocks[trade["stock_code"]] = _StockWindow(trade)
+        stock.add(trade, self.window_days, self.min_insiders)
+
+    def clusters(self):
+        """클러스터 목록 (최근에 끝난 순, 같으면 순매수 큰 순)"""
+        found = [c for stock in self.stocks.values() for c in stock.clusters()]
+        found.sort(key=lambda c: (c["end"], c["netAmount"]), reverse=True)
+        return found
+
+def detect_clusters(trades, window_days=WINDOW_DAYS, min_insiders=MIN_INSIDERS):
+    """거래 목록 -> 동반 매수 클러스터 목록"""
+    detector = ClusterDetector(window_days, min_insiders)
+    for t in sorted(trades, key=lambda t: (t["stock_code"], t["report_date"])):
+        detector.add(t)
+    return detector.clusters()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+실행별 거래 변경분(delta)과 주요 거래 피드
+
+    data/delta.json   이번 실행에서 추가/변경/삭제된 거래
+    data/feed.json    주요 거래 JSON Feed (최근 FEED_SIZE건)
+    data/feed.xml     같은 내용의 RSS 2.0
+
+거래 id는 공시 식별자 store.trade_key(접수번호 + 종목 + 보고자)의 해시라 실행이 바뀌어도 같고,
+정정 공시(수량/금액 등이 바뀐 같은 공시)도 같은 id라 삭제+추가가 아닌 변경으로 잡힌다.
+접수번호가 없는 예전 거래는 다시 조회한 같은 공시(공시일, 보고자, 수량이 같은 것)와 짝지어
+비교에서 빼고, 짝이 없어도 삭제로 보지 않는다 (같은 공시가 새 거래로 피드에 다시 올라가지 않도록).
+비교 대상은 이번 실행에서 조회한 종목의 거래뿐이고(나머지 종목은 이전 거래를 그대로 유지),
+종목별 id 해시 집합으로 추가/삭제를 찾고 같은 id의 필드가 달라졌으면 변경으로 본다.
+피드는 이전 feed.json 앞에 새 항목을 붙이고 잘라 쓰므로 비용이 변경분 크기에 비례한다.
+
+주요 거래 기준 (환경변수로 변경):
+    ALERT_MIN_AMOUNT   매수/매도 금액 하한 (기본 100억)
+    ALERT_POSITIONS    금액과 관계없이 매수를 알릴 직위 (쉼표 구분, 기본 "대표이사")
+    SITE_URL           피드 링크에 쓸 대시보드 주소 (CI에서 Pages 주소로 설정)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import metrics
+from fetch_data import KST
+from generate_html import format_amount
+from store import legacy_key, trade_key
+from trade import as_dict
+
+ROOT = Path(__file__).parent.parent
+DELTA_PATH = ROOT / "data" / "delta.json"
+FEED_JSON_PATH = ROOT / "data" / "feed.json"
+FEED_XML_PATH = ROOT / "data" / "feed.xml"
+FEED_SIZE = 50
+MIN_AMOUNT = 100 * 10**8
+POSITIONS = ("대표이사",)
+DART_VIEWER = "https://dart.fss.or.kr/dsaf001/main.do?rcpNo="
+
+def trade_id(trade):
+    """실행이 바뀌어도, 정정되어도 같은 거래 id (16자리 hex, 접수번호 + 종목 + 보고자)"""
+    key = "\x1f".join(str(v) for v in trade_key(trade))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+def _by_id(trades, corp_codes, cutoff):
+    """조회한 종목의 기간 안 거래 -> {id: 거래}"""
+    return {
+        trade_id(t): t for t in trades
+        if t["corp_code"] in corp_codes and t["report_date"] >= cutoff
+    }
+
+def diff_trades(previous, current, corp_codes, cutoff=""):
+    """조회한 종목(corp_codes)의 이전/현재 거래 비교 -> {"added", "changed", "removed"}
+
+    같은 id의 나머지 필드가 다르면 변경이다. 기간(cutoff) 밖으로 밀려난 거래는 삭제로 보지 않는다.
+    """
+    corp_codes = set(corp_codes)
+    old = _by_id(previous, corp_codes, cutoff)
+    new = _by_id(current, corp_codes, cutoff)
+    legacy = {legacy_key(t): i for i, t in old.items() if not t.get("rcept_no")}
+    for i, t in list(new.items()):
+        j = legacy.pop(legacy_key(t), None) if t.get("rcept_no") else None
+        if j is not None:
+            del new[i], old[j]
+    added = [new[i] for i in new.keys() - old.keys()]
+    removed = [old[i] for i in old.keys() - new.keys() if old[i].get("rcept_no")]
+    changed = [(old[i], new[i]) for i in new.keys() & old.keys() if tuple(old[i]) != tuple(new[i])]
+    order = lambda t: (t["report_date"], trade_id(t))
+    added.sort(key=order)
+    removed.sort(key=order)
+    changed.sort(key=lambda pair: order(pair[1]))
+    return {"added": added, "changed": changed, "removed": removed}
+
+def alert_rules(env=os.environ):
+    min_amount = int(env.get("ALERT_MIN_AMOUNT", MIN_AMOUNT))
+    positions = tuple(p.strip() for p in env.get("ALERT_POSITIONS", ",".join(POSITIONS)).split(",") if p.strip())
+    return min_amount, positions
+
+def is_notable(trade, min_amount=MIN_AMOUNT, positions=POSITIONS):
+    """금액 기준 이상의 매수/매도 또는 지정 직위의 매수"""
+    if trade["trade_type"] == "기타":
+        return False
+    if trade["amount"] >= min_amount:
+        return True
+    return trade["trade_type"] == "매수" and any(p in trade["position"] for p in positions)
+
+def feed_item(trade, site_url=""):
+    """거래 -> JSON Feed 항목"""
+    who = " ".join(filter(None, (trade["position"], trade["insider_name"])))
+    title = f"{trade['corp_name']} {who} {trade['category']} {format_amount(trade['amount'])}"
+    rcept_no = trade.get("rcept_no")
+    return {
+        "id": trade_id(trade),
+        "url": DART_VIEWER + rcept_no if rcept_no else site_url,
+        "title": title,
+        "content_text": (
+            f"{trade['report_date']} {trade['corp_name']}({trade['stock_code']}) {who}: "
+            f"{trade['trade_type']} {trade['shares_change']:,}주, {trade['amount']:,}원"
+        ),
+        "date_published": f"{trade['report_date']}T00:00:00+09:00",
+        "tags": [trade["trade_type"], trade["category"], trade["sector"]],
+    }
+
+def load_feed(path=FEED_JSON_PATH):
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("items", [])
+
+def merge_feed(items, new_items, size=FEED_SIZE):
+    """새 항목을 앞에 붙이고 id 중복 제거, 최근 size건만 유지"""
+    seen = set()
+    merged = []
+    for item in new_items + items:
+        if item["id"] not in seen:
+            seen.add(item["id"])
+            merged.append(item)
+    merged.sort(key=lambda item: item["date_published"], reverse=True)
+    return merged[:size]
+
+def render_rss(items, now, site_url=""):
+    entries = []
+    for item in items:
+        published = datetime.fromisoformat(item["date_published"])
+        entries.append(
+            "    <item>\n"
+            f"      <title>{escape(item['title'])}</title>\n"
+            f"      <link>{escape(item['url'])}</link>\n"
+            f"      <guid isPermaLink=\"false\">{item['id']}</guid>\n"
+            f"      <pubDate>{format_datetime(published)}</pubDate>\n"
+            f"      <description>{escape(item['content_text'])}</description>\n"
+            "    </item>\n"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0">\n'
+        "  <channel>\n"
+        "    <title>KOSPI 내부자 주요 거래</title>\n"
+        f"    <link>{escape(site_url)}</link>\n"
+        "    <description>대량 매수/매도와 대표이사 매수 공시</description>\n"
+        "    <language>ko</language>\n"
+        f"    <lastBuildDate>{format_datetime(now)}</lastBuildDate>\n"
+        f"{''.join(entries)}"
+        "  </channel>\n"
+        "</rss>\n"
+    )
+
+def publish(changes, now=None, env=os.environ, delta_path=DELTA_PATH,
+            feed_json_path=FEED_JSON_PATH, feed_xml_path=FEED_XML_PATH):
+    """delta.json 저장, 주요 신규 거래를 피드에 추가 (피드에 추가된 건수 반환)"""
+    now = now or datetime.now(KST)
+    counts = {key: len(changes[key]) for key in ("added", "changed", "removed")}
+    for key, n in counts.items():
+        metrics.count(f"delta_{key}", n)
+    delta = {
+        "generated": now.isoformat(timespec="seconds"),
+        "counts": counts,
+        "added": [dict(as_dict(t), id=trade_id(t)) for t in changes["added"]],
+        "changed": [
+            {"id": trade_id(after), "before": as_dict(before), "after": as_dict(after)}
+            for before, after in changes["changed"]
+        ],
+        "removed": [dict(as_dict(t), id=trade_id(t)) for t in changes["removed"]],
+    }
+    with open(delta_path, "w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2)
+
+    min_amount, positions = alert_rules(env)
+    site_url = env.get("SITE_URL", "")
+    new_items = [feed_item(t, site_url) for t in changes["added"] if is_notable(t, min_amount, positions)]
+    metrics.count("feed_items", len(new_items))
+    if not new_items and feed_json_path.exists():
+        return 0
+    items = merge_feed(load_feed(feed_json_path), new_items)
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": "KOSPI 내부자 주요 거래",
+        "home_page_url": site_url,
+        "feed_url": site_url + "feed.json",
+        "language": "ko",
+        "items": items,
+    }
+    with open(feed_json_path, "w", encoding="utf-8") as f:
+        json.dump(feed, f, ensure_ascii=False, indent=2)
+    with open(feed_xml_path, "w", encoding="utf-8") as f:
+        f.write(render_rss(items, now, site_url))
+    return len(new_items)
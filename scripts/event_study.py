@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+내부자 거래 이후 수익률 (이벤트 스터디)
+
+    python scripts/event_study.py import closes.csv      # 종가 CSV -> data/prices.npz
+    python scripts/event_study.py report                 # insider.json 기간 거래로 집계 출력
+    python scripts/event_study.py report --archive       # 다년치 열 아카이브 전체로 집계
+
+종가 CSV는 "date,stock_code,close" 형식(긴 형식)이고 코스피 지수는 stock_code를 KOSPI로 둔다.
+data/prices.npz에는 거래일 × 종목 종가 행렬(close), 코스피 종가(benchmark), 거래일(days,
+1970-01-01 기준 일수), 정렬된 종목 코드(codes)가 들어 있다.
+
+거래마다 공시일 당일(휴장일이면 다음 거래일) 종가를 기준으로 +5/+20/+60 거래일 수익률과
+코스피 대비 초과 수익률을 구한다. 매도는 부호를 뒤집어 "예측이 맞았으면 양수"로 보고,
+적중률은 부호 보정 초과 수익률이 0보다 큰 비율이다. 종목 열은 searchsorted, 기준일 행은
+거래일 searchsorted로 찾고 수익률은 행렬 fancy indexing으로 한 번에 계산한다 (거래별 루프 없음).
+직위/섹터/보고자별 평균은 np.unique + np.bincount로 묶는다.
+
+numpy가 없거나 data/prices.npz가 없거나 비어 있으면 집계를 건너뛴다 (insider.json에 eventStudy 없음).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from aggregate import EPOCH, epoch_day
+
+ROOT = Path(__file__).parent.parent
+PRICES_PATH = ROOT / "data" / "prices.npz"
+BENCHMARK = "KOSPI"
+HORIZONS = (5, 20, 60)
+MIN_EVENTS = 5      # 그룹 평균을 내는 최소 거래 수 (가장 짧은 기간 기준)
+TOP_INSIDERS = 20
+MAJOR_HOLDER = "대량보유자"  # 직위가 없는 majorstock 보고자
+
+def import_prices(csv_path, out_path=PRICES_PATH):
+    """긴 형식 종가 CSV -> 거래일 × 종목 행렬 (.npz)"""
+    rows = []
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            rows.append((epoch_day(row["date"]), row["stock_code"].strip(), float(row["close"])))
+    if not rows:
+        raise ValueError(f"종가가 없습니다: {csv_path}")
+
+    days = np.unique(np.array([r[0] for r in rows], dtype=np.int32))
+    codes = np.array(sorted({r[1] for r in rows if r[1] != BENCHMARK}))
+    close = np.full((len(days), len(codes)), np.nan)
+    benchmark = np.full(len(days), np.nan)
+    day_idx = np.searchsorted(days, np.array([r[0] for r in rows], dtype=np.int32))
+    values = np.array([r[2] for r in rows])
+    is_bench = np.array([r[1] == BENCHMARK for r in rows])
+    col_idx = np.searchsorted(codes, np.array([r[1] for r in rows]))
+    close[day_idx[~is_bench], col_idx[~is_bench]] = values[~is_bench]
+    benchmark[day_idx[is_bench]] = values[is_bench]
+
+    np.savez(out_path, days=days, codes=codes, close=close, benchmark=benchmark)
+    return len(days), len(codes)
+
+def load_prices(path=PRICES_PATH):
+    """종가 행렬 (numpy나 파일이 없으면 None)"""
+    if np is None or not path.exists():
+        return None
+    with np.load(path) as f:
+        return {name: f[name] for name in f.files}
+
+def has_prices(prices):
+    """거래일과 종목 열이 하나 이상 있는 종가 행렬인지"""
+    return prices is not None and len(prices["days"]) > 0 and len(prices["codes"]) > 0
+
+def prices_signature(path=PRICES_PATH):
+    """파이프라인 지문용 내용 해시 (체크아웃/캐시 복원마다 바뀌는 수정 시각 대신 내용으로)"""
+    if not path.exists():
+        return None
+    return hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+
+def event_returns(trade_days, trade_codes, prices, horizons=HORIZONS):
+    """거래별 기간 수익률과 코스피 대비 초과 수익률 (값이 없으면 NaN)
+
+    trade_days: 공시일 (epoch day 정수 배열), trade_codes: 종목 코드 배열
+    반환: {h: (수익률, 초과 수익률)}
+    """
+    days, codes, close, bench = prices["days"], prices["codes"], prices["close"], prices["benchmark"]
+    n_days = len(days)
+    if not has_prices(prices):
+        empty = np.full(len(trade_days), np.nan)
+        return {h: (empty, empty) for h in horizons}
+
+    col = np.searchsorted(codes, trade_codes)
+    col = np.minimum(col, len(codes) - 1)
+    known = codes[col] == trade_codes
+    t0 = np.searchsorted(days, trade_days, "left")
+    t0_safe = np.minimum(t0, n_days - 1)
+    base = close[t0_safe, col]
+    base_bench = bench[t0_safe]
+
+    result = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for h in horizons:
+            t1 = t0 + h
+            valid = known & (t1 < n_days) & (base > 0)
+            t1_safe = np.minimum(t1, n_days - 1)
+            ret = np.where(valid, close[t1_safe, col] / base - 1, np.nan)
+            excess = ret - (bench[t1_safe] / base_bench - 1)
+            result[h] = (ret, excess)
+    return result
+
+def group_stats(keys, signed, horizons=HORIZONS, min_events=MIN_EVENTS):
+    """그룹별 거래 수, 기간별 평균 부호 보정 초과 수익률과 적중률"""
+    labels, inverse = np.unique(keys, return_inverse=True)
+    k = len(labels)
+    events = np.bincount(inverse, minlength=k)
+    stats = {}
+    for h in horizons:
+        values = signed[h]
+        valid = np.isfinite(values)
+        n = np.bincount(inverse[valid], minlength=k)
+        total = np.bincount(inverse[valid], weights=values[valid], minlength=k)
+        hits = np.bincount(inverse[valid], weights=(values[valid] > 0), minlength=k)
+        stats[h] = (n, total, hits)
+
+    first = horizons[0]
+    groups = []
+    for i in np.flatnonzero(stats[first][0] >= min_events):
+        entry = {"key": str(labels[i]), "events": int(events[i])}
+        for h in horizons:
+            n, total, hits = stats[h]
+            entry[f"n{h}"] = int(n[i])
+            entry[f"excess{h}"] = round(float(total[i] / n[i]), 4) if n[i] else None
+            entry[f"hit{h}"] = round(float(hits[i] / n[i]), 3) if n[i] else None
+        groups.append(entry)
+    groups.sort(key=lambda g: (-g["events"], g["key"]))
+    return groups
+
+def study(trade_days, trade_codes, directions, groups, prices, horizons=HORIZONS):
+    """부호(매수 +1, 매도 -1) 배열과 그룹 키 {이름: 배열}로 이벤트 스터디 집계"""
+    returns = event_returns(trade_days, trade_codes, prices, horizons)
+    signed = {h: returns[h][1] * directions for h in horizons}
+    overall = group_stats(np.zeros(len(directions), dtype=np.int8), signed, horizons, min_events=1)
+    result = {
+        "horizons": list(horizons),
+        "benchmark": BENCHMARK,
+        "priceRange": {
+            "from": (EPOCH + timedelta(days=int(prices["days"][0]))).isoformat(),
+            "to": (EPOCH + timedelta(days=int(prices["days"][-1]))).isoformat(),
+        },
+        "overall": dict(overall[0], key="전체") if overall else None,
+    }
+    for name, (keys, limit) in groups.items():
+        result[name] = group_stats(keys, signed, horizons)[:limit]
+    return result
+
+def analyze(trades, prices=None, horizons=HORIZONS):
+    """거래 목록 -> insider.json eventStudy (종가가 없으면 None)"""
+    prices = prices if prices is not None else load_prices()
+    if not has_prices(prices):
+        return None
+    directional = [t for t in trades if t["trade_type"] in ("매수", "매도")]
+    if not directional:
+        return None
+    days = np.fromiter((epoch_day(t["report_date"]) for t in directional), dtype=np.int32, count=len(directional))
+    codes = np.array([t["stock_code"] for t in directional])
+    directions = np.array([1.0 if t["trade_type"] == "매수" else -1.0 for t in directional])
+    groups = {
+        "byPosition": (np.array([t["position"] or MAJOR_HOLDER for t in directional]), None),
+        "bySector": (np.array([t.get("sector") or "기타" for t in directional]), None),
+        "byInsider": (np.array([t["insider_name"] for t in directional]), TOP_INSIDERS),
+    }
+    return study(days, codes, directions, groups, prices, horizons)
+
+def analyze_archive(archive, prices=None, horizons=HORIZONS):
+    """열 아카이브 전체 -> eventStudy (행 단위 변환 없이 id 열로 계산)"""
+    prices = prices if prices is not None else load_prices()
+    if not has_prices(prices):
+        return None
+    types = archive.strings["trade_type"]
+    kinds = np.asarray(archive["trade_type"])
+    buy = types.index("매수") if "매수" in types else -1
+    sell = types.index("매도") if "매도" in types else -1
+    rows = np.flatnonzero((kinds == buy) | (kinds == sell))
+    stock_ids = np.asarray(archive["stock"])[rows]
+    stocks = archive.strings["stock"]
+    stock_codes = np.array([s[0] for s in stocks])
+    sectors = np.array([s[3] for s in stocks])
+    positions = np.array([p or MAJOR_HOLDER for p in archive.strings["position"]])
+    insiders = np.array(archive.strings["insider"])
+    groups = {
+        "byPosition": (positions[np.asarray(archive["position"])[rows]], None),
+        "bySector": (sectors[stock_ids], None),
+        "byInsider": (insiders[np.asarray(archive["insider"])[rows]], TOP_INSIDERS),
+    }
+    directions = np.where(kinds[rows] == buy, 1.0, -1.0)
+    return study(np.asarray(archive["day"])[rows], stock_codes[stock_ids], directions, groups, prices, horizons)
+
+def _pct(value):
+    return "-" if value is None else f"{value * 100:+.1f}%"
+
+def _rate(value):
+    return "-" if value is None else f"{value * 100:.0f}%"
+
+def print_report(result):
+    horizons = result["horizons"]
+    header = "".join(f"  초과{h:>3}일  적중{h:>3}일" for h in horizons)
+    print(f"📈 {result['priceRange']['from']} ~ {result['priceRange']['to']} 종가, {result['benchmark']} 대비")
+    for name, title in (("byPosition", "직위"), ("bySector", "섹터"), ("byInsider", "보고자")):
+        print(f"\n[{title}]{'':<20}  거래수{header}")
+        for g in ([result["overall"]] if name == "byPosition" and result["overall"] else []) + result[name]:
+            cells = "".join(f"  {_pct(g[f'excess{h}']):>8}  {_rate(g[f'hit{h}']):>8}" for h in horizons)
+            print(f"  {g['key'][:22]:<22}  {g['events']:>6,}{cells}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내부자 거래 이후 수익률")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="종가 CSV(date,stock_code,close)를 data/prices.npz로 변환")
+    imp.add_argument("csv", type=Path)
+    rep = sub.add_parser("report", help="이벤트 스터디 집계 출력")
+    rep.add_argument("--archive", action="store_true", help="열 아카이브 전체 기간으로 집계")
+    rep.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        raise SystemExit("❌ numpy가 필요합니다 (pip install numpy)")
+    if args.command == "import":
+        n_days, n_codes = import_prices(args.csv)
+        print(f"✅ 종가 행렬 {n_days:,}일 × {n_codes:,}종목: {PRICES_PATH}")
+        return 0
+
+    prices = load_prices()
+    if not has_prices(prices):
+        raise SystemExit(f"❌ 종가 행렬이 없습니다: {PRICES_PATH} (event_study.py import)")
+    if args.archive:
+        from archive import Archive
+        result = analyze_archive(Archive(), prices)
+    else:
+        from store import load_data
+        result = analyze(load_data()["trades"], prices)
+    if result is None:
+        print("⚠️ 매수/매도 거래가 없습니다")
+    elif args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,571 +1,250 @@
 #!/usr/bin/env python3
 """
-내부자 거래 대시보드 HTML 생성
+DART 내부자 거래 데이터 수집
 """
 
 import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-def format_amount(amount):
-    """금액 포맷 (억원)"""
-    billion = amount / 100_000_000
-    if abs(billion) >= 1000:
-        return f"{billion/10000:.1f}조"
-    return f"{billion:.0f}억"
+import requests
 
-def generate_html():
-    # 데이터 로드
-    data_path = Path(__file__).parent.parent / "data" / "insider.json"
-    
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    last_updated = data["lastUpdated"]
-    summary = data["summary"]
-    trades_json = json.dumps(data["trades"], ensure_ascii=False)
-    hot_stocks_json = json.dumps(data["hotStocks"], ensure_ascii=False)
-    big_players_json = json.dumps(data["bigPlayers"], ensure_ascii=False)
-    sector_json = json.dumps(data["sectorSentiment"], ensure_ascii=False)
-    daily_json = json.dumps(data["dailyData"], ensure_ascii=False)
-    
-    net_amount_str = format_amount(summary["net_amount"])
-    total_buy_str = format_amount(summary["total_buy"])
-    total_sell_str = format_amount(summary["total_sell"])
-    
-    html = f'''<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>코스피 200 내부자 거래</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
-            font-family: 'Inter', -apple-system, sans-serif; 
-            background: #000; 
-            color: #fff;
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        .container {{ max-width: 1400px; margin: 0 auto; }}
-        
-        .header {{ margin-bottom: 24px; }}
-        .title {{ font-size: 24px; font-weight: 700; margin-bottom: 8px; }}
-        .subtitle {{ font-size: 13px; color: #6b7280; }}
-        
-        .summary-cards {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 16px;
-            margin-bottom: 24px;
-        }}
-        .summary-card {{
-            background: #111;
-            border-radius: 12px;
-            padding: 20px;
-        }}
-        .card-label {{ font-size: 12px; color: #6b7280; margin-bottom: 8px; }}
-        .card-value {{ font-size: 28px; font-weight: 700; }}
-        .card-value.positive {{ color: #22c55e; }}
-        .card-value.negative {{ color: #ef4444; }}
-        .card-sub {{ font-size: 12px; color: #9ca3af; margin-top: 4px; }}
-        
-        .filters {{
-            display: flex;
-            gap: 12px;
-            margin-bottom: 24px;
-            flex-wrap: wrap;
-        }}
-        .filter-group {{
-            display: flex;
-            gap: 4px;
-            background: #111;
-            padding: 4px;
-            border-radius: 8px;
-        }}
-        .filter-btn {{
-            padding: 8px 16px;
-            border: none;
-            background: transparent;
-            color: #9ca3af;
-            font-size: 13px;
-            font-weight: 500;
-            cursor: pointer;
-            border-radius: 6px;
-            transition: all 0.2s;
-        }}
-        .filter-btn:hover {{ color: #fff; }}
-        .filter-btn.active {{ background: #3b82f6; color: #fff; }}
-        
-        .chart-section {{
-            background: #111;
-            border-radius: 12px;
-            padding: 20px;
-            margin-bottom: 24px;
-        }}
-        .section-title {{
-            font-size: 16px;
-            font-weight: 600;
-            margin-bottom: 16px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
-        .chart-container {{
-            height: 300px;
-        }}
-        
-        .grid-2 {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-            margin-bottom: 24px;
-        }}
-        @media (max-width: 900px) {{
-            .grid-2 {{ grid-template-columns: 1fr; }}
-        }}
-        
-        .list-section {{
-            background: #111;
-            border-radius: 12px;
-            padding: 20px;
-        }}
-        .list-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px 0;
-            border-bottom: 1px solid #222;
-        }}
-        .list-item:last-child {{ border-bottom: none; }}
-        .list-rank {{
-            width: 24px;
-            font-size: 12px;
-            color: #6b7280;
-            font-weight: 600;
-        }}
-        .list-info {{
-            flex: 1;
-            margin-left: 12px;
-        }}
-        .list-name {{ font-weight: 600; font-size: 14px; }}
-        .list-sub {{ font-size: 11px; color: #6b7280; margin-top: 2px; }}
-        .list-value {{
-            font-weight: 700;
-            font-size: 14px;
-        }}
-        .list-value.positive {{ color: #22c55e; }}
-        .list-value.negative {{ color: #ef4444; }}
-        
-        .sector-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 12px;
-        }}
-        .sector-card {{
-            background: #1a1a1a;
-            border-radius: 8px;
-            padding: 16px;
-            text-align: center;
-        }}
-        .sector-name {{ font-size: 13px; font-weight: 500; margin-bottom: 8px; }}
-        .sector-value {{ font-size: 18px; font-weight: 700; }}
-        .sector-indicator {{
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            display: inline-block;
-            margin-right: 4px;
-        }}
-        .sector-indicator.bullish {{ background: #22c55e; }}
-        .sector-indicator.bearish {{ background: #ef4444; }}
-        .sector-indicator.neutral {{ background: #6b7280; }}
-        
-        .table-section {{
-            background: #111;
-            border-radius: 12px;
-            overflow: hidden;
-            margin-bottom: 24px;
-        }}
-        .table-header {{
-            padding: 16px 20px;
-            border-bottom: 1px solid #222;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        .table-scroll {{
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        th {{
-            text-align: left;
-            padding: 12px 16px;
-            font-size: 11px;
-            font-weight: 600;
-            color: #6b7280;
-            text-transform: uppercase;
-            border-bottom: 1px solid #222;
-            position: sticky;
-            top: 0;
-            background: #111;
-        }}
-        td {{
-            padding: 12px 16px;
-            font-size: 13px;
-            border-bottom: 1px solid #1a1a1a;
-        }}
-        tr:hover {{ background: #0a0a0a; }}
-        .type-badge {{
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 600;
-        }}
-        .type-badge.buy {{ background: #14532d; color: #22c55e; }}
-        .type-badge.sell {{ background: #7f1d1d; color: #ef4444; }}
-        .type-badge.other {{ background: #1f2937; color: #9ca3af; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 class="title">📊 코스피 200 내부자 거래</h1>
-            <p class="subtitle">마지막 업데이트: {last_updated} · 최근 3개월 데이터</p>
-        </div>
-        
-        <div class="summary-cards">
-            <div class="summary-card">
-                <div class="card-label">전체 순매수</div>
-                <div class="card-value {"positive" if summary["net_amount"] >= 0 else "negative"}">{("+" if summary["net_amount"] >= 0 else "") + net_amount_str}원</div>
-                <div class="card-sub">매수 {total_buy_str} / 매도 {total_sell_str}</div>
-            </div>
-            <div class="summary-card">
-                <div class="card-label">매수 우위 종목</div>
-                <div class="card-value positive">{summary["buy_stocks"]}개</div>
-                <div class="card-sub">순매수 > 0</div>
-            </div>
-            <div class="summary-card">
-                <div class="card-label">매도 우위 종목</div>
-                <div class="card-value negative">{summary["sell_stocks"]}개</div>
-                <div class="card-sub">순매수 &lt; 0</div>
-            </div>
-            <div class="summary-card">
-                <div class="card-label">총 거래 건수</div>
-                <div class="card-value" style="color: #fff;">{summary["total_trades"]}건</div>
-                <div class="card-sub">3개월 누적</div>
-            </div>
-        </div>
-        
-        <div class="filters">
-            <div class="filter-group">
-                <button class="filter-btn" data-period="1W">1주</button>
-                <button class="filter-btn" data-period="1M">1개월</button>
-                <button class="filter-btn active" data-period="3M">3개월</button>
-            </div>
-            <div class="filter-group">
-                <button class="filter-btn active" data-type="all">전체</button>
-                <button class="filter-btn" data-type="buy">매수</button>
-                <button class="filter-btn" data-type="sell">매도</button>
-            </div>
-        </div>
-        
-        <div class="chart-section">
-            <div class="section-title">📈 일별 매수/매도 추이</div>
-            <div class="chart-container">
-                <canvas id="dailyChart"></canvas>
-            </div>
-        </div>
-        
-        <div class="grid-2">
-            <div class="list-section">
-                <div class="section-title">🔥 Hot Stocks</div>
-                <div id="hot-stocks-list"></div>
-            </div>
-            <div class="list-section">
-                <div class="section-title">👤 Big Players</div>
-                <div id="big-players-list"></div>
-            </div>
-        </div>
-        
-        <div class="chart-section">
-            <div class="section-title">🏢 섹터별 Sentiment</div>
-            <div class="sector-grid" id="sector-grid"></div>
-        </div>
-        
-        <div class="table-section">
-            <div class="table-header">
-                <div class="section-title" style="margin: 0;">📋 상세 거래 내역</div>
-                <input type="text" id="search-input" placeholder="종목명 검색..." style="
-                    background: #1a1a1a;
-                    border: 1px solid #333;
-                    border-radius: 6px;
-                    padding: 8px 12px;
-                    color: #fff;
-                    font-size: 13px;
-                    width: 200px;
-                ">
-            </div>
-            <div class="table-scroll">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>날짜</th>
-                            <th>종목</th>
-                            <th>내부자</th>
-                            <th>직위</th>
-                            <th>유형</th>
-                            <th>수량</th>
-                            <th>금액</th>
-                        </tr>
-                    </thead>
-                    <tbody id="trades-table"></tbody>
-                </table>
-            </div>
-        </div>
-    </div>
+import metrics
+from aggregate import Aggregator, build_aggregates, parse_date
+from classifier import classify_reason, trade_type
+from clusters import MAX_CLUSTERS, ClusterDetector, detect_clusters
+from event_study import analyze as analyze_events
+from store import DATA_PATH, load_data, save_data
+from stream import bounded
+from trade import Trade
 
-    <script>
-        const TRADES = {trades_json};
-        const HOT_STOCKS = {hot_stocks_json};
-        const BIG_PLAYERS = {big_players_json};
-        const SECTORS = {sector_json};
-        const DAILY_DATA = {daily_json};
-        
-        let currentPeriod = '3M';
-        let currentType = 'all';
-        let searchQuery = '';
-        let chart = null;
-        
-        // 금액 포맷
-        function formatAmount(amount) {{
-            const billion = Math.abs(amount) / 100000000;
-            const sign = amount >= 0 ? '+' : '-';
-            if (billion >= 10000) {{
-                return sign + (billion / 10000).toFixed(1) + '조';
-            }}
-            return sign + billion.toFixed(0) + '억';
-        }}
-        
-        // 날짜 필터
-        function filterByPeriod(dateStr) {{
-            // 하이픈 제거 (2026-01-09 -> 20260109)
-            const cleanDate = dateStr.replace(/-/g, '');
-            const date = new Date(cleanDate.slice(0, 4) + '-' + cleanDate.slice(4, 6) + '-' + cleanDate.slice(6, 8));
-            const now = new Date();
-            let daysAgo = 90;
-            if (currentPeriod === '1W') daysAgo = 7;
-            else if (currentPeriod === '1M') daysAgo = 30;
-            const cutoff = new Date(now - daysAgo * 24 * 60 * 60 * 1000);
-            return date >= cutoff;
-        }}
-        
-        // 차트 렌더링
-        function renderChart() {{
-            const filtered = DAILY_DATA.filter(d => filterByPeriod(d.date));
-            
-            const labels = filtered.map(d => {{
-                const cleanDate = d.date.replace(/-/g, '');
-                return cleanDate.slice(4, 6) + '/' + cleanDate.slice(6, 8);
-            }});
-            const buyData = filtered.map(d => d.buy / 100000000);
-            const sellData = filtered.map(d => -d.sell / 100000000);
-            
-            if (chart) {{
-                chart.data.labels = labels;
-                chart.data.datasets[0].data = buyData;
-                chart.data.datasets[1].data = sellData;
-                chart.update();
-            }} else {{
-                const ctx = document.getElementById('dailyChart').getContext('2d');
-                chart = new Chart(ctx, {{
-                    type: 'bar',
-                    data: {{
-                        labels: labels,
-                        datasets: [
-                            {{
-                                label: '매수',
-                                data: buyData,
-                                backgroundColor: '#22c55e',
-                                borderRadius: 4,
-                            }},
-                            {{
-                                label: '매도',
-                                data: sellData,
-                                backgroundColor: '#ef4444',
-                                borderRadius: 4,
-                            }}
-                        ]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            legend: {{
-                                display: true,
-                                position: 'top',
-                                labels: {{ color: '#9ca3af', font: {{ size: 11 }} }}
-                            }},
-                            tooltip: {{
-                                callbacks: {{
-                                    label: (ctx) => ctx.dataset.label + ': ' + Math.abs(ctx.parsed.y).toFixed(0) + '억원'
-                                }}
-                            }}
-                        }},
-                        scales: {{
-                            x: {{
-                                grid: {{ color: '#222' }},
-                                ticks: {{ color: '#6b7280', font: {{ size: 10 }} }}
-                            }},
-                            y: {{
-                                grid: {{ color: '#222' }},
-                                ticks: {{
-                                    color: '#6b7280',
-                                    font: {{ size: 10 }},
-                                    callback: (v) => Math.abs(v) + '억'
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-            }}
-        }}
-        
-        // Hot Stocks 렌더링
-        function renderHotStocks() {{
-            const container = document.getElementById('hot-stocks-list');
-            container.innerHTML = HOT_STOCKS.slice(0, 10).map((stock, i) => `
-                <div class="list-item">
-                    <span class="list-rank">${{i + 1}}</span>
-                    <div class="list-info">
-                        <div class="list-name">${{stock.name}}</div>
-                        <div class="list-sub">${{stock.count}}건</div>
-                    </div>
-                    <span class="list-value ${{stock.net_amount >= 0 ? 'positive' : 'negative'}}">
-                        ${{formatAmount(stock.net_amount)}}원
-                    </span>
-                </div>
-            `).join('');
-        }}
-        
-        // Big Players 렌더링
-        function renderBigPlayers() {{
-            const container = document.getElementById('big-players-list');
-            container.innerHTML = BIG_PLAYERS.slice(0, 10).map((player, i) => `
-                <div class="list-item">
-                    <span class="list-rank">${{i + 1}}</span>
-                    <div class="list-info">
-                        <div class="list-name">${{player.name}}</div>
-                        <div class="list-sub">${{player.corp_name}} · ${{player.position}}</div>
-                    </div>
-                    <span class="list-value ${{player.type === '매수' ? 'positive' : 'negative'}}">
-                        ${{player.type === '매수' ? '+' : '-'}}${{(player.amount / 100000000).toFixed(0)}}억
-                    </span>
-                </div>
-            `).join('');
-        }}
-        
-        // 섹터 렌더링
-        function renderSectors() {{
-            const container = document.getElementById('sector-grid');
-            container.innerHTML = SECTORS.map(sector => `
-                <div class="sector-card">
-                    <div class="sector-name">
-                        <span class="sector-indicator ${{sector.sentiment}}"></span>
-                        ${{sector.sector}}
-                    </div>
-                    <div class="sector-value ${{sector.net_amount >= 0 ? 'positive' : 'negative'}}">
-                        ${{formatAmount(sector.net_amount)}}
-                    </div>
-                </div>
-            `).join('');
-        }}
-        
-        // 테이블 렌더링
-        function renderTable() {{
-            let filtered = TRADES.filter(t => filterByPeriod(t.report_date));
-            
-            if (currentType === 'buy') {{
-                filtered = filtered.filter(t => t.trade_type === '매수');
-            }} else if (currentType === 'sell') {{
-                filtered = filtered.filter(t => t.trade_type === '매도');
-            }}
-            
-            if (searchQuery) {{
-                filtered = filtered.filter(t => 
-                    t.corp_name.toLowerCase().includes(searchQuery.toLowerCase())
-                );
-            }}
-            
-            const tbody = document.getElementById('trades-table');
-            tbody.innerHTML = filtered.slice(0, 100).map(t => {{
-                // 날짜 형식 처리 (이미 하이픈 있으면 그대로, 없으면 추가)
-                let dateDisplay = t.report_date;
-                if (!t.report_date.includes('-')) {{
-                    dateDisplay = t.report_date.slice(0, 4) + '-' + t.report_date.slice(4, 6) + '-' + t.report_date.slice(6, 8);
-                }}
-                
-                return `
-                <tr>
-                    <td>${{dateDisplay}}</td>
-                    <td><strong>${{t.corp_name}}</strong></td>
-                    <td>${{t.insider_name}}</td>
-                    <td>${{t.position || '-'}}</td>
-                    <td><span class="type-badge ${{t.trade_type === '매수' ? 'buy' : t.trade_type === '매도' ? 'sell' : 'other'}}">${{t.trade_type}}</span></td>
-                    <td>${{t.shares_change.toLocaleString()}}주</td>
-                    <td>${{(t.amount / 100000000).toFixed(1)}}억</td>
-                </tr>
-            `}}).join('');
-        }}
-        
-        // 필터 이벤트
-        document.querySelectorAll('.filter-btn[data-period]').forEach(btn => {{
-            btn.addEventListener('click', () => {{
-                document.querySelectorAll('.filter-btn[data-period]').forEach(b => b.classList.remove('active'));
-                btn.classList.add('active');
-                currentPeriod = btn.dataset.period;
-                renderChart();
-                renderTable();
-            }});
-        }});
-        
-        document.querySelectorAll('.filter-btn[data-type]').forEach(btn => {{
-            btn.addEventListener('click', () => {{
-                document.querySelectorAll('.filter-btn[data-type]').forEach(b => b.classList.remove('active'));
-                btn.classList.add('active');
-                currentType = btn.dataset.type;
-                renderTable();
-            }});
-        }});
-        
-        document.getElementById('search-input').addEventListener('input', (e) => {{
-            searchQuery = e.target.value;
-            renderTable();
-        }});
-        
-        // 초기화
-        renderChart();
-        renderHotStocks();
-        renderBigPlayers();
-        renderSectors();
-        renderTable();
-    </script>
-</body>
-</html>'''
-    
-    output_path = Path(__file__).parent.parent / "index.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    
-    print(f"✅ HTML 생성 완료: {output_path}")
+DART_API = "https://opendart.fss.or.kr/api"
+ROOT = Path(__file__).parent.parent
+COMPANIES_PATH = ROOT / "data" / "companies.json"
+KST = timezone(timedelta(hours=9))
+PERIOD_DAYS = 90
+MAX_RETRIES = 3
+RETRY_BACKOFF = 2  # 초, 재시도마다 2배
+
+# DART 지분공시: 대량보유 상황보고 / 임원·주요주주 특정증권등 소유상황보고
+REPORTS = ("majorstock", "elestock")
+
+class QuotaExceeded(RuntimeError):
+    """DART 일일 요청 한도 초과 (status 020)"""
+
+def load_companies(path=COMPANIES_PATH):
+    """수집 대상 종목 목록 (corp_code, stock_code, corp_name, sector, price)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def to_int(value):
+    """DART 숫자 문자열 ("1,234", "-", "") -> int"""
+    if value is None:
+        return 0
+    clean = str(value).replace(",", "").strip()
+    if clean in ("", "-"):
+        return 0
+    return int(float(clean))
+
+def classify_trade(reason, shares_change=0):
+    """보고 사유 -> 매수/매도/기타"""
+    return trade_type(classify_reason(reason, shares_change), reason)
+
+def fetch_reports(session, api_key, report, corp_code):
+    """DART 지분공시 목록 조회 (조회 결과 없음은 빈 목록, 네트워크 오류는 재시도)"""
+    for attempt in range(MAX_RETRIES + 1):
+        metrics.count("api_calls")
+        try:
+            resp = session.get(
+                f"{DART_API}/{report}.json",
+                params={"crtfc_key": api_key, "corp_code": corp_code},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            break
+        except requests.RequestException:
+            if attempt == MAX_RETRIES:
+                raise
+            metrics.count("retries")
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    metrics.count("bytes_downloaded", len(resp.content))
+    body = resp.json()
+    status = body.get("status")
+    if status == "013":
+        return []
+    if status == "020":
+        raise QuotaExceeded(f"DART 요청 한도 초과: {body.get('message')}")
+    if status != "000":
+        raise RuntimeError(f"DART 오류 {status}: {body.get('message')}")
+    rows = body.get("list", [])
+    metrics.count("rows_received", len(rows))
+    return rows
+
+def parse_report(report, row, company):
+    """DART 응답 행 -> Trade"""
+    if report == "elestock":
+        after = to_int(row.get("sp_stock_lmp_cnt"))
+        change = to_int(row.get("sp_stock_lmp_irds_cnt"))
+        position = (row.get("isu_exctv_ofcps") or "").strip()
+        reason = ""
+    else:
+        after = to_int(row.get("stkqy"))
+        change = to_int(row.get("stkqy_irds"))
+        position = ""
+        reason = (row.get("report_resn") or "").strip()
+
+    shares_change = abs(change)
+    report_date = parse_date(row["rcept_dt"]).isoformat()
+    category = classify_reason(reason, change)
+    return Trade.from_dict({
+        "rcept_no": row.get("rcept_no", ""),
+        "corp_name": company["corp_name"],
+        "corp_code": company["corp_code"],
+        "report_date": report_date,
+        "insider_name": (row.get("repror") or "").strip(),
+        "position": position,
+        "change_reason": reason,
+        "shares_before": after - change,
+        "shares_after": after,
+        "shares_change": shares_change,
+        "trade_type": trade_type(category, reason),
+        "stock_code": company["stock_code"],
+        "sector": company.get("sector", "기타"),
+        "price": company.get("price", 0),
+        "amount": shares_change * company.get("price", 0),
+        "category": category,
+    })
+
+def period_cutoff(today=None, period_days=PERIOD_DAYS):
+    """수집 기간 첫날 (YYYY-MM-DD)"""
+    today = today or datetime.now(KST).date()
+    return (today - timedelta(days=period_days)).isoformat()
+
+def iter_company_trades(api_key, companies, session=None, today=None, period_days=PERIOD_DAYS):
+    """종목별 지분공시를 조회하는 대로 (corp_code, 최근 period_days일 거래 목록(공시일 순))을 내는 제너레이터
+
+    보고서 하나라도 조회에 실패한 종목은 일부만 받은 목록을 내지 않고 건너뛴다
+    (호출 쪽이 이전 거래를 유지하도록, scheduler.crawl_stream과 같은 방식).
+    """
+    session = session or requests.Session()
+    cutoff = period_cutoff(today, period_days)
+
+    for i, company in enumerate(companies, 1):
+        rows = []
+        try:
+            for report in REPORTS:
+                rows.extend((report, row) for row in fetch_reports(session, api_key, report, company["corp_code"]))
+        except QuotaExceeded:
+            raise
+        except (requests.RequestException, RuntimeError, ValueError) as e:
+            metrics.count("fetch_errors")
+            print(f"⚠️ {company['corp_name']} {report} 조회 실패: {e}")
+            continue
+        company_trades = [parse_report(report, row, company) for report, row in rows]
+        company_trades = [t for t in company_trades if t["report_date"] >= cutoff]
+        company_trades.sort(key=lambda t: (t["report_date"], t["rcept_no"]))
+        yield company["corp_code"], company_trades
+        if i % 100 == 0:
+            print(f"  {i}/{len(companies)} 종목 조회")
+
+def fetch_trades(api_key, companies, session=None, today=None, period_days=PERIOD_DAYS):
+    """종목별 지분공시를 조회해 최근 period_days일 거래 목록 반환 (조회 실패 종목 제외)"""
+    trades = []
+    for _, company_trades in iter_company_trades(api_key, companies, session, today, period_days):
+        trades.extend(company_trades)
+    return trades
+
+def _assemble(trades, aggregates, clusters, now, period):
+    data = {
+        "lastUpdated": now.strftime("%Y-%m-%d %H:%M"),
+        "period": period,
+        "summary": aggregates["summary"],
+        "trades": trades,
+        "hotStocks": aggregates["hotStocks"],
+        "bigPlayers": aggregates["bigPlayers"],
+        "sectorSentiment": aggregates["sectorSentiment"],
+        "dailyData": aggregates["dailyData"],
+        "clusterBuys": clusters[:MAX_CLUSTERS],
+    }
+    # 종가 행렬(data/prices.npz)이 있을 때만 거래 이후 수익률 집계
+    event_study = analyze_events(trades)
+    if event_study is not None:
+        data["eventStudy"] = event_study
+    return data
+
+def build_data(trades, now=None, period="3M"):
+    """거래 목록 -> insider.json 데이터"""
+    now = now or datetime.now(KST)
+    return _assemble(trades, build_aggregates(trades), detect_clusters(trades), now, period)
+
+class DataBuilder:
+    """종목별 거래를 받는 대로 집계해 두는 build_data (수집과 집계를 겹칠 때)
+
+    add()는 종목 하나의 거래 목록을 받아 집계와 클러스터 윈도우를 갱신하고,
+    build()는 정렬과 이벤트 스터디만 남은 마무리로 build_data와 같은 데이터를 만든다.
+    종목 하나의 거래는 한 번에 넣어야 한다 (클러스터 윈도우가 종목 안에서 공시일 순이어야 함).
+    """
+
+    def __init__(self, top_n=20):
+        self.trades = []
+        self.aggregator = Aggregator(top_n)
+        self.detector = ClusterDetector()
+
+    def add(self, company_trades):
+        self.aggregator.extend(company_trades)
+        for t in sorted(company_trades, key=lambda t: t["report_date"]):
+            self.detector.add(t)
+        self.trades.extend(company_trades)
+
+    def build(self, trades=None, now=None, period="3M"):
+        """insider.json 데이터 (trades를 주면 거래 목록만 그 순서로 저장)"""
+        now = now or datetime.now(KST)
+        trades = self.trades if trades is None else trades
+        return _assemble(trades, self.aggregator.result(), self.detector.clusters(), now, period)
+
+def fetch_data():
+    api_key = os.environ.get("DART_API_KEY")
+    if not api_key:
+        raise SystemExit("❌ DART_API_KEY 환경변수가 없습니다")
+
+    metrics.start_run("fetch")
+    try:
+        with metrics.profiled():
+            companies = load_companies()
+            metrics.count("companies", len(companies))
+            print(f"📡 {len(companies)}개 종목 지분공시 조회")
+            cutoff = period_cutoff()
+            previous = {}
+            if DATA_PATH.exists():
+                for t in load_data()["trades"]:
+                    if t["report_date"] >= cutoff:
+                        previous.setdefault(t["corp_code"], []).append(t)
+            # 조회는 백그라운드 스레드에서, 집계는 도착한 종목부터 메인 스레드에서
+            builder = DataBuilder()
+            checked = set()
+            with metrics.stage("fetch"):
+                for code, company_trades in bounded(iter_company_trades(api_key, companies)):
+                    builder.add(company_trades)
+                    checked.add(code)
+                # 조회에 실패한 종목은 이전 거래 유지
+                for company in companies:
+                    code = company["corp_code"]
+                    if code not in checked and code in previous:
+                        builder.add(previous[code])
+            order = {c["corp_code"]: i for i, c in enumerate(companies)}
+            trades = sorted(builder.trades, key=lambda t: order.get(t["corp_code"], len(order)))
+            metrics.count("trades_out", len(trades))
+            with metrics.stage("aggregate"):
+                data = builder.build(trades)
+            with metrics.stage("save"):
+                save_data(data, checked=checked, cutoff=cutoff)
+        print(f"✅ 데이터 저장 완료: {DATA_PATH} ({len(trades)}건)")
+        return data
+    finally:
+        metrics.write_metrics()
 
 
 if __name__ == "__main__":
-    generate_html()
+    fetch_data()
@@ -4,8 +4,320 @@
 """
 
 import json
+from html import escape
 from pathlib import Path
 
+import metrics
+from aggregate import build_chart_series, build_period_sums, epoch_day
+from clusters import MIN_INSIDERS, WINDOW_DAYS
+from store import load_data
+
+ROOT = Path(__file__).parent.parent
+OUTPUT_PATH = ROOT / "index.html"
+
+# 필터/정렬/집계 Web Worker (일반 문자열: f-string 중괄호 이스케이프 불필요)
+WORKER_JS = r'''
+let cols = null;
+let dicts = null;
+let typeIds = {};
+let corpLower = [];
+let sortColumns = {};
+let lastFilterKey = null;
+let lastIdx = new Uint32Array(0);
+let lastChartKey = null;
+let lastCardsKey = null;
+let sums = null;
+let series = null;
+let dayOrder = null;
+
+// 문자열 사전의 정렬 순위 (정렬 시 문자열 대신 정수 비교)
+function rankColumn(field) {
+    const names = dicts[field];
+    const order = names.map((_, i) => i).sort((a, b) => names[a].localeCompare(names[b], 'ko'));
+    const rank = new Int32Array(names.length);
+    order.forEach((id, r) => { rank[id] = r; });
+    const ids = cols[field];
+    const key = new Int32Array(ids.length);
+    for (let i = 0; i < ids.length; i++) key[i] = rank[ids[i]];
+    return key;
+}
+
+function sortColumn(sortKey) {
+    if (!sortColumns[sortKey]) {
+        if (sortKey === 'report_date') sortColumns[sortKey] = cols.day;
+        else if (sortKey === 'shares_change') sortColumns[sortKey] = cols.shares;
+        else if (sortKey === 'amount') sortColumns[sortKey] = cols.amount;
+        else if (sortKey === 'corp_name') sortColumns[sortKey] = rankColumn('corp');
+        else if (sortKey === 'insider_name') sortColumns[sortKey] = rankColumn('insider');
+        else if (sortKey === 'position') sortColumns[sortKey] = rankColumn('position');
+        else sortColumns[sortKey] = rankColumn('type');
+    }
+    return sortColumns[sortKey];
+}
+
+function filterRows(q) {
+    const n = cols.day.length;
+    const day = cols.day, type = cols.type, corp = cols.corp;
+    let typeId = -1;
+    if (q.tradeType === 'buy') typeId = '매수' in typeIds ? typeIds['매수'] : -2;
+    else if (q.tradeType === 'sell') typeId = '매도' in typeIds ? typeIds['매도'] : -2;
+
+    // 검색어는 종목 사전에만 적용하고, 행 단위로는 정수 마스크만 확인
+    let corpMask = null;
+    const search = q.search.toLowerCase();
+    if (search) {
+        corpMask = new Uint8Array(corpLower.length);
+        for (let i = 0; i < corpLower.length; i++) corpMask[i] = corpLower[i].includes(search) ? 1 : 0;
+    }
+
+    const out = new Uint32Array(n);
+    let m = 0;
+    for (let i = 0; i < n; i++) {
+        if (day[i] < q.startDay || day[i] > q.endDay) continue;
+        if (typeId !== -1 && type[i] !== typeId) continue;
+        if (corpMask !== null && !corpMask[corp[i]]) continue;
+        out[m++] = i;
+    }
+    return out.slice(0, m);
+}
+
+function lowerBound(arr, x, key) {
+    let lo = 0, hi = arr.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if ((key ? key[arr[mid]] : arr[mid]) < x) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+// 누적합 두 항목의 차로 기간 합계를 구한다 (거래 건수가 아닌 종목/섹터 수에 비례)
+function aggregateGroup(group, lo, hi) {
+    const width = sums.dates.length + 1;
+    const out = [];
+    for (let k = 0; k < group.info.length; k++) {
+        const base = k * width;
+        const count = group.count[base + hi] - group.count[base + lo];
+        if (!count) continue;
+        const buy = group.buy[base + hi] - group.buy[base + lo];
+        const sell = group.sell[base + hi] - group.sell[base + lo];
+        const net = buy - sell;
+        out.push(Object.assign({}, group.info[k], {
+            net_amount: net,
+            buy_amount: buy,
+            sell_amount: sell,
+            count: count,
+            sentiment: net > 0 ? 'bullish' : net < 0 ? 'bearish' : 'neutral',
+        }));
+    }
+    return out.sort((a, b) => Math.abs(b.net_amount) - Math.abs(a.net_amount));
+}
+
+// 기간 내 금액 상위 거래 (날짜순 인덱스에서 구간만 탐색)
+function bigPlayers(startDay, endDay, limit) {
+    const lo = lowerBound(dayOrder, startDay, cols.day);
+    const hi = lowerBound(dayOrder, endDay + 1, cols.day);
+    const amount = cols.amount;
+    const top = [];
+    for (let j = lo; j < hi; j++) {
+        const i = dayOrder[j];
+        if (top.length === limit && amount[i] <= amount[top[limit - 1]]) continue;
+        let k = Math.min(top.length, limit - 1);
+        while (k > 0 && amount[top[k - 1]] < amount[i]) k--;
+        top.splice(k, 0, i);
+        if (top.length > limit) top.pop();
+    }
+    return top.map(i => ({
+        name: dicts.insider[cols.insider[i]],
+        corp_name: dicts.corp[cols.corp[i]],
+        position: dicts.position[cols.position[i]],
+        type: dicts.type[cols.type[i]],
+        amount: amount[i],
+        date: new Date(cols.day[i] * 86400000).toISOString().slice(0, 10),
+    }));
+}
+
+function periodCards(startDay, endDay) {
+    const lo = lowerBound(sums.dates, startDay);
+    const hi = lowerBound(sums.dates, endDay + 1);
+    const hotStocks = aggregateGroup(sums.stocks, lo, hi);
+    const summary = { total_buy: 0, total_sell: 0, buy_stocks: 0, sell_stocks: 0, total_trades: 0 };
+    for (const stock of hotStocks) {
+        summary.total_buy += stock.buy_amount;
+        summary.total_sell += stock.sell_amount;
+        summary.total_trades += stock.count;
+        if (stock.net_amount > 0) summary.buy_stocks++;
+        else if (stock.net_amount < 0) summary.sell_stocks++;
+    }
+    summary.net_amount = summary.total_buy - summary.total_sell;
+    return {
+        summary: summary,
+        hotStocks: hotStocks.slice(0, 10),
+        sectors: aggregateGroup(sums.sectors, lo, hi),
+        bigPlayers: bigPlayers(startDay, endDay, 10),
+    };
+}
+
+// 막대 1개에 필요한 최소 픽셀
+const MIN_BAR_PX = 4;
+
+// 일수가 속한 주(월요일 시작)/월의 시작일
+function bucketStart(day, resolution) {
+    if (resolution === 'weekly') return day - (day + 3) % 7;
+    if (resolution === 'monthly') {
+        const d = new Date(day * 86400000);
+        return Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), 1) / 86400000;
+    }
+    return day;
+}
+
+function sliceSeries(resolution, startDay, endDay) {
+    const s = series[resolution];
+    const lo = lowerBound(s.start, bucketStart(Math.max(startDay, -1e8), resolution));
+    const hi = lowerBound(s.start, Math.min(endDay, 1e8) + 1);
+    return { start: s.start.slice(lo, hi), buy: s.buy.slice(lo, hi), sell: s.sell.slice(lo, hi) };
+}
+
+// 인접 구간을 factor개씩 묶어 구간 수를 줄인다
+function mergeBuckets(s, factor) {
+    const n = Math.ceil(s.start.length / factor);
+    const out = { start: new Int32Array(n), buy: new Float64Array(n), sell: new Float64Array(n) };
+    for (let i = 0; i < s.start.length; i++) {
+        const j = Math.floor(i / factor);
+        if (i % factor === 0) out.start[j] = s.start[i];
+        out.buy[j] += s.buy[i];
+        out.sell[j] += s.sell[i];
+    }
+    return out;
+}
+
+// Largest-Triangle-Three-Buckets: 모양을 유지하며 threshold개 점으로 다운샘플
+function lttb(xs, ys, threshold) {
+    const n = xs.length;
+    if (threshold >= n || threshold < 3) return { x: Float64Array.from(xs), y: Float64Array.from(ys) };
+    const outX = new Float64Array(threshold);
+    const outY = new Float64Array(threshold);
+    const every = (n - 2) / (threshold - 2);
+    let a = 0;
+    outX[0] = xs[0];
+    outY[0] = ys[0];
+    for (let i = 0; i < threshold - 2; i++) {
+        // 다음 구간의 평균점
+        let avgStart = Math.floor((i + 1) * every) + 1;
+        let avgEnd = Math.min(Math.floor((i + 2) * every) + 1, n);
+        let avgX = 0, avgY = 0;
+        for (let j = avgStart; j < avgEnd; j++) { avgX += xs[j]; avgY += ys[j]; }
+        const len = avgEnd - avgStart;
+        avgX /= len;
+        avgY /= len;
+
+        // 현재 구간에서 (이전 선택점, 평균점)과 삼각형 넓이가 최대인 점
+        const rangeStart = Math.floor(i * every) + 1;
+        const rangeEnd = Math.floor((i + 1) * every) + 1;
+        let maxArea = -1, next = rangeStart;
+        for (let j = rangeStart; j < rangeEnd; j++) {
+            const area = Math.abs((xs[a] - avgX) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avgY - ys[a]));
+            if (area > maxArea) { maxArea = area; next = j; }
+        }
+        outX[i + 1] = xs[next];
+        outY[i + 1] = ys[next];
+        a = next;
+    }
+    outX[threshold - 1] = xs[n - 1];
+    outY[threshold - 1] = ys[n - 1];
+    return { x: outX, y: outY };
+}
+
+// 차트 데이터: 캔버스 픽셀 수를 넘지 않도록 해상도를 고른다
+function chartSeries(startDay, endDay, width, view) {
+    if (view === 'line') {
+        const s = sliceSeries('daily', startDay, endDay);
+        return {
+            view: 'line',
+            resolution: 'daily',
+            buy: lttb(s.start, s.buy, width),
+            sell: lttb(s.start, s.sell, width),
+        };
+    }
+    const budget = Math.max(1, Math.floor(width / MIN_BAR_PX));
+    let resolution = 'daily';
+    let s = null;
+    for (resolution of ['daily', 'weekly', 'monthly']) {
+        s = sliceSeries(resolution, startDay, endDay);
+        if (s.start.length <= budget) break;
+    }
+    if (s.start.length > budget) s = mergeBuckets(s, Math.ceil(s.start.length / budget));
+    return Object.assign({ view: 'bar', resolution: resolution }, s);
+}
+
+function chartBuffers(chart) {
+    if (chart.view === 'line') return [chart.buy.x.buffer, chart.buy.y.buffer, chart.sell.x.buffer, chart.sell.y.buffer];
+    return [chart.start.buffer, chart.buy.buffer, chart.sell.buffer];
+}
+
+function gather(column, idx, Type) {
+    const out = new Type(idx.length);
+    for (let i = 0; i < idx.length; i++) out[i] = column[idx[i]];
+    return out;
+}
+
+function query(q) {
+    const periodKey = q.startDay + '|' + q.endDay;
+    const filterKey = periodKey + '|' + q.tradeType + '|' + q.search;
+    if (filterKey !== lastFilterKey) {
+        lastIdx = filterRows(q);
+        lastFilterKey = filterKey;
+    }
+    const key = sortColumn(q.sortKey);
+    const dir = q.sortDir;
+    const idx = lastIdx.slice().sort((a, b) => (key[a] - key[b]) * dir || a - b);
+
+    const rows = {
+        day: gather(cols.day, idx, Int32Array),
+        corp: gather(cols.corp, idx, Int32Array),
+        insider: gather(cols.insider, idx, Int32Array),
+        position: gather(cols.position, idx, Int32Array),
+        type: gather(cols.type, idx, Int32Array),
+        category: gather(cols.category, idx, Int32Array),
+        shares: gather(cols.shares, idx, Float64Array),
+        amount: gather(cols.amount, idx, Float64Array),
+    };
+    const transfer = Object.values(rows).map(a => a.buffer);
+    const msg = { type: 'result', id: q.id, total: idx.length, rows: rows, resetScroll: q.resetScroll };
+    const chartKey = periodKey + '|' + q.chartWidth + '|' + q.chartView;
+    if (chartKey !== lastChartKey) {
+        msg.chart = chartSeries(q.startDay, q.endDay, q.chartWidth, q.chartView);
+        lastChartKey = chartKey;
+        transfer.push(...chartBuffers(msg.chart));
+    }
+    if (periodKey !== lastCardsKey) {
+        msg.cards = periodCards(q.startDay, q.endDay);
+        lastCardsKey = periodKey;
+    }
+    self.postMessage(msg, transfer);
+}
+
+self.onmessage = (e) => {
+    const msg = e.data;
+    if (msg.type === 'init') {
+        cols = msg.columns;
+        dicts = msg.dicts;
+        typeIds = {};
+        dicts.type.forEach((name, i) => { typeIds[name] = i; });
+        corpLower = dicts.corp.map(name => name.toLowerCase());
+        sums = msg.sums;
+        series = msg.series;
+        dayOrder = new Uint32Array(cols.day.length).map((_, i) => i).sort((a, b) => cols.day[a] - cols.day[b] || a - b);
+        sortColumns = {};
+        lastFilterKey = null;
+        lastChartKey = null;
+        lastCardsKey = null;
+    } else if (msg.type === 'query') {
+        query(msg);
+    }
+};
+'''
+
 def format_amount(amount):
     """금액 포맷 (억원)"""
     billion = amount / 100_000_000
@@ -13,20 +325,123 @@ def format_amount(amount):
         return f"{billion/10000:.1f}조"
     return f"{billion:.0f}억"
 
-def generate_html():
-    # 데이터 로드
-    data_path = Path(__file__).parent.parent / "data" / "insider.json"
+def build_trade_columns(trades):
+    """거래 목록을 사전 인코딩 컬럼으로 변환 (Web Worker 전송용)
+
+    문자열 필드는 사전(dicts)의 인덱스로, 날짜는 1970-01-01 기준 일수로 저장한다.
+    """
+    dicts = {"corp": [], "insider": [], "position": [], "type": [], "category": []}
+    lookup = {field: {} for field in dicts}
+    columns = {
+        "day": [], "corp": [], "insider": [], "position": [], "type": [], "category": [], "shares": [], "amount": [],
+    }
+    
+    def encode(field, value):
+        ids = lookup[field]
+        if value not in ids:
+            ids[value] = len(dicts[field])
+            dicts[field].append(value)
+        return ids[value]
     
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    for t in trades:
+        columns["day"].append(epoch_day(t["report_date"]))
+        columns["corp"].append(encode("corp", t["corp_name"]))
+        columns["insider"].append(encode("insider", t["insider_name"]))
+        columns["position"].append(encode("position", t["position"] or "-"))
+        columns["type"].append(encode("type", t["trade_type"]))
+        columns["category"].append(encode("category", t["category"]))
+        columns["shares"].append(t["shares_change"])
+        columns["amount"].append(t["amount"])
     
+    return {"dicts": dicts, "columns": columns}
+
+def render_cluster_buys(clusters):
+    """동반 매수 클러스터 목록 (없으면 빈 문자열)"""
+    if not clusters:
+        return ""
+    items = "".join(
+        f'''<div class="list-item">
+                    <div class="list-rank">{i}</div>
+                    <div class="list-info">
+                        <div class="list-name">{escape(c["name"])} <span class="list-sub">{c["stock_code"]} · {escape(c["sector"])}</span></div>
+                        <div class="list-sub">{c["start"]} ~ {c["end"]} · 내부자 {c["insiders"]}명 · {c["trades"]}건 · {escape(", ".join(c["names"][:5]))}</div>
+                    </div>
+                    <div class="list-value {"positive" if c["netAmount"] >= 0 else "negative"}">{"+" if c["netAmount"] >= 0 else ""}{format_amount(c["netAmount"])}</div>
+                </div>'''
+        for i, c in enumerate(clusters, 1)
+    )
+    return f'''
+        <div class="list-section" style="margin-bottom: 24px;">
+            <div class="section-title">🤝 내부자 동반 매수 ({WINDOW_DAYS}거래일 안 {MIN_INSIDERS}명 이상 순매수)</div>
+            {items}
+        </div>
+        '''
+
+def _signed_pct(value):
+    if value is None:
+        return '<td class="muted">-</td>'
+    cls = "positive" if value > 0 else "negative" if value < 0 else ""
+    return f'<td class="{cls}">{value * 100:+.1f}%</td>'
+
+def render_event_study(study):
+    """거래 이후 코스피 대비 초과 수익률 표 (eventStudy가 없으면 빈 문자열)"""
+    if not study:
+        return ""
+    horizons = study["horizons"]
+    head = "".join(f"<th>+{h}일 초과</th><th>+{h}일 적중</th>" for h in horizons)
+    tables = []
+    for name, title in (("byPosition", "직위별"), ("bySector", "섹터별"), ("byInsider", "보고자별 (거래 많은 순)")):
+        groups = ([study["overall"]] if name == "byPosition" and study.get("overall") else []) + study.get(name, [])
+        if not groups:
+            continue
+        rows = "".join(
+            f'<tr><td>{escape(g["key"])}</td><td>{g["events"]:,}</td>'
+            + "".join(
+                _signed_pct(g[f"excess{h}"])
+                + (f'<td>{g[f"hit{h}"] * 100:.0f}%</td>' if g[f"hit{h}"] is not None else '<td class="muted">-</td>')
+                for h in horizons
+            )
+            + "</tr>"
+            for g in groups
+        )
+        tables.append(
+            f'<div class="study-title">{title}</div>'
+            f'<table class="study-table"><thead><tr><th>구분</th><th>거래</th>{head}</tr></thead>'
+            f"<tbody>{rows}</tbody></table>"
+        )
+    price_range = study["priceRange"]
+    return f'''
+        <div class="chart-section">
+            <div class="section-title">🎯 거래 이후 수익률 ({study["benchmark"]} 대비, 매도는 하락을 적중으로 계산)</div>
+            <div class="study-sub">공시일 종가 기준 · 종가 {price_range["from"]} ~ {price_range["to"]}</div>
+            {"".join(tables)}
+        </div>
+        '''
+
+def render_sections(data):
+    """데이터에 따라 서버에서 그리는 섹션 (동반 매수, 이벤트 스터디)"""
+    return render_cluster_buys(data.get("clusterBuys")) + render_event_study(data.get("eventStudy"))
+
+def render_html(data, inline=True):
+    """insider.json 형태의 데이터로 대시보드 HTML 문자열 생성
+
+    inline=False면 데이터 없이 셸만 만든다 (서비스 워커가 dataset.json으로 채움, site_data.py).
+    """
     last_updated = data["lastUpdated"]
     summary = data["summary"]
-    trades_json = json.dumps(data["trades"], ensure_ascii=False)
-    hot_stocks_json = json.dumps(data["hotStocks"], ensure_ascii=False)
-    big_players_json = json.dumps(data["bigPlayers"], ensure_ascii=False)
-    sector_json = json.dumps(data["sectorSentiment"], ensure_ascii=False)
-    daily_json = json.dumps(data["dailyData"], ensure_ascii=False)
+    if inline:
+        dataset_json = json.dumps({
+            "columns": build_trade_columns(data["trades"]),
+            "periodSums": build_period_sums(data["trades"]),
+            "chartSeries": build_chart_series(data["trades"]),
+            "hotStocks": data["hotStocks"],
+            "bigPlayers": data["bigPlayers"],
+            "sectors": data["sectorSentiment"],
+        }, ensure_ascii=False, separators=(",", ":"))
+        sections = render_sections(data)
+    else:
+        dataset_json = "null"
+        sections = ""
     
     net_amount_str = format_amount(summary["net_amount"])
     total_buy_str = format_amount(summary["total_buy"])
@@ -98,6 +513,17 @@ def generate_html():
         }}
         .filter-btn:hover {{ color: #fff; }}
         .filter-btn.active {{ background: #3b82f6; color: #fff; }}
+        .date-range {{ align-items: center; color: #6b7280; font-size: 13px; }}
+        .date-range input {{
+            background: transparent;
+            border: none;
+            color: #9ca3af;
+            font-size: 13px;
+            padding: 6px 8px;
+            color-scheme: dark;
+        }}
+        .date-range.active {{ outline: 1px solid #3b82f6; }}
+        .date-range.active input {{ color: #fff; }}
         
         .chart-section {{
             background: #111;
@@ -116,6 +542,8 @@ def generate_html():
         .chart-container {{
             height: 300px;
         }}
+        .chart-header {{ justify-content: space-between; }}
+        .chart-header .filter-btn {{ padding: 4px 12px; font-size: 12px; }}
         
         .grid-2 {{
             display: grid;
@@ -200,9 +628,16 @@ def generate_html():
             max-height: 400px;
             overflow-y: auto;
         }}
+        .table-tools {{
+            display: flex;
+            align-items: center;
+            gap: 12px;
+        }}
+        .table-count {{ font-size: 12px; color: #6b7280; }}
         table {{
             width: 100%;
             border-collapse: collapse;
+            table-layout: fixed;
         }}
         th {{
             text-align: left;
@@ -216,11 +651,20 @@ def generate_html():
             top: 0;
             background: #111;
         }}
+        th[data-sort] {{ cursor: pointer; user-select: none; }}
+        th[data-sort]:hover {{ color: #fff; }}
+        th[aria-sort="ascending"]::after {{ content: ' ▲'; }}
+        th[aria-sort="descending"]::after {{ content: ' ▼'; }}
         td {{
             padding: 12px 16px;
             font-size: 13px;
             border-bottom: 1px solid #1a1a1a;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
         }}
+        tr.trade-row {{ height: 45px; }}
+        tr.spacer td {{ padding: 0; border: none; }}
         tr:hover {{ background: #0a0a0a; }}
         .type-badge {{
             display: inline-block;
@@ -232,35 +676,42 @@ def generate_html():
         .type-badge.buy {{ background: #14532d; color: #22c55e; }}
         .type-badge.sell {{ background: #7f1d1d; color: #ef4444; }}
         .type-badge.other {{ background: #1f2937; color: #9ca3af; }}
+
+        .study-sub {{ font-size: 12px; color: #6b7280; margin: -8px 0 12px; }}
+        .study-title {{ font-size: 13px; font-weight: 600; color: #9ca3af; margin: 16px 0 4px; }}
+        .study-table td, .study-table th {{ padding: 8px 12px; }}
+        .study-table td.positive {{ color: #22c55e; }}
+        .study-table td.negative {{ color: #ef4444; }}
+        .study-table td.muted {{ color: #4b5563; }}
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1 class="title">📊 코스피 200 내부자 거래</h1>
-            <p class="subtitle">마지막 업데이트: {last_updated} · 최근 3개월 데이터</p>
+            <p class="subtitle">마지막 업데이트: <span id="last-updated">{last_updated}</span> · 최근 3개월 데이터</p>
         </div>
         
         <div class="summary-cards">
             <div class="summary-card">
                 <div class="card-label">전체 순매수</div>
-                <div class="card-value {"positive" if summary["net_amount"] >= 0 else "negative"}">{("+" if summary["net_amount"] >= 0 else "") + net_amount_str}원</div>
-                <div class="card-sub">매수 {total_buy_str} / 매도 {total_sell_str}</div>
+                <div class="card-value {"positive" if summary["net_amount"] >= 0 else "negative"}" id="summary-net">{("+" if summary["net_amount"] >= 0 else "") + net_amount_str}원</div>
+                <div class="card-sub" id="summary-net-sub">매수 {total_buy_str} / 매도 {total_sell_str}</div>
             </div>
             <div class="summary-card">
                 <div class="card-label">매수 우위 종목</div>
-                <div class="card-value positive">{summary["buy_stocks"]}개</div>
+                <div class="card-value positive" id="summary-buy-stocks">{summary["buy_stocks"]}개</div>
                 <div class="card-sub">순매수 > 0</div>
             </div>
             <div class="summary-card">
                 <div class="card-label">매도 우위 종목</div>
-                <div class="card-value negative">{summary["sell_stocks"]}개</div>
+                <div class="card-value negative" id="summary-sell-stocks">{summary["sell_stocks"]}개</div>
                 <div class="card-sub">순매수 &lt; 0</div>
             </div>
             <div class="summary-card">
                 <div class="card-label">총 거래 건수</div>
-                <div class="card-value" style="color: #fff;">{summary["total_trades"]}건</div>
-                <div class="card-sub">3개월 누적</div>
+                <div class="card-value" style="color: #fff;" id="summary-trades">{summary["total_trades"]}건</div>
+                <div class="card-sub" id="summary-trades-sub">3개월 누적</div>
             </div>
         </div>
         
@@ -270,6 +721,11 @@ def generate_html():
                 <button class="filter-btn" data-period="1M">1개월</button>
                 <button class="filter-btn active" data-period="3M">3개월</button>
             </div>
+            <div class="filter-group date-range">
+                <input type="date" id="range-from" aria-label="시작일">
+                <span>~</span>
+                <input type="date" id="range-to" aria-label="종료일">
+            </div>
             <div class="filter-group">
                 <button class="filter-btn active" data-type="all">전체</button>
                 <button class="filter-btn" data-type="buy">매수</button>
@@ -278,8 +734,14 @@ def generate_html():
         </div>
         
         <div class="chart-section">
-            <div class="section-title">📈 일별 매수/매도 추이</div>
-            <div class="chart-container">
+            <div class="section-title chart-header">
+                <span>📈 <span id="chart-resolution">일별</span> 매수/매도 추이</span>
+                <div class="filter-group">
+                    <button class="filter-btn active" data-view="bar">막대</button>
+                    <button class="filter-btn" data-view="line">추세선</button>
+                </div>
+            </div>
+            <div class="chart-container" id="chart-container">
                 <canvas id="dailyChart"></canvas>
             </div>
         </div>
@@ -300,49 +762,59 @@ def generate_html():
             <div class="sector-grid" id="sector-grid"></div>
         </div>
         
+        <div id="data-sections">{sections}</div>
         <div class="table-section">
             <div class="table-header">
                 <div class="section-title" style="margin: 0;">📋 상세 거래 내역</div>
-                <input type="text" id="search-input" placeholder="종목명 검색..." style="
-                    background: #1a1a1a;
-                    border: 1px solid #333;
-                    border-radius: 6px;
-                    padding: 8px 12px;
-                    color: #fff;
-                    font-size: 13px;
-                    width: 200px;
-                ">
+                <div class="table-tools">
+                    <span class="table-count" id="table-count"></span>
+                    <input type="text" id="search-input" placeholder="종목명 검색..." style="
+                        background: #1a1a1a;
+                        border: 1px solid #333;
+                        border-radius: 6px;
+                        padding: 8px 12px;
+                        color: #fff;
+                        font-size: 13px;
+                        width: 200px;
+                    ">
+                </div>
             </div>
-            <div class="table-scroll">
+            <div class="table-scroll" id="table-scroll">
                 <table>
                     <thead>
                         <tr>
-                            <th>날짜</th>
-                            <th>종목</th>
-                            <th>내부자</th>
-                            <th>직위</th>
-                            <th>유형</th>
-                            <th>수량</th>
-                            <th>금액</th>
+                            <th data-sort="report_date" aria-sort="descending">날짜</th>
+                            <th data-sort="corp_name">종목</th>
+                            <th data-sort="insider_name">내부자</th>
+                            <th data-sort="position">직위</th>
+                            <th data-sort="trade_type">유형</th>
+                            <th data-sort="shares_change">수량</th>
+                            <th data-sort="amount">금액</th>
                         </tr>
                     </thead>
-                    <tbody id="trades-table"></tbody>
+                    <tbody id="trades-table">
+                        <tr class="spacer" id="spacer-top"><td colspan="7"></td></tr>
+                        <tr class="spacer" id="spacer-bottom"><td colspan="7"></td></tr>
+                    </tbody>
                 </table>
             </div>
         </div>
     </div>
 
+    <script id="filter-worker-src" type="text/js-worker">{WORKER_JS}</script>
     <script>
-        const TRADES = {trades_json};
-        const HOT_STOCKS = {hot_stocks_json};
-        const BIG_PLAYERS = {big_players_json};
-        const SECTORS = {sector_json};
-        const DAILY_DATA = {daily_json};
+        // 셸(app.html)에는 데이터가 없고(null) 서비스 워커가 만든 dataset.json을 받는다
+        const INLINE_DATA = {dataset_json};
+        
+        const DAY_MS = 24 * 60 * 60 * 1000;
+        let DICTS = null;
         
         let currentPeriod = '3M';
+        let customRange = null;
         let currentType = 'all';
         let searchQuery = '';
         let chart = null;
+        let chartView = 'bar';
         
         // 금액 포맷
         function formatAmount(amount) {{
@@ -354,89 +826,134 @@ def generate_html():
             return sign + billion.toFixed(0) + '억';
         }}
         
-        // 날짜 필터
-        function filterByPeriod(dateStr) {{
-            const date = new Date(dateStr.slice(0, 4) + '-' + dateStr.slice(4, 6) + '-' + dateStr.slice(6, 8));
-            const now = new Date();
+        // 일수(1970-01-01 기준) -> YYYY-MM-DD
+        const dayLabels = new Map();
+        function formatDay(day) {{
+            let label = dayLabels.get(day);
+            if (label === undefined) {{
+                label = new Date(day * DAY_MS).toISOString().slice(0, 10);
+                dayLabels.set(day, label);
+            }}
+            return label;
+        }}
+        
+        // 차트 캔버스 너비 (px): 이보다 많은 점은 그리지 않는다
+        function chartWidth() {{
+            return Math.floor(document.getElementById('chart-container').clientWidth) || 800;
+        }}
+        
+        // 선택 기간 [startDay, endDay] (1970-01-01 기준 일수)
+        function periodWindow() {{
+            if (currentPeriod === 'custom') return customRange;
             let daysAgo = 90;
             if (currentPeriod === '1W') daysAgo = 7;
             else if (currentPeriod === '1M') daysAgo = 30;
-            const cutoff = new Date(now - daysAgo * 24 * 60 * 60 * 1000);
-            return date >= cutoff;
+            return {{ startDay: Math.floor((Date.now() - daysAgo * DAY_MS) / DAY_MS), endDay: 2147483647 }};
+        }}
+        
+        function periodLabel() {{
+            if (currentPeriod === 'custom') return formatDay(customRange.startDay) + ' ~ ' + formatDay(customRange.endDay);
+            return {{ '1W': '1주', '1M': '1개월', '3M': '3개월' }}[currentPeriod] + ' 누적';
         }}
         
         // 차트 렌더링
-        function renderChart() {{
-            const filtered = DAILY_DATA.filter(d => filterByPeriod(d.date));
+        const RESOLUTION_LABELS = {{ daily: '일별', weekly: '주별', monthly: '월별' }};
+        
+        // 축 라벨: 해상도에 맞춰 MM/DD 또는 YYYY-MM
+        function formatBucket(day, resolution) {{
+            const label = formatDay(day);
+            return resolution === 'monthly' ? label.slice(0, 7) : label.slice(5).replace('-', '/');
+        }}
+        
+        // 차트 렌더링 (막대: 해상도별 구간 합계, 추세선: LTTB 다운샘플)
+        function renderChart(series) {{
+            document.getElementById('chart-resolution').textContent = RESOLUTION_LABELS[series.resolution];
+            const width = chartWidth();
+            const ticks = {{
+                color: '#6b7280',
+                font: {{ size: 10 }},
+                autoSkip: true,
+                maxRotation: 0,
+                maxTicksLimit: Math.max(2, Math.floor(width / 70)),
+            }};
             
-            const labels = filtered.map(d => d.date.slice(4, 6) + '/' + d.date.slice(6, 8));
-            const buyData = filtered.map(d => d.buy / 100000000);
-            const sellData = filtered.map(d => -d.sell / 100000000);
+            let data;
+            let xScale;
+            if (series.view === 'line') {{
+                const points = (xs, ys, sign) => Array.from(xs, (x, i) => ({{ x: x, y: sign * ys[i] / 100000000 }}));
+                data = {{
+                    datasets: [
+                        {{ label: '매수', data: points(series.buy.x, series.buy.y, 1), borderColor: '#22c55e', backgroundColor: '#22c55e' }},
+                        {{ label: '매도', data: points(series.sell.x, series.sell.y, -1), borderColor: '#ef4444', backgroundColor: '#ef4444' }},
+                    ]
+                }};
+                xScale = {{
+                    type: 'linear',
+                    grid: {{ color: '#222' }},
+                    ticks: Object.assign({{ callback: (v) => formatBucket(Math.round(v), 'daily') }}, ticks),
+                }};
+            }} else {{
+                data = {{
+                    labels: Array.from(series.start, d => formatBucket(d, series.resolution)),
+                    datasets: [
+                        {{ label: '매수', data: Array.from(series.buy, v => v / 100000000), backgroundColor: '#22c55e', borderRadius: 4 }},
+                        {{ label: '매도', data: Array.from(series.sell, v => -v / 100000000), backgroundColor: '#ef4444', borderRadius: 4 }},
+                    ]
+                }};
+                xScale = {{ grid: {{ color: '#222' }}, ticks: ticks }};
+            }}
             
-            if (chart) {{
-                chart.data.labels = labels;
-                chart.data.datasets[0].data = buyData;
-                chart.data.datasets[1].data = sellData;
+            if (chart && chart.config.type === (series.view === 'line' ? 'line' : 'bar')) {{
+                chart.data.labels = data.labels;
+                chart.data.datasets.forEach((dataset, i) => {{ dataset.data = data.datasets[i].data; }});
+                chart.options.scales.x = xScale;
                 chart.update();
-            }} else {{
-                const ctx = document.getElementById('dailyChart').getContext('2d');
-                chart = new Chart(ctx, {{
-                    type: 'bar',
-                    data: {{
-                        labels: labels,
-                        datasets: [
-                            {{
-                                label: '매수',
-                                data: buyData,
-                                backgroundColor: '#22c55e',
-                                borderRadius: 4,
-                            }},
-                            {{
-                                label: '매도',
-                                data: sellData,
-                                backgroundColor: '#ef4444',
-                                borderRadius: 4,
+                return;
+            }}
+            if (chart) chart.destroy();
+            
+            const ctx = document.getElementById('dailyChart').getContext('2d');
+            chart = new Chart(ctx, {{
+                type: series.view === 'line' ? 'line' : 'bar',
+                data: data,
+                options: {{
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    animation: false,
+                    parsing: series.view === 'line' ? false : undefined,
+                    elements: {{ point: {{ radius: 0 }}, line: {{ borderWidth: 1.5 }} }},
+                    plugins: {{
+                        legend: {{
+                            display: true,
+                            position: 'top',
+                            labels: {{ color: '#9ca3af', font: {{ size: 11 }} }}
+                        }},
+                        tooltip: {{
+                            callbacks: {{
+                                title: (items) => series.view === 'line' ? formatDay(items[0].parsed.x) : items[0].label,
+                                label: (ctx) => ctx.dataset.label + ': ' + Math.abs(ctx.parsed.y).toFixed(0) + '억원'
                             }}
-                        ]
+                        }}
                     }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            legend: {{
-                                display: true,
-                                position: 'top',
-                                labels: {{ color: '#9ca3af', font: {{ size: 11 }} }}
-                            }},
-                            tooltip: {{
-                                callbacks: {{
-                                    label: (ctx) => ctx.dataset.label + ': ' + Math.abs(ctx.parsed.y).toFixed(0) + '억원'
-                                }}
-                            }}
-                        }},
-                        scales: {{
-                            x: {{
-                                grid: {{ color: '#222' }},
-                                ticks: {{ color: '#6b7280', font: {{ size: 10 }} }}
-                            }},
-                            y: {{
-                                grid: {{ color: '#222' }},
-                                ticks: {{
-                                    color: '#6b7280',
-                                    font: {{ size: 10 }},
-                                    callback: (v) => Math.abs(v) + '억'
-                                }}
+                    scales: {{
+                        x: xScale,
+                        y: {{
+                            grid: {{ color: '#222' }},
+                            ticks: {{
+                                color: '#6b7280',
+                                font: {{ size: 10 }},
+                                callback: (v) => Math.abs(v) + '억'
                             }}
                         }}
                     }}
-                }});
-            }}
+                }}
+            }});
         }}
         
         // Hot Stocks 렌더링
-        function renderHotStocks() {{
+        function renderHotStocks(stocks) {{
             const container = document.getElementById('hot-stocks-list');
-            container.innerHTML = HOT_STOCKS.slice(0, 10).map((stock, i) => `
+            container.innerHTML = stocks.slice(0, 10).map((stock, i) => `
                 <div class="list-item">
                     <span class="list-rank">${{i + 1}}</span>
                     <div class="list-info">
@@ -451,9 +968,9 @@ def generate_html():
         }}
         
         // Big Players 렌더링
-        function renderBigPlayers() {{
+        function renderBigPlayers(players) {{
             const container = document.getElementById('big-players-list');
-            container.innerHTML = BIG_PLAYERS.slice(0, 10).map((player, i) => `
+            container.innerHTML = players.slice(0, 10).map((player, i) => `
                 <div class="list-item">
                     <span class="list-rank">${{i + 1}}</span>
                     <div class="list-info">
@@ -468,9 +985,9 @@ def generate_html():
         }}
         
         // 섹터 렌더링
-        function renderSectors() {{
+        function renderSectors(sectors) {{
             const container = document.getElementById('sector-grid');
-            container.innerHTML = SECTORS.map(sector => `
+            container.innerHTML = sectors.map(sector => `
                 <div class="sector-card">
                     <div class="sector-name">
                         <span class="sector-indicator ${{sector.sentiment}}"></span>
@@ -483,47 +1000,291 @@ def generate_html():
             `).join('');
         }}
         
-        // 테이블 렌더링
-        function renderTable() {{
-            let filtered = TRADES.filter(t => filterByPeriod(t.report_date));
+        // 요약 카드 렌더링 (선택 기간 기준)
+        function renderSummary(summary) {{
+            const net = document.getElementById('summary-net');
+            net.textContent = formatAmount(summary.net_amount) + '원';
+            net.className = 'card-value ' + (summary.net_amount >= 0 ? 'positive' : 'negative');
+            document.getElementById('summary-net-sub').textContent =
+                '매수 ' + formatAmount(summary.total_buy).slice(1) + ' / 매도 ' + formatAmount(summary.total_sell).slice(1);
+            document.getElementById('summary-buy-stocks').textContent = summary.buy_stocks + '개';
+            document.getElementById('summary-sell-stocks').textContent = summary.sell_stocks + '개';
+            document.getElementById('summary-trades').textContent = numberFormat.format(summary.total_trades) + '건';
+            document.getElementById('summary-trades-sub').textContent = periodLabel();
+        }}
+        
+        // 필터/정렬/집계 워커
+        // 데이터는 워커가 소유하고, 메인 스레드는 결과 컬럼을 화면에 반영만 한다
+        function createFilterWorker() {{
+            const src = document.getElementById('filter-worker-src').textContent;
+            try {{
+                return new Worker(URL.createObjectURL(new Blob([src], {{ type: 'text/javascript' }})));
+            }} catch (e) {{
+                return createInlineWorker(src);
+            }}
+        }}
+        
+        // Worker를 쓸 수 없는 환경(file:// 제한 등): 같은 코드를 메인 스레드에서 실행
+        function createInlineWorker(src) {{
+            const port = {{ onmessage: null }};
+            const scope = {{ onmessage: null }};
+            port.postMessage = (data) => setTimeout(() => scope.onmessage({{ data }}), 0);
+            scope.postMessage = (data) => setTimeout(() => port.onmessage && port.onmessage({{ data }}), 0);
+            new Function('self', src)(scope);
+            return port;
+        }}
+        
+        const filterWorker = createFilterWorker();
+        function initFilterWorker(dataset) {{
+            const c = dataset.columns.columns;
+            const columns = {{
+                day: Int32Array.from(c.day),
+                corp: Int32Array.from(c.corp),
+                insider: Int32Array.from(c.insider),
+                position: Int32Array.from(c.position),
+                type: Int32Array.from(c.type),
+                category: Int32Array.from(c.category),
+                shares: Float64Array.from(c.shares),
+                amount: Float64Array.from(c.amount),
+            }};
             
-            if (currentType === 'buy') {{
-                filtered = filtered.filter(t => t.trade_type === '매수');
-            }} else if (currentType === 'sell') {{
-                filtered = filtered.filter(t => t.trade_type === '매도');
+            // 종목/섹터 누적합을 [키 x (날짜 수 + 1)] 평면 배열로 변환
+            const width = dataset.periodSums.dates.length + 1;
+            const flatten = (entries) => {{
+                const group = {{
+                    info: [],
+                    buy: new Float64Array(entries.length * width),
+                    sell: new Float64Array(entries.length * width),
+                    count: new Float64Array(entries.length * width),
+                }};
+                entries.forEach((entry, k) => {{
+                    const {{ buy, sell, count, ...info }} = entry;
+                    group.info.push(info);
+                    group.buy.set(buy, k * width);
+                    group.sell.set(sell, k * width);
+                    group.count.set(count, k * width);
+                }});
+                return group;
+            }};
+            const sums = {{
+                dates: Int32Array.from(dataset.periodSums.dates),
+                stocks: flatten(dataset.periodSums.stocks),
+                sectors: flatten(dataset.periodSums.sectors),
+            }};
+            const series = {{}};
+            for (const [resolution, s] of Object.entries(dataset.chartSeries)) {{
+                series[resolution] = {{
+                    start: Int32Array.from(s.start),
+                    buy: Float64Array.from(s.buy),
+                    sell: Float64Array.from(s.sell),
+                }};
             }}
             
-            if (searchQuery) {{
-                filtered = filtered.filter(t => 
-                    t.corp_name.toLowerCase().includes(searchQuery.toLowerCase())
-                );
+            const transfer = Object.values(columns).map(a => a.buffer);
+            transfer.push(sums.dates.buffer);
+            for (const group of [sums.stocks, sums.sectors]) transfer.push(group.buy.buffer, group.sell.buffer, group.count.buffer);
+            for (const s of Object.values(series)) transfer.push(s.start.buffer, s.buy.buffer, s.sell.buffer);
+            filterWorker.postMessage({{ type: 'init', dicts: DICTS, columns, sums, series }}, transfer);
+            delete dataset.columns.columns;
+            dataset.periodSums.stocks = dataset.periodSums.sectors = null;
+        }}
+        
+        // 테이블 (가상 스크롤)
+        // 화면에 보이는 행만 DOM에 유지하고, 스크롤 시 행 노드를 재사용한다
+        const ROW_OVERSCAN = 8;
+        const numberFormat = new Intl.NumberFormat('ko-KR');
+        let tableRows = {{ length: 0 }};
+        let sortKey = 'report_date';
+        let sortDir = -1;
+        let queryId = 0;
+        let rowHeight = 45;
+        let rowPool = [];
+        let renderedStart = -1;
+        let renderedEnd = -1;
+        let scrollPending = false;
+        
+        const tableScroll = document.getElementById('table-scroll');
+        const tableBody = document.getElementById('trades-table');
+        const spacerTop = document.getElementById('spacer-top').firstElementChild;
+        const spacerBottom = document.getElementById('spacer-bottom');
+        const spacerBottomCell = spacerBottom.firstElementChild;
+        
+        function createRow() {{
+            const tr = document.createElement('tr');
+            tr.className = 'trade-row';
+            for (let i = 0; i < 7; i++) tr.appendChild(document.createElement('td'));
+            const badge = document.createElement('span');
+            tr.children[4].appendChild(badge);
+            const name = document.createElement('strong');
+            tr.children[1].appendChild(name);
+            tableBody.insertBefore(tr, spacerBottom);
+            return tr;
+        }}
+        
+        function fillRow(tr, i) {{
+            if (tr.rows === tableRows && tr.boundIndex === i) return;
+            tr.rows = tableRows;
+            tr.boundIndex = i;  // rowIndex는 읽기 전용 DOM 속성이라 별도 속성에 기록
+            const cells = tr.children;
+            const tradeType = DICTS.type[tableRows.type[i]];
+            cells[0].textContent = formatDay(tableRows.day[i]);
+            cells[1].firstChild.textContent = DICTS.corp[tableRows.corp[i]];
+            cells[2].textContent = DICTS.insider[tableRows.insider[i]];
+            cells[3].textContent = DICTS.position[tableRows.position[i]];
+            const badge = cells[4].firstChild;
+            badge.className = 'type-badge ' + (tradeType === '매수' ? 'buy' : tradeType === '매도' ? 'sell' : 'other');
+            badge.textContent = DICTS.category[tableRows.category[i]];
+            badge.title = tradeType;
+            cells[5].textContent = numberFormat.format(tableRows.shares[i]) + '주';
+            cells[6].textContent = (tableRows.amount[i] / 100000000).toFixed(1) + '억';
+        }}
+        
+        function renderWindow(force) {{
+            const viewport = tableScroll.clientHeight || 400;
+            const visible = Math.ceil(viewport / rowHeight) + ROW_OVERSCAN * 2;
+            const start = Math.max(0, Math.floor(tableScroll.scrollTop / rowHeight) - ROW_OVERSCAN);
+            const end = Math.min(tableRows.length, start + visible);
+            if (!force && start === renderedStart && end === renderedEnd) return;
+            renderedStart = start;
+            renderedEnd = end;
+            
+            while (rowPool.length < end - start) rowPool.push(createRow());
+            spacerTop.style.height = (start * rowHeight) + 'px';
+            spacerBottomCell.style.height = ((tableRows.length - end) * rowHeight) + 'px';
+            
+            for (let i = 0; i < rowPool.length; i++) {{
+                const tr = rowPool[i];
+                if (start + i < end) {{
+                    fillRow(tr, start + i);
+                    tr.hidden = false;
+                }} else {{
+                    tr.hidden = true;
+                }}
             }}
             
-            const tbody = document.getElementById('trades-table');
-            tbody.innerHTML = filtered.slice(0, 100).map(t => `
-                <tr>
-                    <td>${{t.report_date.slice(0, 4)}}-${{t.report_date.slice(4, 6)}}-${{t.report_date.slice(6, 8)}}</td>
-                    <td><strong>${{t.corp_name}}</strong></td>
-                    <td>${{t.insider_name}}</td>
-                    <td>${{t.position}}</td>
-                    <td><span class="type-badge ${{t.trade_type === '매수' ? 'buy' : t.trade_type === '매도' ? 'sell' : 'other'}}">${{t.trade_type}}</span></td>
-                    <td>${{t.shares_change.toLocaleString()}}주</td>
-                    <td>${{(t.amount / 100000000).toFixed(1)}}억</td>
-                </tr>
-            `).join('');
+            // 실제 행 높이로 보정 (폰트/배율 차이)
+            if (rowPool.length && !rowPool[0].hidden) {{
+                const measured = rowPool[0].getBoundingClientRect().height;
+                if (measured && Math.abs(measured - rowHeight) > 0.5) {{
+                    rowHeight = measured;
+                    renderWindow(true);
+                }}
+            }}
+        }}
+        
+        function updateSortHeaders() {{
+            document.querySelectorAll('th[data-sort]').forEach(th => {{
+                if (th.dataset.sort === sortKey) {{
+                    th.setAttribute('aria-sort', sortDir > 0 ? 'ascending' : 'descending');
+                }} else {{
+                    th.removeAttribute('aria-sort');
+                }}
+            }});
         }}
         
+        // 테이블 렌더링 (워커에 질의, 결과는 onmessage에서 반영)
+        function renderTable(resetScroll = true) {{
+            if (!DICTS) return;  // 데이터셋 로드 전
+            const period = periodWindow();
+            filterWorker.postMessage({{
+                type: 'query',
+                id: ++queryId,
+                startDay: period.startDay,
+                endDay: period.endDay,
+                tradeType: currentType,
+                search: searchQuery,
+                sortKey: sortKey,
+                sortDir: sortDir,
+                chartWidth: chartWidth(),
+                chartView: chartView,
+                resetScroll: resetScroll,
+            }});
+        }}
+        
+        filterWorker.onmessage = (e) => {{
+            const msg = e.data;
+            if (msg.type !== 'result' || msg.id !== queryId) return;  // 지난 질의 결과는 버림
+            
+            tableRows = msg.rows;
+            tableRows.length = msg.total;
+            document.getElementById('table-count').textContent = numberFormat.format(msg.total) + '건';
+            if (msg.resetScroll) tableScroll.scrollTop = 0;
+            updateSortHeaders();
+            renderWindow(true);
+            if (msg.chart) renderChart(msg.chart);
+            if (msg.cards) {{
+                renderSummary(msg.cards.summary);
+                renderHotStocks(msg.cards.hotStocks);
+                renderBigPlayers(msg.cards.bigPlayers);
+                renderSectors(msg.cards.sectors);
+            }}
+        }};
+        
+        tableScroll.addEventListener('scroll', () => {{
+            if (scrollPending) return;
+            scrollPending = true;
+            requestAnimationFrame(() => {{
+                scrollPending = false;
+                renderWindow(false);
+            }});
+        }}, {{ passive: true }});
+        
+        let resizeTimer = null;
+        window.addEventListener('resize', () => {{
+            renderWindow(false);
+            clearTimeout(resizeTimer);
+            resizeTimer = setTimeout(() => renderTable(false), 200);
+        }});
+        
+        document.querySelectorAll('.filter-btn[data-view]').forEach(btn => {{
+            btn.addEventListener('click', () => {{
+                document.querySelectorAll('.filter-btn[data-view]').forEach(b => b.classList.remove('active'));
+                btn.classList.add('active');
+                chartView = btn.dataset.view;
+                renderTable(false);
+            }});
+        }});
+        
+        document.querySelectorAll('th[data-sort]').forEach(th => {{
+            th.addEventListener('click', () => {{
+                if (sortKey === th.dataset.sort) {{
+                    sortDir = -sortDir;
+                }} else {{
+                    sortKey = th.dataset.sort;
+                    sortDir = (sortKey === 'shares_change' || sortKey === 'amount' || sortKey === 'report_date') ? -1 : 1;
+                }}
+                renderTable(false);
+            }});
+        }});
+        
         // 필터 이벤트
         document.querySelectorAll('.filter-btn[data-period]').forEach(btn => {{
             btn.addEventListener('click', () => {{
                 document.querySelectorAll('.filter-btn[data-period]').forEach(b => b.classList.remove('active'));
                 btn.classList.add('active');
                 currentPeriod = btn.dataset.period;
-                renderChart();
+                rangeFrom.value = rangeTo.value = '';
+                document.querySelector('.date-range').classList.remove('active');
                 renderTable();
             }});
         }});
         
+        // 기간 직접 선택
+        const rangeFrom = document.getElementById('range-from');
+        const rangeTo = document.getElementById('range-to');
+        function applyCustomRange() {{
+            if (!rangeFrom.value || !rangeTo.value) return;
+            const a = Math.floor(Date.parse(rangeFrom.value) / DAY_MS);
+            const b = Math.floor(Date.parse(rangeTo.value) / DAY_MS);
+            customRange = {{ startDay: Math.min(a, b), endDay: Math.max(a, b) }};
+            currentPeriod = 'custom';
+            document.querySelectorAll('.filter-btn[data-period]').forEach(b => b.classList.remove('active'));
+            document.querySelector('.date-range').classList.add('active');
+            renderTable();
+        }}
+        rangeFrom.addEventListener('change', applyCustomRange);
+        rangeTo.addEventListener('change', applyCustomRange);
+        
         document.querySelectorAll('.filter-btn[data-type]').forEach(btn => {{
             btn.addEventListener('click', () => {{
                 document.querySelectorAll('.filter-btn[data-type]').forEach(b => b.classList.remove('active'));
@@ -538,22 +1299,65 @@ def generate_html():
             renderTable();
         }});
         
-        // 초기화
-        renderChart();
-        renderHotStocks();
-        renderBigPlayers();
-        renderSectors();
-        renderTable();
+        // 초기화 (셸에서는 카드/섹션도 데이터셋으로 채우고, 카드는 첫 질의 결과로 그림)
+        function boot(dataset) {{
+            DICTS = dataset.columns.dicts;
+            initFilterWorker(dataset);
+            if (dataset.lastUpdated) document.getElementById('last-updated').textContent = dataset.lastUpdated;
+            if (dataset.sections !== undefined) document.getElementById('data-sections').innerHTML = dataset.sections;
+            if (dataset.hotStocks) {{
+                renderHotStocks(dataset.hotStocks);
+                renderBigPlayers(dataset.bigPlayers);
+                renderSectors(dataset.sectors);
+            }}
+            renderTable();
+        }}
+        if (INLINE_DATA) {{
+            boot(INLINE_DATA);
+        }} else {{
+            fetch('dataset.json').then(r => r.json()).then(boot);
+        }}
+        
+        // 재방문은 서비스 워커가 셸 + IndexedDB 데이터로 응답 (변경된 날짜 파일만 받음)
+        if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {{
+            navigator.serviceWorker.register('sw.js').catch(() => {{}});
+        }}
     </script>
 </body>
 </html>'''
     
-    output_path = Path(__file__).parent.parent / "index.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    return html
+
+def render_shell():
+    """데이터 없는 대시보드 셸 (서비스 워커가 캐시해 두고 재방문 때 내려줌)"""
+    summary = {"net_amount": 0, "total_buy": 0, "total_sell": 0, "buy_stocks": 0, "sell_stocks": 0, "total_trades": 0}
+    return render_html({"lastUpdated": "", "summary": summary}, inline=False)
+
+def generate_html(data=None, output_path=OUTPUT_PATH):
+    # 데이터 로드
+    if data is None:
+        with metrics.stage("load"):
+            data = load_data()
+    metrics.count("trades_in", len(data.get("trades", [])))
+    
+    with metrics.stage("render"):
+        html = render_html(data)
+    with metrics.stage("write"):
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(html)
+    metrics.count("output_bytes", len(html.encode("utf-8")))
     
     print(f"✅ HTML 생성 완료: {output_path}")
+    return html
+
+def main():
+    metrics.start_run("generate")
+    try:
+        with metrics.profiled():
+            generate_html()
+    finally:
+        metrics.write_metrics()
 
 
 if __name__ == "__main__":
-    generate_html()
+    main()
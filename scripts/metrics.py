@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+파이프라인 계측 (단계별 소요 시간, 카운터, 선택적 프로파일링)
+
+각 스크립트는 start_run()으로 실행을 시작하고 stage()/count()로 기록한 뒤
+write_metrics()로 data/metrics.json의 자기 항목("fetch", "generate")을 갱신한다.
+start_run() 전에는 stage()/count()가 아무 일도 하지 않으므로 라이브러리처럼
+import해서 쓰는 경우(벤치마크 등)에는 비용이 없다.
+
+PIPELINE_PROFILE 환경변수로 프로파일러를 켠다:
+    PIPELINE_PROFILE=cprofile      누적 시간 상위 함수 출력
+    PIPELINE_PROFILE=tracemalloc   메모리 최대치 기록 + 상위 할당 위치 출력
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+METRICS_PATH = ROOT / "data" / "metrics.json"
+PROFILE_TOP = 20
+
+class Metrics:
+    """한 번의 스크립트 실행에 대한 계측 값"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = round(self.stages.get(name, 0) + elapsed, 3)
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def to_dict(self):
+        return {
+            "startedAt": self.started_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "duration_s": round(time.perf_counter() - self.start, 3),
+            "stages": self.stages,
+            "counters": self.counters,
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            **self.extra,
+        }
+
+_run = None
+
+def start_run(name):
+    """새 실행 시작 (이후 stage/count가 이 실행에 기록됨)"""
+    global _run
+    _run = Metrics(name)
+    return _run
+
+def stage(name):
+    return _run.stage(name) if _run else nullcontext()
+
+def count(key, n=1):
+    if _run:
+        _run.count(key, n)
+
+def counter(key):
+    """현재 실행의 카운터 값 (실행 전이면 0)"""
+    return _run.counters.get(key, 0) if _run else 0
+
+@contextmanager
+def profiled(mode=None):
+    """PIPELINE_PROFILE에 따라 cProfile/tracemalloc으로 감싼다"""
+    mode = mode or os.environ.get("PIPELINE_PROFILE", "")
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            print(out.getvalue())
+    elif mode == "tracemalloc":
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if _run:
+                _run.extra["tracemalloc_peak_mb"] = round(peak / 1024 / 1024, 1)
+            print(f"🧠 tracemalloc 최대 {peak / 1024 / 1024:.1f}MB")
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP]:
+                print(f"   {stat}")
+    else:
+        yield
+
+def write_metrics(path=METRICS_PATH):
+    """현재 실행 결과를 metrics.json의 자기 항목에 기록"""
+    if not _run:
+        return None
+    report = {}
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            report = {}
+    report[_run.name] = _run.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📈 계측 저장: {path} ({_run.name} {report[_run.name]['duration_s']}s)")
+    return report
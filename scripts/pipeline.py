@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+수집 → 집계 → HTML 생성 파이프라인 (단일 프로세스, 단계별 캐시)
+
+    python scripts/pipeline.py run          # 전체 실행
+    python scripts/pipeline.py render       # 단계 하나만 실행
+    python scripts/pipeline.py run --force  # 캐시 무시
+
+단계 사이 데이터는 메모리로 넘기고, 각 단계의 입력 지문(fingerprint)이
+data/pipeline_state.json에 기록된 값과 같고 출력 파일이 있으면 건너뛴다.
+- fetch:     companies.json + 기준일 + 조회 이력 + 수집 코드 (단독 실행 시 집계까지 이어서 저장)
+
+fetch는 scheduler가 일일 요청 예산 안에서 고른 종목만 조회하고, 나머지 종목은
+이전 insider.json의 거래를 유지한다 (DART_DAILY_BUDGET, DART_SHARDS 환경변수).
+조회한 종목의 추가/변경/삭제 거래는 data/delta.json과 주요 거래 피드(feed.json/xml)로 남긴다.
+집계는 종목 응답이 도착하는 대로 fetch 안에서 함께 진행하고(stream.py), 이어지는 aggregate는
+그 결과로 마무리만 한다 (aggregate 단독 실행은 저장된 거래로 처음부터 집계).
+- aggregate: 수집된 거래 목록 + 종가 행렬(data/prices.npz) 내용 해시 + 집계 코드
+- render:    insider.json(요약) 바이트 + 기간 파티션 내용 해시 + 생성 코드
+             (index.html과 함께 재방문용 셸/서비스 워커/일별 파일을 site/에 생성, site_data.py)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import metrics
+from delta import diff_trades, publish
+from event_study import prices_signature
+from fetch_data import (
+    COMPANIES_PATH, DATA_PATH, KST, PERIOD_DAYS, DataBuilder, build_data, load_companies, save_data,
+)
+from generate_html import OUTPUT_PATH, render_html
+from scheduler import (
+    CRAWL_STATE_PATH, DAILY_BUDGET, DEFAULT_SHARDS, load_crawl_state, save_crawl_state, scheduled_stream,
+)
+from site_data import SITE_DIR, write_site
+from store import load_data, window_signature
+from stream import bounded
+from trade import as_trades
+
+ROOT = Path(__file__).parent.parent
+SCRIPTS = Path(__file__).parent
+STATE_PATH = ROOT / "data" / "pipeline_state.json"
+STAGES = ("fetch", "aggregate", "render")
+
+# 단계별 결과에 영향을 주는 코드
+STAGE_SOURCES = {
+    "fetch": ("fetch_data.py", "scheduler.py", "delta.py", "stream.py"),
+    "aggregate": ("fetch_data.py", "aggregate.py", "store.py", "event_study.py", "clusters.py"),
+    "render": ("generate_html.py", "aggregate.py", "store.py", "clusters.py", "site_data.py"),
+}
+
+def fingerprint(*parts):
+    """bytes/str/JSON 값들의 sha256 지문 (앞 16자리)"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = json.dumps(part, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()[:16]
+
+def source_fingerprint(stage):
+    return fingerprint(*((SCRIPTS / name).read_bytes() for name in STAGE_SOURCES[stage]))
+
+def trades_fingerprint(trades):
+    """거래 순서와 무관한 지문 (수집 순서와 파티션 순서가 달라도 같은 값)"""
+    return fingerprint(sorted(as_trades(trades)))
+
+def load_state(path=STATE_PATH):
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state, path=STATE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+class Context:
+    """단계 사이에 넘기는 메모리 상태 (없으면 디스크에서 지연 로드)"""
+
+    def __init__(self, state, data_path=DATA_PATH, output_path=OUTPUT_PATH):
+        self.state = state
+        self.data_path = data_path
+        self.output_path = output_path
+        self._trades = None
+        self.trades_fp = None
+        self.builder = None
+        self.checked = ()
+        self.cutoff = ""
+        self._data = None
+        self._data_bytes = None
+
+    def data_bytes(self):
+        if self._data_bytes is None:
+            self._data_bytes = self.data_path.read_bytes()
+        return self._data_bytes
+
+    def data(self):
+        if self._data is None:
+            self._data = load_data(self.data_path)
+        return self._data
+
+    def trades(self):
+        if self._trades is None:
+            self._trades = self.data()["trades"]
+        return self._trades
+
+    def set_trades(self, trades, builder=None, checked=(), cutoff=""):
+        """수집 결과 (builder: 수집하면서 미리 집계해 둔 DataBuilder, checked: 오류 없이 조회한 종목)"""
+        self._trades = trades
+        self.trades_fp = trades_fingerprint(trades)
+        self.builder = builder
+        self.checked = checked
+        self.cutoff = cutoff
+
+    def set_data(self, data, raw):
+        self._data = data
+        self._data_bytes = raw
+
+def is_fresh(state, stage, input_fp, output_path):
+    return state.get(stage, {}).get("input") == input_fp and output_path.exists()
+
+def run_fetch(ctx, force=False, today=None):
+    api_key = os.environ.get("DART_API_KEY")
+    today = today or datetime.now(KST).date()
+    crawl_state_bytes = CRAWL_STATE_PATH.read_bytes() if CRAWL_STATE_PATH.exists() else b""
+    input_fp = fingerprint(
+        COMPANIES_PATH.read_bytes(), today.isoformat(), PERIOD_DAYS, crawl_state_bytes, source_fingerprint("fetch"),
+    )
+    if not force and is_fresh(ctx.state, "fetch", input_fp, ctx.data_path):
+        return False
+    if not api_key:
+        raise SystemExit("❌ DART_API_KEY 환경변수가 없습니다")
+
+    companies = load_companies()
+    metrics.count("companies", len(companies))
+    print(f"📡 {len(companies)}개 종목 지분공시 조회")
+    previous = ctx.trades() if ctx.data_path.exists() else []
+    crawl_state = load_crawl_state()
+    # 조회는 백그라운드에서, 집계는 종목 응답이 도착하는 대로 (aggregate 단계는 마무리만)
+    builder = DataBuilder()
+    stream = scheduled_stream(
+        api_key, companies, previous, crawl_state, today=today,
+        daily_budget=int(os.environ.get("DART_DAILY_BUDGET", DAILY_BUDGET)),
+        shards=int(os.environ.get("DART_SHARDS", DEFAULT_SHARDS)),
+    )
+    try:
+        for _, company_trades in bounded(stream):
+            builder.add(company_trades)
+    finally:
+        save_crawl_state(crawl_state)
+    order = {c["corp_code"]: i for i, c in enumerate(companies)}
+    trades = sorted(builder.trades, key=lambda t: order.get(t["corp_code"], len(order)))
+    metrics.count("trades_out", len(trades))
+    last_run = crawl_state["last_run"]
+    changes = diff_trades(previous, trades, last_run["checked"], last_run["cutoff"])
+    notable = publish(changes)
+    print(f"🔔 변경: 추가 {len(changes['added'])}건, 변경 {len(changes['changed'])}건, "
+          f"삭제 {len(changes['removed'])}건 (피드 {notable}건)")
+    ctx.set_trades(trades, builder, last_run["checked"], last_run["cutoff"])
+    ctx.state["fetch"] = {"input": input_fp, "output": ctx.trades_fp}
+    return True
+
+def run_aggregate(ctx, force=False):
+    trades_fp = ctx.trades_fp or trades_fingerprint(ctx.trades())
+    input_fp = fingerprint(trades_fp, prices_signature(), source_fingerprint("aggregate"))
+    if not force and is_fresh(ctx.state, "aggregate", input_fp, ctx.data_path):
+        return False
+
+    data = ctx.builder.build(ctx.trades()) if ctx.builder else build_data(ctx.trades())
+    raw = save_data(data, ctx.data_path, checked=ctx.checked, cutoff=ctx.cutoff)
+    ctx.set_data(data, raw)
+    ctx.state["aggregate"] = {"input": input_fp, "output": fingerprint(raw)}
+    print(f"✅ 데이터 저장 완료: {ctx.data_path} ({len(data['trades'])}건)")
+    return True
+
+def run_render(ctx, force=False):
+    window = json.loads(ctx.data_bytes()).get("window") or {}
+    partitions = window_signature(window["from"], window["to"]) if window else []
+    input_fp = fingerprint(fingerprint(ctx.data_bytes()), partitions, source_fingerprint("render"))
+    if not force and is_fresh(ctx.state, "render", input_fp, ctx.output_path) and (SITE_DIR / "manifest.json").exists():
+        return False
+
+    data = ctx.data()
+    metrics.count("trades_in", len(data.get("trades", [])))
+    html = render_html(data)
+    raw = html.encode("utf-8")
+    with open(ctx.output_path, "wb") as f:
+        f.write(raw)
+    metrics.count("output_bytes", len(raw))
+    manifest = write_site(data)
+    metrics.count("site_days", len(manifest["days"]))
+    ctx.state["render"] = {"input": input_fp, "output": fingerprint(raw)}
+    print(f"✅ HTML 생성 완료: {ctx.output_path} (재방문용 데이터 {len(manifest['days'])}일: {SITE_DIR})")
+    return True
+
+RUNNERS = {
+    "fetch": run_fetch,
+    "aggregate": run_aggregate,
+    "render": run_render,
+}
+
+def run_pipeline(stages=STAGES, force=False, state_path=STATE_PATH):
+    """지정한 단계를 순서대로 실행 (실행/건너뜀 여부 반환)"""
+    state = load_state(state_path)
+    ctx = Context(state)
+    stages = list(stages)
+    ran = {}
+    for stage in stages:
+        with metrics.stage(stage):
+            ran[stage] = RUNNERS[stage](ctx, force=force)
+        if ran[stage]:
+            save_state(state, state_path)
+        else:
+            metrics.count("skipped_stages")
+            print(f"⏭️ {stage}: 입력 변경 없음, 건너뜀")
+        # 수집 결과는 insider.json으로만 저장되므로 fetch 단독 실행도 집계까지 이어서 저장
+        if stage == "fetch" and ran[stage] and "aggregate" not in stages:
+            stages.insert(stages.index(stage) + 1, "aggregate")
+    return ran
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내부자 거래 파이프라인")
+    parser.add_argument("command", choices=("run",) + STAGES, help="run: 전체 실행, 그 외: 해당 단계만 실행")
+    parser.add_argument("--force", action="store_true", help="입력 지문과 관계없이 실행")
+    args = parser.parse_args(argv)
+
+    stages = STAGES if args.command == "run" else (args.command,)
+    metrics.start_run("pipeline" if args.command == "run" else f"pipeline-{args.command}")
+    try:
+        with metrics.profiled():
+            run_pipeline(stages, force=args.force)
+    finally:
+        metrics.write_metrics()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+거래 이력 조회
+
+    python scripts/query.py 'type=매도 position~대표이사 sector=반도체 date=2026Q1'
+    python scripts/query.py 'insider=국민연금공단' --format csv > nps.csv
+    python scripts/query.py 'amount>=100억 date>=30d' --sort amount --format json
+    python scripts/query.py            # 대화형 (색인을 한 번만 만들고 여러 번 조회)
+    python scripts/query.py --archive 'insider=국민연금공단 date>=2020'   # 다년치 열 아카이브에서 조회
+
+조건은 공백으로 구분하고 모두 만족해야 한다 (AND). 공백이 든 값은 따옴표로 감싼다.
+
+    필드=값[,값...]   값 중 하나와 일치      stock_code, corp_name, insider, position,
+    필드!=값[,값...]  모두와 불일치          sector, type, category (및 그 밖의 거래 필드)
+    필드~문자열       문자열 포함
+    date=기간         2026, 2026-01, 2026-01-15, 2026Q1, 90d(최근 90일), 3m(최근 3개월)
+    date>=기간 ...    >=, >, <=, < (기간의 시작/끝 기준)
+    amount>=100억     수치 필드(amount, price, shares_change, ...) 비교, 만/억/조 단위 허용
+
+일치/포함 조건은 TradeIndex의 해시 인덱스, 날짜와 금액 범위는 정렬된 인덱스의 bisect로
+후보를 좁히고 나머지 조건(불일치, 그 밖의 수치 필드)만 후보 행에 적용한다.
+한 번 실행할 때는 날짜 조건에 해당하는 파티션만 읽는다.
+--archive는 archive.py의 memmap 열을 청크 단위로 걸러 표시할 행만 거래로 만든다 (numpy 필요).
+"""
+
+import argparse
+import csv
+import json
+import re
+import shlex
+import sys
+import time
+import unicodedata
+from datetime import date, datetime, timedelta
+
+from aggregate import parse_date
+from fetch_data import KST
+from store import load_trades
+from trade import FIELDS, as_dict
+from trade_index import DEFAULT_FIELDS, TradeIndex
+
+ALIASES = {
+    "insider": "insider_name",
+    "type": "trade_type",
+    "code": "stock_code",
+    "corp": "corp_name",
+    "reason": "change_reason",
+    "date": "report_date",
+}
+NUMERIC = ("shares_before", "shares_after", "shares_change", "price", "amount")
+UNITS = {"": 1, "만": 10**4, "억": 10**8, "조": 10**12}
+TERM = re.compile(r"(\w+)(>=|<=|!=|=|~|>|<)(.*)", re.S)
+NUMBER = re.compile(r"(-?\d+(?:\.\d+)?)\s*(만|억|조)?")
+COLUMNS = (
+    "report_date", "corp_name", "stock_code", "insider_name", "position",
+    "trade_type", "category", "shares_change", "amount",
+)
+OPS = {
+    ">=": lambda a, b: a >= b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    "<": lambda a, b: a < b,
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+class QueryError(ValueError):
+    pass
+
+def parse_amount(text):
+    """'100억' -> 10000000000"""
+    m = NUMBER.fullmatch(text.replace(",", "").strip())
+    if not m:
+        raise QueryError(f"숫자가 아님: {text!r}")
+    return int(float(m.group(1)) * UNITS[m.group(2) or ""])
+
+def period_bounds(text, today=None):
+    """기간 -> (첫날, 마지막 날) (YYYY-MM-DD 문자열)"""
+    today = today or datetime.now(KST).date()
+    text = text.strip()
+    m = re.fullmatch(r"(\d+)([dm])", text, re.I)
+    if m:
+        n = int(m.group(1))
+        if m.group(2).lower() == "d":
+            first = today - timedelta(days=n)
+        else:
+            months = today.year * 12 + today.month - 1 - n
+            first = date(months // 12, months % 12 + 1, min(today.day, 28))
+        return first.isoformat(), today.isoformat()
+    m = re.fullmatch(r"(\d{4})[qQ]([1-4])", text)
+    if m:
+        year, quarter = int(m.group(1)), int(m.group(2))
+        first = date(year, quarter * 3 - 2, 1)
+        return first.isoformat(), (_month_end(year, quarter * 3)).isoformat()
+    if re.fullmatch(r"\d{4}", text):
+        return f"{text}-01-01", f"{text}-12-31"
+    if re.fullmatch(r"\d{4}-\d{2}", text):
+        year, month = int(text[:4]), int(text[5:])
+        return f"{text}-01", _month_end(year, month).isoformat()
+    try:
+        day = parse_date(text).isoformat()
+    except ValueError:
+        raise QueryError(f"알 수 없는 기간: {text!r}") from None
+    return day, day
+
+def _month_end(year, month):
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+def _shift(day, days):
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+class Query:
+    """파싱된 조회 조건"""
+
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self.equals = {}    # 필드 -> 값 집합 (인덱스 필드)
+        self.contains = {}  # 필드 -> [부분 문자열]
+        self.filters = []   # (필드, 연산, 값) - 후보 행에 적용
+
+    def narrow(self, start, end):
+        if start and (self.start is None or start > self.start):
+            self.start = start
+        if end and (self.end is None or end < self.end):
+            self.end = end
+
+def parse_query(text, today=None):
+    """조회식 -> Query"""
+    query = Query()
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise QueryError(f"조회식 오류: {e}") from None
+    for term in terms:
+        m = TERM.fullmatch(term)
+        if not m:
+            raise QueryError(f"'필드 연산자 값' 형식이 아님: {term!r}")
+        name, op, value = m.groups()
+        field = ALIASES.get(name, name)
+        if field not in FIELDS:
+            raise QueryError(f"알 수 없는 필드: {name!r}")
+
+        if field == "report_date":
+            if op in ("~", "!="):
+                raise QueryError(f"날짜에는 {op} 연산을 쓸 수 없습니다")
+            first, last = period_bounds(value, today)
+            if op == "=":
+                query.narrow(first, last)
+            elif op == ">=":
+                query.narrow(first, None)
+            elif op == ">":
+                query.narrow(_shift(last, 1), None)
+            elif op == "<=":
+                query.narrow(None, last)
+            else:
+                query.narrow(None, _shift(first, -1))
+        elif field in NUMERIC:
+            if op == "~":
+                raise QueryError(f"수치 필드에는 ~ 연산을 쓸 수 없습니다: {name}")
+            query.filters.append((field, op, parse_amount(value)))
+        elif op == "~":
+            query.contains.setdefault(field, []).append(value)
+        elif op in ("=", "!="):
+            values = frozenset(v.strip() for v in value.split(","))
+            if op == "=" and field in DEFAULT_FIELDS:
+                previous = query.equals.get(field)
+                query.equals[field] = values if previous is None else previous & values
+            else:
+                query.filters.append((field, "in" if op == "=" else "not in", values))
+        else:
+            query.filters.append((field, op, value))
+    return query
+
+def run_query(index, query):
+    """Query -> 조건에 맞는 행 번호 (날짜 순)"""
+    equals = {field: tuple(values) for field, values in query.equals.items()}
+    filters = list(query.filters)
+    for field, needles in query.contains.items():
+        if field in index.postings:
+            matched = set(index.values(field, needles[0]))
+            for needle in needles[1:]:
+                matched &= set(index.values(field, needle))
+            if field in equals:
+                matched &= set(equals[field])
+            equals[field] = tuple(matched)
+        else:
+            filters.extend((field, "~", needle) for needle in needles)
+    if any(not values for values in equals.values()):
+        return []
+
+    ranges = {}
+    for condition in [f for f in filters if f[0] in index.sorted_values and f[1] in OPS and f[1] != "!="]:
+        field, op, value = condition
+        low, high = ranges.get(field, (None, None))
+        if op in (">=", ">", "="):
+            value_low = value + 1 if op == ">" else value
+            low = value_low if low is None else max(low, value_low)
+        if op in ("<=", "<", "="):
+            value_high = value - 1 if op == "<" else value
+            high = value_high if high is None else min(high, value_high)
+        ranges[field] = (low, high)
+        filters.remove(condition)
+
+    rows = index.select(query.start, query.end, ranges, **equals)
+    if not filters:
+        return rows
+    trades = index.trades
+    checks = []
+    for field, op, value in filters:
+        position = FIELDS.index(field)
+        if op == "in":
+            checks.append(lambda t, p=position, v=value: t[p] in v)
+        elif op == "not in":
+            checks.append(lambda t, p=position, v=value: t[p] not in v)
+        elif op == "~":
+            checks.append(lambda t, p=position, v=value: v in t[p])
+        else:
+            checks.append(lambda t, p=position, v=value, f=OPS[op]: f(t[p], v))
+    return [i for i in rows if all(check(trades[i]) for check in checks)]
+
+def run_archive_query(archive, query):
+    """Query -> 아카이브 행 번호 (날짜 순 numpy 배열)"""
+    conditions = [(field, "in", values) for field, values in query.equals.items()]
+    conditions += [(field, "~", needle) for field, needles in query.contains.items() for needle in needles]
+    conditions += query.filters
+    try:
+        return archive.select(query.start, query.end, conditions)
+    except ValueError as e:
+        raise QueryError(str(e)) from None
+
+def sort_rows(index, rows, sort="date"):
+    """행 번호 -> 표시 순서의 거래 목록 (최신순 또는 금액 큰 순)"""
+    if sort == "amount":
+        trades = index.trades
+        return [trades[i] for i in sorted(rows, key=lambda i: trades[i].amount, reverse=True)]
+    return index.page(rows, 0, len(rows))
+
+def _width(text):
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+def _cell(value):
+    return f"{value:,}" if isinstance(value, int) else str(value).replace("\n", " ")
+
+def write_table(trades, columns, out):
+    rows = [[_cell(t[c]) for c in columns] for t in trades]
+    widths = [max([_width(c)] + [_width(r[k]) for r in rows]) for k, c in enumerate(columns)]
+    numeric = [c in NUMERIC for c in columns]
+
+    def line(cells):
+        parts = []
+        for cell, width, right in zip(cells, widths, numeric):
+            pad = " " * (width - _width(cell))
+            parts.append(pad + cell if right else cell + pad)
+        return "  ".join(parts).rstrip()
+
+    out.write(line(columns) + "\n")
+    out.write("  ".join("-" * w for w in widths) + "\n")
+    for row in rows:
+        out.write(line(row) + "\n")
+
+def write_results(trades, fmt, columns, out=sys.stdout):
+    if fmt == "json":
+        json.dump([as_dict(t) for t in trades], out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        writer.writerows([t[c] for c in columns] for t in trades)
+    else:
+        write_table(trades, columns, out)
+
+def answer(index, query, args, out=sys.stdout):
+    """파싱된 조회식(Query) 하나 실행 (index: TradeIndex 또는 archive.Archive)"""
+    if isinstance(index, TradeIndex):
+        rows = run_query(index, query)
+        trades = sort_rows(index, rows, args.sort)
+        shown = trades[:args.limit] if args.limit else trades
+        total = sum(t.amount for t in trades)
+    else:
+        rows = run_archive_query(index, query)
+        shown = index.page(rows, args.limit or None, args.sort)
+        total = index.total(rows)
+    write_results(shown, args.format, args.columns, out)
+    if args.format == "table":
+        print(f"📊 {len(rows):,}건 (표시 {len(shown):,}건), 금액 합계 {total:,}원", file=sys.stderr)
+
+def interactive(index, args):
+    print(f"📚 거래 {len(index):,}건 색인 완료. 조회식을 입력하세요 (종료: Ctrl-D)", file=sys.stderr)
+    while True:
+        try:
+            text = input("query> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print(file=sys.stderr)
+            return
+        if text in ("quit", "exit"):
+            return
+        if not text:
+            continue
+        started = time.perf_counter()
+        try:
+            answer(index, parse_query(text), args)
+        except QueryError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            continue
+        print(f"⏱️ {(time.perf_counter() - started) * 1000:.1f}ms", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="거래 이력 조회")
+    parser.add_argument("query", nargs="?", help="조회식 (생략하면 대화형)")
+    parser.add_argument("--format", choices=("table", "csv", "json"), default="table")
+    parser.add_argument("--sort", choices=("date", "amount"), default="date", help="최신순 또는 금액순")
+    parser.add_argument("--limit", type=int, default=50, help="표시 건수 (0 = 전부)")
+    parser.add_argument("--columns", default=",".join(COLUMNS), help="표/CSV 열 (쉼표 구분)")
+    parser.add_argument("--archive", action="store_true", help="파티션 대신 열 아카이브(data/archive)에서 조회")
+    args = parser.parse_args(argv)
+
+    args.columns = [ALIASES.get(c, c) for c in args.columns.split(",")]
+    unknown = [c for c in args.columns if c not in FIELDS]
+    if unknown:
+        parser.error(f"알 수 없는 열: {', '.join(unknown)}")
+
+    if args.archive:
+        from archive import Archive
+        source = Archive()
+    if args.query is None:
+        interactive(source if args.archive else TradeIndex(load_trades()), args)
+        return 0
+    try:
+        query = parse_query(args.query)
+        if not args.archive:
+            source = TradeIndex(load_trades(query.start, query.end))
+        answer(source, query, args)
+    except QueryError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
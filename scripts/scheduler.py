@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+DART 일일 요청 한도 안에서 종목 조회 순서를 정하는 스케줄러
+
+전 종목(코스피+코스닥 약 2,500개)을 매 실행마다 모두 조회하지 않고, 남은 일일 예산만큼
+"조회했을 때 새 공시가 나올 기대값"이 큰 종목부터 조회한다.
+
+    기대 신규 공시 ≈ 공시 빈도 × 시가총액 가중치 × 마지막 조회 후 경과일
+
+한 번도 조회하지 않은 종목이 가장 먼저, 그다음은 공시가 잦고 오래 조회하지 않은 종목 순이다.
+조회하지 않은 종목은 이전 insider.json의 거래를 그대로 유지하므로 여러 번의 실행에 걸쳐
+전체가 순환 갱신된다. 조회 이력과 당일 사용량, 마지막 실행에서 조회한 종목 목록은
+data/crawl_state.json에 남는다.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+
+import requests
+
+import metrics
+from backfill import DEFAULT_RATE, LimitedSession, RateLimiter
+from fetch_data import (
+    KST, PERIOD_DAYS, REPORTS, QuotaExceeded, fetch_reports, load_companies, parse_report,
+)
+
+ROOT = Path(__file__).parent.parent
+CRAWL_STATE_PATH = ROOT / "data" / "crawl_state.json"
+DAILY_BUDGET = 10_000  # 키당 일일 한도 20,000건 중 백필 몫을 남긴 값
+CALLS_PER_COMPANY = len(REPORTS)
+PRIOR_FILINGS = 0.5  # 공시 이력이 없는 종목의 기본 빈도 (90일당 건수)
+DEFAULT_SHARDS = 4
+
+def load_crawl_state(path=CRAWL_STATE_PATH):
+    if not path.exists():
+        return {"budget": {}, "companies": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_crawl_state(state, path=CRAWL_STATE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+def remaining_budget(state, today, daily_budget=DAILY_BUDGET):
+    """오늘 남은 요청 수 (날짜가 바뀌면 초기화)"""
+    budget = state.get("budget", {})
+    used = budget.get("used", 0) if budget.get("date") == today.isoformat() else 0
+    return max(0, daily_budget - used)
+
+def record_usage(state, today, calls):
+    budget = state.setdefault("budget", {})
+    if budget.get("date") != today.isoformat():
+        budget.update(date=today.isoformat(), used=0)
+    budget["used"] += calls
+
+def cap_weight(company):
+    """시가총액 가중치 (1조 원 단위 로그, 시총 정보 없으면 1)"""
+    return 1 + math.log10(1 + company.get("market_cap", 0) / 1e12)
+
+def priority(company, entry, today):
+    """조회 우선순위 = 기대 신규 공시 수 (미조회 종목은 무한대)"""
+    if not entry:
+        return math.inf
+    staleness = (today - date.fromisoformat(entry["last_checked"])).days
+    if staleness <= 0:
+        return 0.0
+    rate = (entry.get("recent_filings", 0) + PRIOR_FILINGS) / PERIOD_DAYS
+    return rate * cap_weight(company) * staleness
+
+def plan(companies, state, today, budget):
+    """예산 안에서 조회할 종목 목록 (우선순위 순)"""
+    entries = state.get("companies", {})
+    scored = [
+        (priority(c, entries.get(c["corp_code"]), today), cap_weight(c), c["corp_code"], c)
+        for c in companies
+    ]
+    scored = [s for s in scored if s[0] > 0]
+    scored.sort(key=lambda s: (-s[0], -s[1], s[2]))
+    return [c for *_, c in scored[:budget // CALLS_PER_COMPANY]]
+
+def crawl_company(session, api_key, company, cutoff):
+    """종목 하나의 최근 거래 (daily 작업과 같은 형식/순서)"""
+    trades = []
+    for report in REPORTS:
+        trades.extend(parse_report(report, row, company) for row in fetch_reports(session, api_key, report, company["corp_code"]))
+    trades = [t for t in trades if t["report_date"] >= cutoff]
+    trades.sort(key=lambda t: (t["report_date"], t["rcept_no"]))
+    return trades
+
+_worker = {}
+
+def _init_worker(rate):
+    """워커 프로세스마다 요청 속도 제한 세션 하나"""
+    _worker["session"] = LimitedSession(RateLimiter(rate))
+
+def _crawl_one(session, api_key, company, cutoff):
+    """종목 하나 조회 (실패하면 None, 한도 초과는 그대로 발생)"""
+    try:
+        return crawl_company(session, api_key, company, cutoff)
+    except QuotaExceeded:
+        raise
+    except (requests.RequestException, RuntimeError, ValueError) as e:
+        metrics.count("fetch_errors")
+        print(f"⚠️ {company['corp_name']} 조회 실패: {e}")
+        return None
+
+def _crawl_task(api_key, company, cutoff):
+    """워커 프로세스 작업: (거래 목록 또는 None, 이번 작업의 카운터)"""
+    run = metrics.start_run("shard")
+    return _crawl_one(_worker["session"], api_key, company, cutoff), run.counters
+
+def crawl_stream(api_key, targets, cutoff, shards=DEFAULT_SHARDS, rate=DEFAULT_RATE, session=None,
+                 max_pending=None):
+    """대상 종목을 조회하는 대로 (corp_code, 거래 목록)을 내는 제너레이터 (대상 순서 유지)
+
+    shards개 프로세스에 종목 단위로 작업을 넣되 결과를 아직 받아 가지 않은 작업을
+    max_pending개(기본 샤드 수 × 2)까지만 두므로, 소비 쪽이 느리면 조회도 그만큼 기다린다.
+    요청 속도는 샤드끼리 나눠 가지며, 한도 초과 시 거기까지만 낸다. 조회 실패 종목은 건너뛴다.
+    """
+    if shards <= 1 or session is not None or len(targets) < shards:
+        session = session or LimitedSession(RateLimiter(rate))
+        for company in targets:
+            try:
+                trades = _crawl_one(session, api_key, company, cutoff)
+            except QuotaExceeded as e:
+                print(f"⏸️ {e}")
+                return
+            if trades is not None:
+                yield company["corp_code"], trades
+        return
+
+    max_pending = max_pending or shards * 2
+    pool = ProcessPoolExecutor(max_workers=shards, initializer=_init_worker, initargs=(rate / shards,))
+    try:
+        remaining = iter(targets)
+        pending = deque(
+            (company, pool.submit(_crawl_task, api_key, company, cutoff))
+            for company in islice(remaining, max_pending)
+        )
+        while pending:
+            company, future = pending.popleft()
+            try:
+                trades, counters = future.result()
+            except QuotaExceeded as e:
+                print(f"⏸️ {e}")
+                return
+            for key, n in counters.items():
+                metrics.count(key, n)
+            for following in islice(remaining, 1):
+                pending.append((following, pool.submit(_crawl_task, api_key, following, cutoff)))
+            if trades is not None:
+                yield company["corp_code"], trades
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def crawl(api_key, targets, cutoff, shards=DEFAULT_SHARDS, rate=DEFAULT_RATE, session=None):
+    """대상 종목 조회 결과 {corp_code: 거래 목록}"""
+    return dict(crawl_stream(api_key, targets, cutoff, shards, rate, session))
+
+def scheduled_stream(api_key, companies, previous_trades, state, today=None, daily_budget=DAILY_BUDGET,
+                     run_budget=None, shards=DEFAULT_SHARDS, rate=DEFAULT_RATE, session=None):
+    """예산만큼 우선순위 종목을 조회하며 종목별 (corp_code, 최근 거래 목록)을 내는 제너레이터
+
+    조회하지 않는 종목의 이전 거래를 먼저(네트워크를 기다리지 않고) 내고, 조회 종목은
+    응답이 오는 대로 낸다. 조회에 실패한 종목은 마지막에 이전 거래를 낸다.
+    조회 이력과 요청 사용량은 소비가 끝나거나 중단될 때 state에 기록한다.
+    """
+    today = today or datetime.now(KST).date()
+    cutoff = (today - timedelta(days=PERIOD_DAYS)).isoformat()
+    budget = remaining_budget(state, today, daily_budget)
+    if run_budget is not None:
+        budget = min(budget, run_budget)
+
+    targets = plan(companies, state, today, budget)
+    print(f"🗓️ 예산 {budget}건: {len(targets)}/{len(companies)}개 종목 조회")
+    previous = {}
+    for t in previous_trades:
+        if t["report_date"] >= cutoff:
+            previous.setdefault(t["corp_code"], []).append(t)
+    target_codes = {c["corp_code"] for c in targets}
+    for company in companies:
+        code = company["corp_code"]
+        if code not in target_codes and code in previous:
+            yield code, previous[code]
+
+    entries = state.setdefault("companies", {})
+    checked = []
+    calls_before = metrics.counter("api_calls")
+    try:
+        for code, trades in crawl_stream(api_key, targets, cutoff, shards, rate, session):
+            entries[code] = {
+                "last_checked": today.isoformat(),
+                "recent_filings": len(trades),
+                "last_filing": trades[-1]["report_date"] if trades else entries.get(code, {}).get("last_filing"),
+            }
+            checked.append(code)
+            yield code, trades
+    finally:
+        calls = metrics.counter("api_calls") - calls_before
+        record_usage(state, today, calls or len(checked) * CALLS_PER_COMPANY)
+        metrics.count("companies_checked", len(checked))
+        state["last_run"] = {"date": today.isoformat(), "cutoff": cutoff, "checked": sorted(checked)}
+
+    done = set(checked)
+    for company in targets:
+        code = company["corp_code"]
+        if code not in done and code in previous:
+            yield code, previous[code]
+
+def scheduled_fetch(api_key, companies, previous_trades, state, **kwargs):
+    """예산만큼 우선순위 종목을 조회하고 나머지는 이전 거래를 유지한 최근 거래 목록 (종목 순서)"""
+    results = dict(scheduled_stream(api_key, companies, previous_trades, state, **kwargs))
+    return [t for company in companies for t in results.get(company["corp_code"], [])]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오늘 조회할 종목 계획 출력")
+    parser.add_argument("--budget", type=int, help="이번 실행 요청 예산 (기본: 오늘 남은 일일 예산)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 종목 수")
+    args = parser.parse_args(argv)
+
+    today = datetime.now(KST).date()
+    state = load_crawl_state()
+    budget = remaining_budget(state, today, int(os.environ.get("DART_DAILY_BUDGET", DAILY_BUDGET)))
+    if args.budget is not None:
+        budget = min(budget, args.budget)
+    companies = load_companies()
+    targets = plan(companies, state, today, budget)
+    entries = state.get("companies", {})
+    print(f"🗓️ 예산 {budget}건: {len(targets)}/{len(companies)}개 종목")
+    for c in targets[:args.top]:
+        entry = entries.get(c["corp_code"])
+        last = entry["last_checked"] if entry else "미조회"
+        print(f"   {c['corp_name']:<12} 우선순위 {priority(c, entry, today):.3f}  마지막 조회 {last}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+대시보드 로컬 서버 (사전 압축, ETag, 읽기 전용 조회 API)
+
+    python scripts/serve.py --port 8000
+
+- 정적 파일(index.html, site/의 셸·서비스 워커·매니페스트·일별 파일)은 시작할 때 gzip/brotli(설치된 경우) 변형을 미리 만들어 두고
+  Accept-Encoding에 맞는 것을 보낸다. 변형마다 강한 ETag를 두고 If-None-Match면 304.
+  이름에 내용 해시가 든 일별/섹션 파일은 오래 캐시하고, 나머지는 매번 재검증한다.
+- GET /api/trades?stock_code=005930&insider=...&from=2026-01-01&to=2026-01-31&limit=50&offset=0
+  전체 파티션 거래를 TradeIndex로 색인해 최신순 페이지를 JSON으로 돌려준다.
+  같은 쿼리 응답은 LRU로 캐시한다.
+
+표준 라이브러리 http.server는 요청마다 스레드/파서 비용이 커서, asyncio Protocol 위에
+keep-alive/파이프라이닝을 지원하는 최소 HTTP/1.1 처리기를 둔다 (GET/HEAD만).
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+import time
+from email.utils import formatdate
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from site_data import SITE_DIR
+from store import load_trades
+from trade import as_dict
+from trade_index import TradeIndex
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).parent.parent
+SITE_FILES = {"/": "index.html", "/index.html": "index.html"}
+SITE_DATA_FILES = ("app.html", "sw.js", "manifest.json")  # site/ 안에서 매번 재검증할 파일
+SITE_HASHED = ("days/*.json", "sections.*.html")  # 이름에 내용 해시가 든 파일
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+HTML_CACHE = "no-cache"  # 매번 ETag로 재검증 (304는 본문 없음)
+HASHED_CACHE = "public, max-age=31536000, immutable"
+API_CACHE = "public, max-age=60"
+MAX_LIMIT = 500
+MIN_COMPRESS = 1024  # 이보다 작은 API 응답은 압축하지 않음
+MAX_HEADER = 16 * 1024
+
+STATUS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 431: "Request Header Fields Too Large",
+}
+
+def _etag(body):
+    return f'"{hashlib.sha256(body).hexdigest()[:20]}"'
+
+class Asset:
+    """응답 본문과 인코딩별 사전 압축 변형"""
+
+    def __init__(self, body, content_type, cache_control, compress=True, level=9):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.variants = {"identity": (body, _etag(body))}
+        if compress and len(body) >= MIN_COMPRESS:
+            gz = gzip.compress(body, level, mtime=0)
+            self.variants["gzip"] = (gz, _etag(gz))
+            if brotli is not None:
+                br = brotli.compress(body, quality=11 if level >= 9 else 5)
+                self.variants["br"] = (br, _etag(br))
+
+    def choose(self, accept_encoding):
+        """Accept-Encoding -> (인코딩, 본문, ETag) (q=0은 제외, br > gzip > identity)"""
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and (encoding in accepted or "*" in accepted):
+                return (encoding,) + self.variants[encoding]
+        return ("identity",) + self.variants["identity"]
+
+def _asset(path, cache_control):
+    content_type = CONTENT_TYPES.get(path.suffix, "application/octet-stream")
+    return Asset(path.read_bytes(), content_type, cache_control)
+
+def load_site(site_dir, data_dir=SITE_DIR):
+    """SITE_FILES + data_dir(site/) 파일 -> {경로: Asset}
+
+    data_dir는 루트에 그대로 올린다 (sw.js의 범위가 /가 되도록).
+    """
+    assets = {}
+    for route, name in SITE_FILES.items():
+        path = site_dir / name
+        if path.exists():
+            assets[route] = _asset(path, HTML_CACHE)
+    for name in SITE_DATA_FILES:
+        path = data_dir / name
+        if path.exists():
+            assets["/" + name] = _asset(path, HTML_CACHE)
+    for pattern in SITE_HASHED:
+        for path in sorted(data_dir.glob(pattern)):
+            assets["/" + path.relative_to(data_dir).as_posix()] = _asset(path, HASHED_CACHE)
+    return assets
+
+class QueryError(ValueError):
+    pass
+
+def _int_param(params, name, default, lo, hi):
+    value = params.get(name, [str(default)])[-1]
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name}는 정수여야 합니다: {value!r}") from None
+    if not lo <= number <= hi:
+        raise QueryError(f"{name}는 {lo}~{hi} 범위여야 합니다")
+    return number
+
+def query_trades(index, query_string):
+    """조회 API 본문 (dict)"""
+    params = parse_qs(query_string, keep_blank_values=False)
+    equals = {}
+    if "stock_code" in params:
+        equals["stock_code"] = tuple(params["stock_code"])
+    if "insider" in params:
+        equals["insider_name"] = tuple(params["insider"])
+    start = params.get("from", [None])[-1]
+    end = params.get("to", [None])[-1]
+    for value in (start, end):
+        if value and (len(value) != 10 or value[4] != "-" or value[7] != "-"):
+            raise QueryError(f"날짜는 YYYY-MM-DD 형식이어야 합니다: {value!r}")
+    limit = _int_param(params, "limit", 50, 1, MAX_LIMIT)
+    offset = _int_param(params, "offset", 0, 0, 10**9)
+
+    rows = index.select(start, end, **equals)
+    return {
+        "total": len(rows),
+        "offset": offset,
+        "limit": limit,
+        "trades": [as_dict(t) for t in index.page(rows, offset, limit)],
+    }
+
+class App:
+    """라우팅 + 응답 캐시"""
+
+    def __init__(self, assets, index, cache_size=4096):
+        self.assets = assets
+        self.index = index
+        self.api = lru_cache(maxsize=cache_size)(self._api_asset)
+
+    def _api_asset(self, query_string):
+        try:
+            payload, status = query_trades(self.index, query_string), 200
+        except QueryError as e:
+            payload, status = {"error": str(e)}, 400
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return status, Asset(body, CONTENT_TYPES[".json"], API_CACHE, level=5)
+
+    def route(self, target):
+        """요청 대상 -> (상태, Asset 또는 None)"""
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        if path in self.assets:
+            return 200, self.assets[path]
+        if path == "/api/trades":
+            return self.api(parts.query)
+        return 404, None
+
+_date_cache = [0, b""]
+
+def _http_date():
+    now = int(time.time())
+    if _date_cache[0] != now:
+        _date_cache[0] = now
+        _date_cache[1] = formatdate(now, usegmt=True).encode("ascii")
+    return _date_cache[1]
+
+class HttpProtocol(asyncio.Protocol):
+    """최소 HTTP/1.1 (GET/HEAD, keep-alive, 파이프라이닝)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while True:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self.buffer) > MAX_HEADER:
+                    self.respond(431, None, {}, keep_alive=False)
+                break
+            head, self.buffer = self.buffer[:end], self.buffer[end + 4:]
+            if not self.handle(head):
+                break
+
+    def handle(self, head):
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            self.respond(400, None, {}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        if method not in ("GET", "HEAD"):
+            self.respond(405, None, headers, keep_alive=False, extra=b"Allow: GET, HEAD\r\n")
+            return False
+        if "content-length" in headers or "transfer-encoding" in headers:
+            self.respond(400, None, headers, keep_alive=False)
+            return False
+        status, asset = self.app.route(target)
+        self.respond(status, asset, headers, keep_alive, head_only=method == "HEAD")
+        return keep_alive
+
+    def respond(self, status, asset, headers, keep_alive, head_only=False, extra=b""):
+        out = [extra]
+        if asset is None:
+            body = json.dumps({"error": STATUS[status]}).encode()
+            out.append(b"Content-Type: application/json\r\n")
+        else:
+            encoding, body, etag = asset.choose(headers.get("accept-encoding", ""))
+            out.append(
+                b"Content-Type: %s\r\nCache-Control: %s\r\nETag: %s\r\nVary: Accept-Encoding\r\n"
+                % (asset.content_type.encode(), asset.cache_control.encode(), etag.encode())
+            )
+            if encoding != "identity":
+                out.append(b"Content-Encoding: %s\r\n" % encoding.encode())
+            inm = headers.get("if-none-match")
+            if status == 200 and inm and (inm == "*" or etag in (tag.strip() for tag in inm.split(","))):
+                status, body = 304, b""
+        if status != 304:
+            out.append(b"Content-Length: %d\r\n" % len(body))
+        out.insert(0, b"HTTP/1.1 %d %s\r\nDate: %s\r\n" % (status, STATUS[status].encode(), _http_date()))
+        out.append(b"Connection: keep-alive\r\n\r\n" if keep_alive else b"Connection: close\r\n\r\n")
+        if not head_only:
+            out.append(body)
+        self.transport.write(b"".join(out))
+        if not keep_alive:
+            self.transport.close()
+
+def build_app(site_dir=ROOT, trades=None, data_dir=SITE_DIR):
+    assets = load_site(site_dir, data_dir)
+    if "/" not in assets:
+        print(f"⚠️ {site_dir}에 index.html이 없습니다 (python scripts/pipeline.py render)")
+    if "/sw.js" not in assets:
+        print(f"⚠️ {data_dir}에 sw.js가 없습니다 (python scripts/pipeline.py render)")
+    trades = load_trades() if trades is None else trades
+    index = TradeIndex(trades)
+    variants = ", ".join(sorted(assets["/"].variants)) if "/" in assets else "-"
+    print(f"📚 거래 {len(index):,}건 색인, index.html 변형: {variants}")
+    return App(assets, index)
+
+async def serve(app, host, port):
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: HttpProtocol(app), host, port, reuse_address=True)
+    print(f"🌐 http://{host}:{port}/  (조회 API: /api/trades)")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 로컬 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--site", type=Path, default=ROOT, help="index.html이 있는 디렉터리")
+    parser.add_argument("--data", type=Path, default=SITE_DIR, help="셸, sw.js, 일별 파일이 있는 디렉터리")
+    args = parser.parse_args(argv)
+
+    app = build_app(args.site, data_dir=args.data)
+    try:
+        asyncio.run(serve(app, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
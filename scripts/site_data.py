@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+재방문용 사이트 데이터: 버전 매니페스트 + 일별 파일 + 서비스 워커
+
+    python scripts/site_data.py     # insider.json -> site/
+
+site/ 구성 (Pages에 index.html과 함께 배포):
+    app.html                       데이터를 넣지 않은 대시보드 셸
+    sw.js                          서비스 워커
+    manifest.json                  버전, 마지막 업데이트, 날짜별 파일 해시
+    days/YYYY-MM-DD.<해시>.json    그날 거래 (DAY_FIELDS 순서의 행 목록)
+    sections.<해시>.html           동반 매수/이벤트 스터디 섹션
+
+첫 방문은 데이터가 모두 들어 있는 index.html을 받고 서비스 워커를 등록한다. 서비스 워커는
+일별 파일을 IndexedDB에 모아 두고, 재방문 때는 캐시한 셸을 바로 내준 뒤 manifest.json만
+다시 받아 해시가 바뀐 날짜 파일만 받아 합친다. 파일 이름에 내용 해시가 들어 있으므로 지난
+날짜 파일은 다시 받지 않는다. 네트워크가 없으면 마지막으로 합친 데이터로 열린다.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from generate_html import render_sections, render_shell
+from store import load_data
+
+ROOT = Path(__file__).parent.parent
+SITE_DIR = ROOT / "site"
+HASH_LEN = 12
+DAY_FIELDS = (
+    "stock_code", "corp_name", "sector", "insider_name", "position",
+    "trade_type", "category", "shares_change", "amount",
+)
+
+# 서비스 워커 (일반 문자열: __SHELL_VERSION__만 치환)
+SERVICE_WORKER_JS = r'''
+const SHELL_VERSION = '__SHELL_VERSION__';
+const CACHE = 'insider-' + SHELL_VERSION;
+const SCOPE = new URL(self.registration.scope);
+const SHELL_URL = new URL('app.html', SCOPE).href;
+const CDN_HOSTS = new Set(['cdn.jsdelivr.net', 'fonts.googleapis.com', 'fonts.gstatic.com']);
+const DAY_MS = 24 * 60 * 60 * 1000;
+const RESOLUTIONS = ['daily', 'weekly', 'monthly'];
+
+// IndexedDB: days(date -> {date, hash, rows}), meta(manifest, sections)
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open('insider-trading', 1);
+        req.onupgradeneeded = () => {
+            req.result.createObjectStore('days', { keyPath: 'date' });
+            req.result.createObjectStore('meta');
+        };
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+function result(req) {
+    return new Promise((resolve, reject) => {
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+function committed(tx) {
+    return new Promise((resolve, reject) => {
+        tx.oncomplete = () => resolve();
+        tx.onerror = tx.onabort = () => reject(tx.error);
+    });
+}
+
+async function loadStored(db) {
+    const tx = db.transaction(['days', 'meta'], 'readonly');
+    const [manifest, sections, days] = await Promise.all([
+        result(tx.objectStore('meta').get('manifest')),
+        result(tx.objectStore('meta').get('sections')),
+        result(tx.objectStore('days').getAll()),
+    ]);
+    return { manifest, sections, days };
+}
+
+async function fetchOk(path, init) {
+    const resp = await fetch(new URL(path, SCOPE), init);
+    if (!resp.ok) throw new Error(path + ': ' + resp.status);
+    return resp;
+}
+
+// manifest.json을 다시 받아 해시가 바뀐 날짜 파일만 받고 IndexedDB에 합침
+// (받는 중 실패하거나 오프라인이면 저장된 이전 버전을 그대로 사용)
+async function sync() {
+    const db = await openDb();
+    const stored = await loadStored(db);
+    let manifest, fetched, sections;
+    try {
+        manifest = await (await fetchOk('manifest.json', { cache: 'no-cache' })).json();
+        if (stored.manifest && stored.manifest.version === manifest.version) return stored;
+        const have = new Map(stored.days.map(d => [d.date, d.hash]));
+        const missing = Object.entries(manifest.days).filter(([date, hash]) => have.get(date) !== hash);
+        fetched = await Promise.all(missing.map(async ([date, hash]) => {
+            const day = await (await fetchOk('days/' + date + '.' + hash + '.json')).json();
+            return { date, hash, rows: day.rows };
+        }));
+        sections = stored.sections && stored.sections.hash === manifest.sections ? stored.sections : {
+            hash: manifest.sections,
+            html: await (await fetchOk('sections.' + manifest.sections + '.html')).text(),
+        };
+    } catch (e) {
+        if (!stored.manifest) throw e;
+        return stored;
+    }
+
+    const tx = db.transaction(['days', 'meta'], 'readwrite');
+    const days = tx.objectStore('days');
+    for (const day of fetched) days.put(day);
+    for (const day of stored.days) if (!(day.date in manifest.days)) days.delete(day.date);
+    tx.objectStore('meta').put(manifest, 'manifest');
+    tx.objectStore('meta').put(sections, 'sections');
+    await committed(tx);
+
+    const merged = new Map(stored.days.map(d => [d.date, d]));
+    for (const day of fetched) merged.set(day.date, day);
+    return { manifest, sections, days: Object.keys(manifest.days).sort().map(date => merged.get(date)) };
+}
+
+let syncing = null;
+function syncOnce() {
+    if (!syncing) syncing = sync().finally(() => { syncing = null; });
+    return syncing;
+}
+
+function bucketStart(day, resolution) {
+    const d = new Date(day * DAY_MS);
+    if (resolution === 'weekly') return day - (d.getUTCDay() + 6) % 7;
+    if (resolution === 'monthly') return Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), 1) / DAY_MS;
+    return day;
+}
+
+// 일별 행 -> 페이지 데이터셋 (generate_html.build_trade_columns,
+// aggregate.build_period_sums / build_chart_series와 같은 형식)
+function buildDataset(stored) {
+    const f = {};
+    stored.manifest.fields.forEach((name, i) => { f[name] = i; });
+    const dicts = { corp: [], insider: [], position: [], type: [], category: [] };
+    const lookup = {};
+    for (const field in dicts) lookup[field] = new Map();
+    const encode = (field, value) => {
+        let id = lookup[field].get(value);
+        if (id === undefined) {
+            id = dicts[field].length;
+            dicts[field].push(value);
+            lookup[field].set(value, id);
+        }
+        return id;
+    };
+    const columns = { day: [], corp: [], insider: [], position: [], type: [], category: [], shares: [], amount: [] };
+
+    const days = stored.days.filter(d => d.rows.length);
+    const n = days.length;
+    const dates = [];
+    const stocks = new Map();
+    const sectors = new Map();
+    const bucket = (groups, key, info) => {
+        let g = groups.get(key);
+        if (!g) {
+            g = Object.assign(info, { buy: new Array(n + 1).fill(0), sell: new Array(n + 1).fill(0), count: new Array(n + 1).fill(0) });
+            groups.set(key, g);
+        }
+        return g;
+    };
+    const flows = {};
+    for (const resolution of RESOLUTIONS) flows[resolution] = new Map();
+
+    days.forEach((d, i) => {
+        const day = Math.round(Date.parse(d.date) / DAY_MS);
+        dates.push(day);
+        for (const r of d.rows) {
+            const type = r[f.trade_type];
+            const amount = r[f.amount];
+            const sector = r[f.sector];
+            columns.day.push(day);
+            columns.corp.push(encode('corp', r[f.corp_name]));
+            columns.insider.push(encode('insider', r[f.insider_name]));
+            columns.position.push(encode('position', r[f.position] || '-'));
+            columns.type.push(encode('type', type));
+            columns.category.push(encode('category', r[f.category]));
+            columns.shares.push(r[f.shares_change]);
+            columns.amount.push(amount);
+
+            const targets = [
+                bucket(stocks, r[f.stock_code], { stock_code: r[f.stock_code], name: r[f.corp_name], sector: sector }),
+                bucket(sectors, sector, { sector: sector }),
+            ];
+            for (const g of targets) {
+                g.count[i + 1] += 1;
+                if (type === '매수') g.buy[i + 1] += amount;
+                else if (type === '매도') g.sell[i + 1] += amount;
+            }
+            if (type !== '매수' && type !== '매도') continue;
+            for (const resolution of RESOLUTIONS) {
+                const start = bucketStart(day, resolution);
+                let b = flows[resolution].get(start);
+                if (!b) flows[resolution].set(start, b = [0, 0]);
+                b[type === '매수' ? 0 : 1] += amount;
+            }
+        }
+    });
+
+    // 일별 합 -> 누적합 (P[k] = dates[:k] 구간 합)
+    for (const g of [...stocks.values(), ...sectors.values()]) {
+        for (let k = 1; k <= n; k++) {
+            g.buy[k] += g.buy[k - 1];
+            g.sell[k] += g.sell[k - 1];
+            g.count[k] += g.count[k - 1];
+        }
+    }
+    const chartSeries = {};
+    for (const resolution of RESOLUTIONS) {
+        const starts = [...flows[resolution].keys()].sort((a, b) => a - b);
+        chartSeries[resolution] = {
+            start: starts,
+            buy: starts.map(s => flows[resolution].get(s)[0]),
+            sell: starts.map(s => flows[resolution].get(s)[1]),
+        };
+    }
+    return {
+        lastUpdated: stored.manifest.lastUpdated,
+        sections: stored.sections.html,
+        columns: { dicts, columns },
+        periodSums: { dates, stocks: [...stocks.values()], sectors: [...sectors.values()] },
+        chartSeries,
+    };
+}
+
+async function dataset() {
+    const stored = await syncOnce();
+    return new Response(JSON.stringify(buildDataset(stored)), {
+        headers: { 'Content-Type': 'application/json; charset=utf-8' },
+    });
+}
+
+// 데이터가 IndexedDB에 있으면 캐시한 셸, 없으면 데이터가 들어 있는 index.html (네트워크)
+async function navigate(req) {
+    const shell = await caches.match(SHELL_URL);
+    let ready = false;
+    try {
+        ready = !!(await loadStored(await openDb())).manifest;
+    } catch (e) {}
+    if (shell && ready) return shell;
+    try {
+        return await fetch(req);
+    } catch (e) {
+        return shell || Response.error();
+    }
+}
+
+async function cacheFirst(req) {
+    const cache = await caches.open(CACHE);
+    const hit = await cache.match(req);
+    if (hit) return hit;
+    const resp = await fetch(req);
+    if (resp.ok || resp.type === 'opaque') cache.put(req, resp.clone());
+    return resp;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE);
+        await cache.add(new Request(SHELL_URL, { cache: 'reload' }));
+        await syncOnce().catch(() => {});
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        for (const key of await caches.keys()) {
+            if (key.startsWith('insider-') && key !== CACHE) await caches.delete(key);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', (event) => {
+    const req = event.request;
+    if (req.method !== 'GET') return;
+    const url = new URL(req.url);
+    if (url.origin === SCOPE.origin) {
+        const path = url.pathname;
+        if (req.mode === 'navigate' && (path === SCOPE.pathname || path === SCOPE.pathname + 'index.html')) {
+            event.respondWith(navigate(req));
+        } else if (path === SCOPE.pathname + 'dataset.json') {
+            event.respondWith(dataset());
+        }
+    } else if (CDN_HOSTS.has(url.hostname)) {
+        event.respondWith(cacheFirst(req));
+    }
+});
+'''
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()[:HASH_LEN]
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def day_rows(trades):
+    """거래 목록 -> {공시일: DAY_FIELDS 순서의 행 목록}"""
+    days = {}
+    for t in trades:
+        row = [t[field] for field in DAY_FIELDS]
+        row[DAY_FIELDS.index("sector")] = row[DAY_FIELDS.index("sector")] or "기타"
+        days.setdefault(t["report_date"], []).append(row)
+    return days
+
+def _write_hashed(directory, stem, suffix, raw, keep):
+    """내용 해시가 들어간 이름으로 저장 (이미 있으면 그대로), 해시 반환"""
+    digest = content_hash(raw)
+    name = f"{stem}.{digest}{suffix}"
+    path = directory / name
+    if not path.exists():
+        path.write_bytes(raw)
+    keep.add(path)
+    return digest
+
+def write_site(data, site_dir=SITE_DIR):
+    """insider.json 데이터 -> 셸, 서비스 워커, 매니페스트, 일별 파일 (manifest 반환)
+
+    manifest에 없는 지난 일별/섹션 파일은 지운다.
+    """
+    days_dir = site_dir / "days"
+    days_dir.mkdir(parents=True, exist_ok=True)
+    keep = set()
+    hashes = {
+        day: _write_hashed(days_dir, day, ".json", _dumps({"date": day, "rows": rows}), keep)
+        for day, rows in sorted(day_rows(data["trades"]).items())
+    }
+    sections = _write_hashed(site_dir, "sections", ".html", render_sections(data).encode("utf-8"), keep)
+    for path in list(days_dir.glob("*.json")) + list(site_dir.glob("sections.*.html")):
+        if path not in keep:
+            path.unlink()
+
+    manifest = {
+        "version": content_hash(_dumps([data["lastUpdated"], hashes, sections])),
+        "lastUpdated": data["lastUpdated"],
+        "period": data.get("period"),
+        "fields": list(DAY_FIELDS),
+        "days": hashes,
+        "sections": sections,
+    }
+    shell = render_shell().encode("utf-8")
+    (site_dir / "app.html").write_bytes(shell)
+    worker = SERVICE_WORKER_JS.replace("__SHELL_VERSION__", content_hash(shell))
+    (site_dir / "sw.js").write_text(worker.lstrip(), encoding="utf-8")
+    (site_dir / "manifest.json").write_bytes(_dumps(manifest))
+    return manifest
+
+def main():
+    manifest = write_site(load_data())
+    print(f"✅ 사이트 데이터 생성: {SITE_DIR} ({len(manifest['days'])}일, 버전 {manifest['version']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
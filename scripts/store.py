@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+거래 데이터 저장소 (일별 파티션 + 작은 요약 파일)
+
+    data/trades/2026-01/2026-01-15.json   공시일(report_date)별 거래, 한 줄에 한 건
+    data/insider.json                     집계 요약 (summary, hotStocks, ... , window)
+
+저장할 때 같은 공시(접수번호 + 종목 + 보고자)의 내용이 바뀌었으면(정정) 그 줄을 바꾸고,
+새 공시는 파일 끝에 덧붙인다. 목록에 없는 공시(철회)는 이번에 오류 없이 조회한 종목(checked)의
+기준일(cutoff) 이후 공시만 지운다 (조회하지 못한 종목의 파티션은 그대로 남음). 내용이 그대로인 파티션은 다시 쓰지 않으므로 매일
+커밋에는 바뀐 날의 파티션과 요약 파일만 남고 git 변경량이 변경 공시 수에 비례한다.
+insider.json에는 거래 목록 대신 기간(window)만 남기고, load_data()가 해당 기간의
+파티션을 읽어 예전과 같은 {"trades": [...], ...} 형태로 돌려준다.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import metrics
+from trade import as_trades, dumps_trade, loads_trades
+
+ROOT = Path(__file__).parent.parent
+DATA_PATH = ROOT / "data" / "insider.json"
+TRADES_DIR = ROOT / "data" / "trades"
+
+def partition_path(day, trades_dir=TRADES_DIR):
+    """YYYY-MM-DD -> data/trades/YYYY-MM/YYYY-MM-DD.json"""
+    return trades_dir / day[:7] / f"{day}.json"
+
+def trade_key(trade):
+    """같은 공시 판별 키 (접수번호 + 종목 + 보고자 - 정정 공시도 같은 키)
+
+    접수번호가 없는 예전 데이터는 공시일과 변동 전후 수량까지 넣어 구분한다.
+    """
+    rcept_no = trade.get("rcept_no") or ""
+    if rcept_no:
+        return (rcept_no, trade["corp_code"], trade["insider_name"])
+    return legacy_key(trade)
+
+def legacy_key(trade):
+    """접수번호 없이 만든 키 (예전 데이터, 또는 예전 데이터와 같은 공시인지 맞춰 볼 때)"""
+    return (
+        "", trade["corp_code"], trade["insider_name"], trade["report_date"],
+        trade["shares_before"], trade["shares_after"], trade["shares_change"],
+    )
+
+def read_partition(path):
+    """파티션 -> Trade 목록"""
+    if not path.exists():
+        return []
+    return loads_trades(path.read_bytes())
+
+def write_partition(path, trades):
+    """한 줄에 한 건씩 기록 (덧붙이면 git diff도 추가된 줄만 나옴)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ",\n".join(dumps_trade(t) for t in trades)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f"[\n{lines}\n]\n")
+    tmp.replace(path)
+
+def _sync_day(existing, current, checked, cutoff):
+    """파티션 하나의 새 내용 (기존 순서 유지, 정정은 제자리 교체, 새 공시는 끝에)
+
+    current에 없는 기존 공시는 checked 종목의 cutoff 이후 것만 지우고 나머지는 그대로 둔다.
+    반환: (새 거래 목록, 추가 수, 정정 수, 삭제 수)
+    """
+    by_key = {}
+    for t in current:
+        by_key[trade_key(t)] = t
+    merged = []
+    placed = set()
+    changed = removed = 0
+    for t in existing:
+        key = trade_key(t)
+        if key not in by_key:
+            if t["corp_code"] in checked and t["report_date"] >= cutoff:
+                removed += 1
+            else:
+                merged.append(t)
+            continue
+        if key in placed:
+            removed += 1
+            continue
+        new = by_key[key]
+        changed += tuple(new) != tuple(t)
+        merged.append(new)
+        placed.add(key)
+    added = [t for key, t in by_key.items() if key not in placed]
+    return merged + added, len(added), changed, removed
+
+def sync_trades(trades, trades_dir=TRADES_DIR, checked=(), cutoff=""):
+    """trades를 파티션에 반영 (바뀐 파티션만 다시 씀)
+
+    trades는 checked 종목의 cutoff 이후 공시 전체여야 한다. 그 종목의 공시 중 목록에 없는
+    것은 철회로 보고 지우며, 거래가 하나도 남지 않은 파티션은 삭제한다. checked를 주지 않으면
+    추가/정정만 한다 (delta.diff_trades와 같은 기준).
+    반환: {"added", "changed", "removed"} 건수
+    """
+    trades = as_trades(trades)
+    checked = set(checked)
+    counts = {"added": 0, "changed": 0, "removed": 0}
+    by_day = {}
+    for t in trades:
+        by_day.setdefault(t["report_date"], []).append(t)
+    days = set(by_day)
+    if checked:
+        days.update(d for d in partition_days(trades_dir) if d >= cutoff)
+
+    for day in sorted(days):
+        path = partition_path(day, trades_dir)
+        existing = read_partition(path)
+        merged, added, changed, removed = _sync_day(existing, by_day.get(day, []), checked, cutoff)
+        counts["added"] += added
+        counts["changed"] += changed
+        counts["removed"] += removed
+        if not (added or changed or removed):
+            continue
+        if merged:
+            write_partition(path, merged)
+        else:
+            path.unlink()
+    return counts
+
+def partition_days(trades_dir=TRADES_DIR):
+    """파티션이 있는 날짜 목록 (정렬)"""
+    return sorted(p.stem for p in trades_dir.glob("*/*.json"))
+
+def load_trades(start=None, end=None, trades_dir=TRADES_DIR):
+    """[start, end] 기간 파티션의 거래 (날짜 순, 같은 날은 기록 순)"""
+    trades = []
+    for day in partition_days(trades_dir):
+        if (start and day < start) or (end and day > end):
+            continue
+        trades.extend(read_partition(partition_path(day, trades_dir)))
+    return trades
+
+def partition_stamp(path):
+    """파티션 변경 감지용 [크기, 수정 시각] (정정은 크기가 같을 수 있어 시각도 봄)"""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+def window_signature(start, end, trades_dir=TRADES_DIR):
+    """기간 안 파티션의 (날짜, 내용 해시) 목록 (체크아웃마다 바뀌는 수정 시각 대신 내용으로)"""
+    return [
+        (day, hashlib.blake2b(partition_path(day, trades_dir).read_bytes(), digest_size=8).hexdigest())
+        for day in partition_days(trades_dir)
+        if start <= day <= end
+    ]
+
+def save_data(data, path=DATA_PATH, trades_dir=TRADES_DIR, checked=(), cutoff=""):
+    """거래는 파티션에 반영하고 요약만 path에 저장 (저장한 요약 UTF-8 바이트 반환)
+
+    checked/cutoff: 이번에 조회한 종목과 기준일 (그 범위의 철회 공시만 지움, sync_trades 참고)
+    """
+    trades = data.get("trades", [])
+    for key, n in sync_trades(trades, trades_dir, checked, cutoff).items():
+        metrics.count(f"trades_{key}", n)
+    days = [t["report_date"] for t in trades]
+    summary = {k: v for k, v in data.items() if k != "trades"}
+    summary["window"] = {"from": min(days), "to": max(days)} if days else None
+    raw = json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(raw)
+    metrics.count("output_bytes", len(raw))
+    return raw
+
+def load_data(path=DATA_PATH, trades_dir=TRADES_DIR):
+    """요약 파일 + 기간 파티션 -> insider.json 형태 데이터 (예전 형식 파일도 그대로 읽음)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "trades" in data:
+        data["trades"] = as_trades(data["trades"])
+    else:
+        window = data.get("window")
+        data["trades"] = load_trades(window["from"], window["to"], trades_dir) if window else []
+    return data
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+수집과 집계를 겹쳐 돌리는 스트리밍 단계
+
+    조회(네트워크) → 파싱·가격 적용(parse_report) → 집계(DataBuilder)
+
+각 단계는 종목 하나의 거래 목록을 내는 제너레이터이고, 단계 사이는 크기가 정해진 큐로
+잇는다. 앞 단계는 백그라운드 스레드에서 돌며 큐가 차면 기다리므로(backpressure) 아직
+집계되지 않은 응답은 큐 크기만큼만 메모리에 남는다. 네트워크 대기 중에는 GIL이 풀려
+메인 스레드가 앞서 도착한 종목을 집계하므로 전체 시간이 조회 시간에 가까워진다.
+"""
+
+import queue
+import threading
+
+QUEUE_SIZE = 8  # 단계 사이에 쌓아 두는 종목 수
+
+def _put(q, item, stop):
+    """큐가 빌 때까지 기다리며 넣기 (소비 쪽이 멈추면 False)"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def bounded(items, maxsize=QUEUE_SIZE):
+    """items를 백그라운드 스레드에서 미리 돌려 maxsize까지 쌓아 두는 제너레이터
+
+    앞 단계에서 난 예외는 소비 쪽에서 다시 발생한다. 소비 쪽이 중간에 멈추면 앞 단계도
+    지금 항목까지만 처리하고 닫힌다 (items의 finally가 실행됨).
+    """
+    q = queue.Queue(maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for item in items:
+                if not _put(q, (None, item), stop):
+                    return
+            _put(q, (None, done), stop)
+        except BaseException as e:
+            _put(q, (e, None), stop)
+        finally:
+            close = getattr(items, "close", None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, name="stream-producer", daemon=True)
+    thread.start()
+    try:
+        while True:
+            error, item = q.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
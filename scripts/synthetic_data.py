@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 합성 내부자 거래 데이터 (시드 고정, 결정적)
+
+종목별 거래 빈도와 내부자별 거래 빈도는 Zipf 분포, 거래 수량은 로그정규 분포를 따른다.
+소수 대형주/대량보유자에 거래가 몰리는 실제 공시 분포를 흉내 낸다.
+"""
+
+import itertools
+import random
+from datetime import date, datetime, time, timedelta
+
+from classifier import classify_reason, trade_type
+from fetch_data import KST, build_data, classify_trade
+
+END_DATE = date(2026, 1, 30)
+
+SECTORS = [
+    "반도체", "자동차", "바이오", "금융", "통신", "에너지", "화학", "철강", "건설", "게임",
+    "엔터", "식품", "운송", "보험", "소재", "전자", "소비재", "핀테크", "조선", "유통",
+]
+
+# 임원 직위 (elestock) - 빈 문자열은 대량보유자 보고 (majorstock)
+POSITIONS = ["대표이사", "사내이사", "사외이사", "부사장", "전무", "상무", "감사"]
+
+# 대량보유 보고 사유와 상대 빈도
+REASONS = [
+    ("- 단순투자목적으로 장내에서 발행회사의 주식 매수", 30),
+    ("단순추가취득/처분", 20),
+    ("장내매도", 15),
+    ("- 보유주식수 변동\n- 보유주식등에 관한 계약의 변경", 10),
+    ("- 보유주식수 변동\n- 유가증권신탁(보유형태 변경 포함)", 6),
+    ("보유주식수 변동,\n주식 증여 및 수증", 5),
+    ("주식매수선택권 행사", 4),
+    ("특별관계자 제외", 4),
+    ("주식 대여상환, 차입 및 차입상환", 3),
+    ("신규보고", 3),
+]
+
+def default_company_count(n_trades):
+    """거래 수에 맞춘 종목 수 (200 ~ 2,500)"""
+    return min(2500, max(200, n_trades // 400))
+
+def _zipf_cum_weights(n, s):
+    return list(itertools.accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+def generate_companies(n_companies, seed=42):
+    """합성 종목 목록 (companies.json 형식)"""
+    rng = random.Random(seed)
+    sector_weights = _zipf_cum_weights(len(SECTORS), 0.8)
+    companies = []
+    for i in range(n_companies):
+        price = int(rng.lognormvariate(10.5, 1.0)) // 100 * 100 or 100
+        companies.append({
+            "corp_code": f"9{i:07d}",
+            "stock_code": f"9{i:05d}",
+            "corp_name": f"합성{i:04d}",
+            "sector": rng.choices(SECTORS, cum_weights=sector_weights)[0],
+            "price": price,
+        })
+    return companies
+
+def _business_days(end, days):
+    start = end - timedelta(days=days)
+    return [start + timedelta(days=i) for i in range(days + 1) if (start + timedelta(days=i)).weekday() < 5]
+
+def generate_trades(n_trades, companies, seed=42, end=END_DATE, period_days=90):
+    """합성 거래 목록 (insider.json trades 형식, 종목/날짜 순)"""
+    rng = random.Random(seed)
+    company_weights = _zipf_cum_weights(len(companies), 1.1)
+    reason_texts = [r for r, _ in REASONS]
+    reason_weights = list(itertools.accumulate(w for _, w in REASONS))
+    days = [d.isoformat() for d in _business_days(end, period_days)]
+    insider_pools = {}
+    receipt_seq = {}
+
+    trades = []
+    for company in rng.choices(companies, cum_weights=company_weights, k=n_trades):
+        code = company["corp_code"]
+        if code not in insider_pools:
+            pool_size = rng.randint(3, 40)
+            insider_pools[code] = (pool_size, _zipf_cum_weights(pool_size, 1.2))
+        pool_size, insider_weights = insider_pools[code]
+        j = rng.choices(range(pool_size), cum_weights=insider_weights)[0]
+
+        # 앞쪽 내부자는 대량보유자, 나머지는 임원
+        if j < 2:
+            insider_name = f"{company['corp_name']} 주주{j}"
+            position = ""
+            reason = rng.choices(reason_texts, cum_weights=reason_weights)[0]
+            change = int(rng.lognormvariate(9, 1.8)) + 1
+            signed = -change if classify_trade(reason) == "매도" else change
+        else:
+            insider_name = f"{company['corp_name']} 임원{j}"
+            position = POSITIONS[j % len(POSITIONS)]
+            reason = ""
+            change = int(rng.lognormvariate(6.5, 1.5)) + 1
+            signed = change if rng.random() < 0.55 else -change
+
+        report_date = rng.choice(days)
+        seq = receipt_seq.get(report_date, 0)
+        receipt_seq[report_date] = seq + 1
+        after = int(rng.lognormvariate(13, 1.5)) + max(signed, 0)
+        category = classify_reason(reason, signed)
+        trades.append({
+            "rcept_no": report_date.replace("-", "") + f"{seq:06d}",
+            "corp_name": company["corp_name"],
+            "corp_code": code,
+            "report_date": report_date,
+            "insider_name": insider_name,
+            "position": position,
+            "change_reason": reason,
+            "shares_before": after - signed,
+            "shares_after": after,
+            "shares_change": change,
+            "trade_type": trade_type(category, reason),
+            "stock_code": company["stock_code"],
+            "sector": company["sector"],
+            "price": company["price"],
+            "amount": change * company["price"],
+            "category": category,
+        })
+
+    trades.sort(key=lambda t: (t["corp_code"], t["report_date"], t["rcept_no"]))
+    return trades
+
+def generate_dataset(n_trades, n_companies=None, seed=42):
+    """insider.json 형식의 합성 데이터셋과 종목 목록"""
+    companies = generate_companies(n_companies or default_company_count(n_trades), seed)
+    trades = generate_trades(n_trades, companies, seed)
+    return build_data(trades, now=datetime.combine(END_DATE, time(9), KST)), companies
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+거래 레코드 타입과 JSON 코덱
+
+Trade는 __slots__ = ()인 namedtuple이라 인스턴스마다 dict 없이 필드 값만 들고(1건 약 180B,
+dict는 약 1.3KB), 종목명/섹터/직위처럼 값 종류가 적은 문자열은 sys.intern으로 한 객체를
+공유한다. 읽을 때 필수 필드, 정수 필드, 날짜를 검증하고 날짜는 YYYY-MM-DD로 정규화한다.
+t["amount"], t.get("sector") 같은 dict 방식 접근을 그대로 지원하므로 집계/생성 코드는
+dict와 Trade를 구분하지 않는다. 튜플이라 json.dumps에 그대로 넘기면 배열이 되므로
+JSON으로 쓸 때는 as_dict()/dumps_trade()를 거친다.
+
+JSON 디코딩은 msgspec → orjson → 표준 json 순으로 설치된 것을 쓴다.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+from aggregate import parse_date
+from classifier import classify_reason
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# insider.json에 기록되는 필드 순서
+FIELDS = (
+    "rcept_no", "corp_name", "corp_code", "report_date", "insider_name", "position",
+    "change_reason", "shares_before", "shares_after", "shares_change", "trade_type",
+    "stock_code", "sector", "price", "amount", "category",
+)
+DEFAULTS = ("", "", "", "", "", "", "", 0, 0, 0, "기타", "", "기타", 0, 0, "기타")
+TRADE_TYPES = ("매수", "매도", "기타")
+
+if msgspec is not None:
+    BACKEND = "msgspec"
+    _decode = msgspec.json.decode
+elif orjson is not None:
+    BACKEND = "orjson"
+    _decode = orjson.loads
+else:
+    BACKEND = "json"
+    _decode = json.loads
+
+_intern = sys.intern
+
+def _to_int(value):
+    """정수 필드 (JSON 정수는 그대로, 문자열/실수는 int로 - bool은 거부)"""
+    if value.__class__ is int:
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"정수가 아님: {value!r}")
+    return int(value or 0)
+
+class TradeError(ValueError):
+    """거래 레코드 검증 실패"""
+
+_dates = {}
+
+def _normalize_date(value):
+    """날짜 문자열 검증/정규화 (서로 다른 값마다 한 번만 파싱)"""
+    day = _dates.get(value)
+    if day is None:
+        day = _dates[value] = _intern(parse_date(value).isoformat())
+    return day
+
+_new = tuple.__new__
+_getitem = tuple.__getitem__
+_POSITIONS = {field: i for i, field in enumerate(FIELDS)}  # 문자열 키는 필드만 (count/index 메서드 제외)
+
+class Trade(namedtuple("Trade", FIELDS, defaults=DEFAULTS)):
+    """거래 한 건 (불변, 필드 순서는 FIELDS)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, d):
+        """dict -> Trade (검증, 날짜 정규화, 범주형 문자열 intern)"""
+        get = d.get
+        try:
+            shares_before = _to_int(get("shares_before", 0))
+            shares_after = _to_int(get("shares_after", 0))
+            change_reason = _intern(get("change_reason") or "")
+            values = (
+                get("rcept_no") or "",
+                _intern(d["corp_name"]),
+                _intern(d["corp_code"]),
+                _normalize_date(d["report_date"]),
+                _intern(get("insider_name") or ""),
+                _intern(get("position") or ""),
+                change_reason,
+                shares_before,
+                shares_after,
+                _to_int(get("shares_change", 0)),
+                _intern(d["trade_type"]),
+                _intern(d["stock_code"]),
+                _intern(get("sector") or "기타"),
+                _to_int(get("price", 0)),
+                _to_int(d["amount"]),
+                # 분류가 없는 예전 레코드는 읽을 때 분류 (사유별 캐시)
+                _intern(get("category") or classify_reason(change_reason, shares_after - shares_before)),
+            )
+        except KeyError as e:
+            raise TradeError(f"필수 필드 누락 {e}: {d}") from None
+        except (AttributeError, TypeError, ValueError) as e:
+            raise TradeError(f"잘못된 값 {e}: {d}") from None
+        if values[10] not in TRADE_TYPES:
+            raise TradeError(f"알 수 없는 trade_type {values[10]!r}")
+        return _new(cls, values)
+
+    def to_dict(self):
+        return dict(zip(FIELDS, self))
+
+    def __getitem__(self, key):
+        """t["amount"] (dict 방식, FIELDS만) 또는 t[14] (튜플 방식)"""
+        if key.__class__ is str:
+            try:
+                return _getitem(self, _POSITIONS[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return _getitem(self, key)
+
+    def get(self, key, default=None):
+        i = _POSITIONS.get(key)
+        return default if i is None else _getitem(self, i)
+
+def as_dict(trade):
+    return trade.to_dict() if isinstance(trade, Trade) else trade
+
+def as_trades(records):
+    """dict/Trade 목록 -> Trade 목록"""
+    from_dict = Trade.from_dict
+    return [r if isinstance(r, Trade) else from_dict(r) for r in records]
+
+def loads_trades(raw):
+    """JSON 배열 바이트 -> Trade 목록"""
+    return as_trades(_decode(raw))
+
+def dumps_trade(trade):
+    """거래 한 건 -> 한 줄 JSON 객체 (파티션 형식)"""
+    return json.dumps(as_dict(trade), ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+거래 메모리 인덱스
+
+거래를 공시일 순으로 정렬해 행 번호를 매기고, 필드 값별 행 번호 목록(해시 인덱스)을 만든다.
+금액은 값 순으로 정렬한 행 번호 목록을 두어 범위 조건도 bisect로 찾는다.
+행 번호가 날짜 순이므로 날짜 범위는 bisect로 [lo, hi) 행 범위가 되고, 해시 인덱스의 행 목록도
+정렬되어 있어 같은 bisect로 범위를 자른다. 여러 조건은 가장 짧은 목록을 기준으로 교집합을 구한다.
+"""
+
+from bisect import bisect_left, bisect_right
+
+DEFAULT_FIELDS = ("stock_code", "corp_name", "insider_name", "position", "sector", "trade_type", "category")
+RANGE_FIELDS = ("amount",)
+
+class TradeIndex:
+    def __init__(self, trades, fields=DEFAULT_FIELDS, range_fields=RANGE_FIELDS):
+        self.trades = sorted(trades, key=lambda t: t["report_date"])
+        self.days = [t["report_date"] for t in self.trades]
+        self.fields = fields
+        self.postings = {field: {} for field in fields}
+        for i, t in enumerate(self.trades):
+            for field in fields:
+                self.postings[field].setdefault(t[field], []).append(i)
+        # 수치 필드: 값 순으로 정렬한 (값 목록, 행 번호 목록)
+        self.sorted_values = {}
+        for field in range_fields:
+            order = sorted(range(len(self.trades)), key=lambda i: self.trades[i][field])
+            self.sorted_values[field] = ([self.trades[i][field] for i in order], order)
+
+    def __len__(self):
+        return len(self.trades)
+
+    def values(self, field, needle):
+        """needle을 포함하는 필드 값 목록 (서로 다른 값만 훑으므로 행 수와 무관)"""
+        return tuple(v for v in self.postings[field] if needle in v)
+
+    def row_range(self, start=None, end=None):
+        """날짜 범위 [start, end] -> 행 범위 [lo, hi)"""
+        lo = bisect_left(self.days, start) if start else 0
+        hi = bisect_right(self.days, end) if end else len(self.days)
+        return lo, hi
+
+    def rows_between(self, field, low=None, high=None):
+        """low <= 값 <= high인 행 번호 (오름차순)"""
+        values, order = self.sorted_values[field]
+        i = bisect_left(values, low) if low is not None else 0
+        j = bisect_right(values, high) if high is not None else len(values)
+        return sorted(order[i:j])
+
+    def select(self, start=None, end=None, ranges=None, **equals):
+        """조건에 맞는 행 번호 (오름차순 = 날짜 순)
+
+        equals는 {필드: 값} 또는 {필드: (값, ...)} (값 중 하나와 일치),
+        ranges는 {수치 필드: (하한, 상한)} (양끝 포함, None은 제한 없음)이다.
+        """
+        lo, hi = self.row_range(start, end)
+        if lo >= hi:
+            return []
+        if not equals and not ranges:
+            return range(lo, hi)
+
+        lists = []
+        for field, (low, high) in (ranges or {}).items():
+            if field not in self.sorted_values:
+                raise KeyError(f"인덱스 없는 필드: {field}")
+            rows = self.rows_between(field, low, high)
+            rows = rows[bisect_left(rows, lo):bisect_left(rows, hi)]
+            if not rows:
+                return []
+            lists.append(rows)
+        for field, value in equals.items():
+            if field not in self.postings:
+                raise KeyError(f"인덱스 없는 필드: {field}")
+            index = self.postings[field]
+            if isinstance(value, (tuple, list, set, frozenset)):
+                rows = sorted(i for v in value for i in index.get(v, ()))
+            else:
+                rows = index.get(value, [])
+            rows = rows[bisect_left(rows, lo):bisect_left(rows, hi)]
+            if not rows:
+                return []
+            lists.append(rows)
+
+        lists.sort(key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            members = set(other)
+            result = [i for i in result if i in members]
+            if not result:
+                break
+        return result
+
+    def page(self, rows, offset=0, limit=50, newest_first=True):
+        """행 번호 목록의 한 페이지 -> 거래 목록"""
+        n = len(rows)
+        if newest_first:
+            picked = [rows[n - 1 - k] for k in range(offset, min(n, offset + limit))]
+        else:
+            picked = rows[offset:offset + limit]
+        return [self.trades[i] for i in picked]
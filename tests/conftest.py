@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# scripts/의 모듈은 평면 import를 쓰므로 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from trade import Trade  # noqa: E402
+
+def _make_trade(rcept_no, insider, day="2026-01-15", change=100, **extra):
+    return Trade.from_dict(dict({
+        "rcept_no": rcept_no,
+        "corp_name": "테스트",
+        "corp_code": "00000001",
+        "report_date": day,
+        "insider_name": insider,
+        "position": "이사",
+        "shares_before": 1000,
+        "shares_after": 1000 + change,
+        "shares_change": abs(change),
+        "trade_type": "매수" if change > 0 else "매도",
+        "stock_code": "000001",
+        "price": 10000,
+        "amount": abs(change) * 10000,
+    }, **extra))
+
+@pytest.fixture
+def make_trade():
+    """make_trade(접수번호, 보고자, day=, change=, **필드) -> Trade (기본 종목 00000001)"""
+    return _make_trade
+
+@pytest.fixture(scope="session")
+def synthetic_trades():
+    """합성 거래 1,500건 (종목 12개, 시드 고정)"""
+    from synthetic_data import generate_companies, generate_trades
+    from trade import as_trades
+
+    return as_trades(generate_trades(1500, generate_companies(12, seed=7), seed=7))
@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+
+from aggregate import build_chart_series, build_period_sums, epoch_day
+
+def naive_sum(trades, key, value, start, end):
+    """[start, end] 기간 거래를 그대로 더한 값"""
+    return sum(value(t) for t in trades if start <= epoch_day(t["report_date"]) <= end and key(t))
+
+def test_period_sums_match_direct_sums(synthetic_trades):
+    sums = build_period_sums(synthetic_trades)
+    dates = sums["dates"]
+    windows = [(0, len(dates)), (0, 1), (len(dates) // 3, len(dates) // 2), (len(dates) - 5, len(dates))]
+    fields = {
+        "buy": lambda t: t["amount"] if t["trade_type"] == "매수" else 0,
+        "sell": lambda t: t["amount"] if t["trade_type"] == "매도" else 0,
+        "count": lambda t: 1,
+    }
+    for lo, hi in windows:
+        start, end = dates[lo], dates[hi - 1]
+        for stock in sums["stocks"]:
+            for field, value in fields.items():
+                expected = naive_sum(synthetic_trades, lambda t: t["stock_code"] == stock["stock_code"], value, start, end)
+                assert stock[field][hi] - stock[field][lo] == expected
+        for sector in sums["sectors"]:
+            expected = naive_sum(synthetic_trades, lambda t: t["sector"] == sector["sector"], fields["buy"], start, end)
+            assert sector["buy"][hi] - sector["buy"][lo] == expected
+
+def test_chart_series_match_calendar_buckets(synthetic_trades):
+    starts = {
+        "daily": lambda d: d,
+        "weekly": lambda d: d - timedelta(days=d.weekday()),
+        "monthly": lambda d: d.replace(day=1),
+    }
+    series = build_chart_series(synthetic_trades)
+    for resolution, start_of in starts.items():
+        expected = {}
+        for t in synthetic_trades:
+            if t["trade_type"] in ("매수", "매도"):
+                key = epoch_day(start_of(date.fromisoformat(t["report_date"])).isoformat())
+                bucket = expected.setdefault(key, [0, 0])
+                bucket[t["trade_type"] == "매도"] += t["amount"]
+        s = series[resolution]
+        assert s["start"] == sorted(expected)
+        assert list(zip(s["buy"], s["sell"])) == [tuple(expected[k]) for k in s["start"]]
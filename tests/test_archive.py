@@ -0,0 +1,79 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import archive  # noqa: E402
+from archive import Archive, build_archive, summarize  # noqa: E402
+from store import load_trades, partition_days, partition_path, read_partition, sync_trades, write_partition  # noqa: E402
+
+@pytest.fixture
+def trades_dir(synthetic_trades, tmp_path):
+    path = tmp_path / "trades"
+    sync_trades(synthetic_trades, path)
+    return path
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(archive, "CHUNK_ROWS", 64)
+
+def stored(trades):
+    """아카이브에 담기는 형태 (변동 사유 원문 제외)"""
+    return [t._replace(change_reason="") for t in trades]
+
+def test_build_round_trips_partitions(trades_dir, tmp_path):
+    rows, added = build_archive(trades_dir, tmp_path / "archive")
+    trades = load_trades(trades_dir=trades_dir)
+    assert rows == added == len(trades)
+    a = Archive(tmp_path / "archive")
+    assert [a.trade(i) for i in range(len(a))] == stored(trades)
+
+def test_incremental_rebuild_matches_full_build(make_trade, trades_dir, tmp_path):
+    build_archive(trades_dir, tmp_path / "archive")
+    days = partition_days(trades_dir)
+    changed = days[-3]
+    path = partition_path(changed, trades_dir)
+    write_partition(path, read_partition(path) + [make_trade("20990101000001", "추가", day=changed)])
+
+    rows, added = build_archive(trades_dir, tmp_path / "archive")
+    trades = load_trades(trades_dir=trades_dir)
+    assert rows == len(trades)
+    assert added == len(load_trades(changed, trades_dir=trades_dir))
+    build_archive(trades_dir, tmp_path / "full")
+    incremental, full = Archive(tmp_path / "archive"), Archive(tmp_path / "full")
+    assert [incremental.trade(i) for i in range(rows)] == [full.trade(i) for i in range(rows)] == stored(trades)
+
+def test_select_matches_filter(trades_dir, tmp_path):
+    build_archive(trades_dir, tmp_path / "archive")
+    a = Archive(tmp_path / "archive")
+    trades = load_trades(trades_dir=trades_dir)
+    codes = {trades[0]["stock_code"], trades[-1]["stock_code"]}
+    threshold = sorted(t["amount"] for t in trades)[len(trades) // 2]
+    cases = [
+        (None, None, (), lambda t: True),
+        ("2025-12-01", "2026-01-10", (), lambda t: "2025-12-01" <= t["report_date"] <= "2026-01-10"),
+        (None, None, [("stock_code", "in", codes)], lambda t: t["stock_code"] in codes),
+        ("2025-11-15", None, [("amount", ">=", threshold), ("insider_name", "~", "임원")],
+         lambda t: t["report_date"] >= "2025-11-15" and t["amount"] >= threshold and "임원" in t["insider_name"]),
+        (None, "2025-12-31", [("trade_type", "not in", {"매수"}), ("amount", "<", threshold)],
+         lambda t: t["report_date"] <= "2025-12-31" and t["trade_type"] != "매수" and t["amount"] < threshold),
+    ]
+    for start, end, conditions, match in cases:
+        rows = a.select(start, end, conditions)
+        assert rows.tolist() == [i for i, t in enumerate(trades) if match(t)]
+    rows = a.select(conditions=[("amount", ">=", threshold)])
+    assert [t["amount"] for t in a.page(rows, limit=10, sort="amount")] == sorted(
+        (t["amount"] for t in trades if t["amount"] >= threshold), reverse=True)[:10]
+
+def test_summarize_matches_direct_sums(trades_dir, tmp_path):
+    build_archive(trades_dir, tmp_path / "archive")
+    trades = load_trades(trades_dir=trades_dir)
+    summary = summarize(Archive(tmp_path / "archive"))
+    monthly = {}
+    for t in trades:
+        entry = monthly.setdefault(t["report_date"][:7], [0, 0])
+        if t["trade_type"] in ("매수", "매도"):
+            entry[t["trade_type"] == "매도"] += t["amount"]
+    assert summary["buyAmount"] == sum(t["amount"] for t in trades if t["trade_type"] == "매수")
+    assert summary["sellAmount"] == sum(t["amount"] for t in trades if t["trade_type"] == "매도")
+    assert [(m["month"], m["buy"], m["sell"]) for m in summary["monthly"]] == [
+        (k, *v) for k, v in sorted(monthly.items())]
@@ -0,0 +1,23 @@
+from backfill import save_history, unit_path, write_atomic
+from fetch_data import REPORTS
+from store import load_trades, sync_trades
+from trade import as_dict
+
+def test_subset_backfill_keeps_other_companies(make_trade, tmp_path):
+    trades_dir = tmp_path / "trades"
+    other = [
+        make_trade("20260115000002", "을", corp_code="00000002"),
+        make_trade("20260301000001", "을", day="2026-03-01", corp_code="00000002"),
+    ]
+    withdrawn = make_trade("20260201000001", "병", day="2026-02-01")
+    sync_trades(other + [withdrawn], trades_dir)
+
+    # 00000001만 백필 (병의 공시는 철회되어 응답에 없음)
+    backfilled = make_trade("20260115000001", "갑")
+    (tmp_path / "units").mkdir()
+    write_atomic(unit_path("00000001", REPORTS[0], tmp_path), [as_dict(backfilled)])
+    write_atomic(unit_path("00000001", REPORTS[1], tmp_path), [])
+    company = {"corp_code": "00000001", "corp_name": "테스트", "stock_code": "000001"}
+    save_history([company], "2016-01-01", tmp_path / "history.json", tmp_path, trades_dir)
+
+    assert sorted(load_trades(trades_dir=trades_dir)) == sorted(other + [backfilled])
@@ -0,0 +1,60 @@
+import pytest
+
+from classifier import classify_reason, trade_type
+
+# 저장된 파티션과 합성 데이터에 나오는 사유 (사유, 수량 변동, 분류)
+STORED_REASONS = [
+    ("단순추가취득/처분", 0, "매매"),
+    ("단순추가취득/처분", 100, "취득"),
+    ("단순추가취득/처분", -100, "처분"),
+    ("특별관계자 제외", 0, "보고"),
+    ("- 대표보고자 변경에 따른 변동보고 (폐지보고)", 0, "보고"),
+    ("- 대표보고자 변경에 따른 신규보고", 0, "보고"),
+    ("발행회사의 제3자배정 유상증자에 따른 주식 취득", 0, "장외취득"),
+    ("특별관계자의 교환사채 교환, 교환사채 계약기간 만료", 0, "보고"),
+    ("- 보유주식수 변동\n- 보유주식등에 관한 계약의 변경", 0, "계약변경"),
+    ("보유주식수 변동,\n주식 증여 및 수증", 0, "증여"),
+    ("- 단순투자목적으로 주식 장내매매\n- 주식대차계약상 최대 차입 가능 수량 변경", 0, "장내매매"),
+    ("- 단순투자목적으로 주식 장내매매\n- 주식대차계약상 최대 차입 가능 수량 변경", -10, "장내매도"),
+    ("주식담보대출 만기연장 및 신규차입 /\n보고자 및 특관자 주식매수, 주식매도 /\n임원퇴임", 0, "매매"),
+    ("보유 주식에 관한 계약의 변경", 0, "계약변경"),
+    ("신규보고", 0, "보고"),
+    ("- 보유주식수 변동\n- 유가증권신탁(보유형태 변경 포함)", 0, "신탁"),
+    ("주식대차계약 종결, 주식근질권계약 종결", 0, "대차"),
+    ("주식 대여상환, 차입 및 차입상환", 0, "대차"),
+    ("- 단순투자목적으로 장내에서 발행회사의 주식 매수\n- 장외에서 발행회사의 증권예탁증권 매수\n- 특별관계자 추가", 0, "장내매수"),
+    ("보유주식 등에 관한 계약의 변경", 0, "계약변경"),
+    ("- 단순투자목적으로 장내에서 발행회사의 주식 매수", 0, "장내매수"),
+    ("1% 지분변동에 따른 변동공시\n(\n※ 25년말 기준 지분율 : 7.76%) ", 0, "보고"),
+    ("장내매도", 0, "장내매도"),
+    ("주식매수선택권 행사", 0, "스톡옵션"),
+    ("", 100, "장내매수"),
+    ("", -100, "장내매도"),
+    ("", 0, "기타"),
+]
+
+# 매수와 매도가 함께 적힌 사유는 수량 변동 부호로 방향을 정한다
+MIXED_REASONS = [
+    ("장내매수, 장내매도", -5, "장내매도"),
+    ("장내매수, 장내매도", 5, "장내매수"),
+    ("장내매도 및 장내매수", -5, "장내매도"),
+    ("장내매도 및 장내매수", 5, "장내매수"),
+    ("- 장내매수\n- 장내매도", -5, "장내매도"),
+    ("- 장내매수\n- 장내매도", 0, "장내매매"),
+    ("주식 처분 및 취득", -5, "처분"),
+    ("주식 처분 및 취득", 5, "취득"),
+    ("주식 처분 및 취득", 0, "매매"),
+    ("장내매수 후 시간외 처분", -5, "장내매도"),
+]
+
+@pytest.mark.parametrize("reason, change, expected", STORED_REASONS + MIXED_REASONS)
+def test_classify_reason(reason, change, expected):
+    assert classify_reason(reason, change) == expected
+
+@pytest.mark.parametrize("reason, change, _", MIXED_REASONS)
+def test_mixed_reason_follows_sign(reason, change, _):
+    kind = trade_type(classify_reason(reason, change), reason)
+    if change < 0:
+        assert kind == "매도"
+    elif change > 0:
+        assert kind == "매수"
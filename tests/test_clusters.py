@@ -0,0 +1,77 @@
+import pytest
+
+from clusters import MAX_NAMES, ClusterDetector, business_day, detect_clusters
+
+def naive_clusters(trades, window_days, min_insiders):
+    """윈도우를 거래마다 처음부터 다시 세는 기준 구현"""
+    by_stock = {}
+    for t in sorted(trades, key=lambda t: (t["stock_code"], t["report_date"])):
+        if t["trade_type"] in ("매수", "매도"):
+            by_stock.setdefault(t["stock_code"], []).append(t)
+    found = []
+    for rows in by_stock.values():
+        days = [business_day(t["report_date"]) for t in rows]
+        amounts = [t["amount"] if t["trade_type"] == "매수" else -t["amount"] for t in rows]
+        clusters = []
+        for k in range(len(rows)):
+            window = [j for j in range(k + 1) if days[k] - days[j] < window_days]
+            net = {}
+            for j in window:
+                net[rows[j]["insider_name"]] = net.get(rows[j]["insider_name"], 0) + amounts[j]
+            buyers = {name for name, value in net.items() if value > 0}
+            if len(buyers) < min_insiders or sum(amounts[j] for j in window) <= 0:
+                continue
+            if not clusters or days[window[0]] > clusters[-1]["end_day"]:
+                clusters.append({"start": rows[window[0]]["report_date"], "rows": set(), "names": set()})
+            cluster = clusters[-1]
+            cluster["rows"].update(window)
+            cluster["names"].update(buyers)
+            cluster["end_day"] = days[k]
+            cluster["end"] = rows[k]["report_date"]
+        for c in clusters:
+            found.append({
+                "stock_code": rows[0]["stock_code"],
+                "name": rows[0]["corp_name"],
+                "sector": rows[0].get("sector") or "기타",
+                "start": c["start"],
+                "end": c["end"],
+                "insiders": len(c["names"]),
+                "names": sorted(c["names"])[:MAX_NAMES],
+                "trades": len(c["rows"]),
+                "buyAmount": sum(amounts[j] for j in c["rows"] if amounts[j] > 0),
+                "netAmount": sum(amounts[j] for j in c["rows"]),
+            })
+    found.sort(key=lambda c: (c["end"], c["netAmount"]), reverse=True)
+    return found
+
+def test_matches_naive_windows(synthetic_trades):
+    for window_days, min_insiders in ((10, 3), (5, 2), (20, 4)):
+        expected = naive_clusters(synthetic_trades, window_days, min_insiders)
+        assert expected
+        assert detect_clusters(synthetic_trades, window_days, min_insiders) == expected
+
+def test_window_drops_old_trades(make_trade):
+    # 금요일 두 건 + 2주 뒤 한 건: 앞의 두 건이 밀려나 3명이 한 윈도우에 모이지 않음
+    trades = [
+        make_trade("1", "갑", day="2026-01-02"),
+        make_trade("2", "을", day="2026-01-02"),
+        make_trade("3", "병", day="2026-01-16"),
+    ]
+    assert detect_clusters(trades) == []
+    trades[2] = make_trade("3", "병", day="2026-01-15")
+    [cluster] = detect_clusters(trades)
+    assert (cluster["start"], cluster["end"], cluster["insiders"], cluster["trades"]) == ("2026-01-02", "2026-01-15", 3, 3)
+
+def test_net_seller_is_not_counted(make_trade):
+    trades = [
+        make_trade("1", "갑"), make_trade("2", "을"), make_trade("3", "병"),
+        make_trade("4", "병", day="2026-01-16", change=-200),
+    ]
+    [cluster] = detect_clusters(trades)
+    assert cluster["names"] == ["갑", "병", "을"] and cluster["end"] == "2026-01-15"
+
+def test_rejects_out_of_order_trades(make_trade):
+    detector = ClusterDetector()
+    detector.add(make_trade("1", "갑", day="2026-01-16"))
+    with pytest.raises(ValueError):
+        detector.add(make_trade("2", "을", day="2026-01-15"))
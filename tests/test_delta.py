@@ -0,0 +1,29 @@
+from delta import diff_trades, trade_id
+
+def test_corrected_filing_is_changed_not_readded(make_trade):
+    kept = make_trade("20260115000001", "갑")
+    withdrawn = make_trade("20260115000002", "을")
+    before = make_trade("20260115000003", "병", change=100)
+    after = make_trade("20260115000003", "병", change=250)
+    new = make_trade("20260116000001", "정", day="2026-01-16")
+    assert trade_id(before) == trade_id(after)
+
+    changes = diff_trades([kept, withdrawn, before], [kept, after, new], ["00000001"], "2026-01-01")
+    assert changes["added"] == [new]
+    assert changes["removed"] == [withdrawn]
+    assert changes["changed"] == [(before, after)]
+
+def test_unchanged_run_reports_nothing(make_trade):
+    trades = [make_trade("20260115000001", "갑"), make_trade("20260115000002", "을")]
+    changes = diff_trades(trades, list(trades), ["00000001"], "2026-01-01")
+    assert changes == {"added": [], "changed": [], "removed": []}
+
+def test_legacy_records_match_refetched_filings(make_trade):
+    legacy = make_trade("", "갑")
+    unmatched = make_trade("", "을", change=300)
+    refetched = make_trade("20260115000001", "갑")
+    new = make_trade("20260115000002", "병")
+    assert trade_id(legacy) != trade_id(refetched)
+
+    changes = diff_trades([legacy, unmatched], [refetched, new], ["00000001"], "2026-01-01")
+    assert changes == {"added": [new], "changed": [], "removed": []}
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from event_study import analyze, event_returns, prices_signature  # noqa: E402
+
+def empty_prices(n_days=3):
+    return {
+        "days": np.arange(20000, 20000 + n_days, dtype=np.int32),
+        "codes": np.array([], dtype="<U6"),
+        "close": np.full((n_days, 0), np.nan),
+        "benchmark": np.full(n_days, 100.0),
+    }
+
+def test_no_stock_columns(make_trade):
+    returns = event_returns(np.array([20000, 20001], dtype=np.int32), np.array(["000001", "000002"]), empty_prices())
+    assert all(np.isnan(ret).all() and np.isnan(excess).all() for ret, excess in returns.values())
+    assert analyze([make_trade("20260115000001", "갑")], empty_prices()) is None
+    assert analyze([make_trade("20260115000001", "갑")], empty_prices(0)) is None
+
+def test_returns_against_benchmark():
+    prices = {
+        "days": np.arange(20000, 20070, dtype=np.int32),
+        "codes": np.array(["000001"]),
+        "close": np.linspace(100, 169, 70).reshape(-1, 1),
+        "benchmark": np.full(70, 50.0),
+    }
+    returns = event_returns(np.array([20000, 19990], dtype=np.int32), np.array(["000001", "000001"]), prices, (5,))
+    ret, excess = returns[5]
+    assert ret[0] == excess[0] == pytest.approx(0.05)
+    assert ret[1] == pytest.approx(0.05)  # 휴장일이면 다음 거래일 종가 기준
+    assert np.isnan(event_returns(np.array([20000]), np.array(["999999"]), prices, (5,))[5][0][0])
+
+def test_prices_signature_ignores_mtime(tmp_path):
+    path = tmp_path / "prices.npz"
+    path.write_bytes(b"prices")
+    before = prices_signature(path)
+    os.utime(path, ns=(0, 0))
+    assert prices_signature(path) == before
+    path.write_bytes(b"changed")
+    assert prices_signature(path) != before
+    assert prices_signature(tmp_path / "missing.npz") is None
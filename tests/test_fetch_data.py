@@ -0,0 +1,40 @@
+from datetime import datetime
+from itertools import groupby
+
+import requests
+
+from benchmark import StubSession
+from fetch_data import KST, DataBuilder, build_data, fetch_trades, iter_company_trades
+from synthetic_data import END_DATE, generate_companies, generate_trades
+
+class FailingSession(StubSession):
+    """fail 종목의 elestock 요청만 실패하는 스텁"""
+
+    def __init__(self, trades, fail):
+        super().__init__(trades)
+        self.fail = fail
+
+    def get(self, url, params=None, timeout=None):
+        if params["corp_code"] == self.fail and url.endswith("/elestock.json"):
+            raise requests.ConnectionError("stub")
+        return super().get(url, params, timeout)
+
+def test_partially_failed_company_is_skipped(monkeypatch):
+    monkeypatch.setattr("fetch_data.RETRY_BACKOFF", 0)
+    companies = generate_companies(5, seed=1)
+    trades = generate_trades(200, companies, seed=1)
+    failed = companies[2]["corp_code"]
+    session = FailingSession(trades, failed)
+
+    codes = [code for code, _ in iter_company_trades("stub", companies, session=session, today=END_DATE)]
+    assert codes == [c["corp_code"] for c in companies if c["corp_code"] != failed]
+    fetched = fetch_trades("stub", companies, session=session, today=END_DATE)
+    assert fetched and all(t["corp_code"] != failed for t in fetched)
+
+def test_data_builder_matches_build_data(synthetic_trades):
+    builder = DataBuilder()
+    for _, company_trades in groupby(synthetic_trades, key=lambda t: t["corp_code"]):
+        builder.add(list(company_trades))
+    assert builder.trades == synthetic_trades
+    now = datetime(2026, 1, 30, 9, tzinfo=KST)
+    assert builder.build(now=now) == build_data(synthetic_trades, now=now)
@@ -0,0 +1,25 @@
+import io
+from types import SimpleNamespace
+
+import query
+from query import COLUMNS, answer, parse_query, run_query
+from trade_index import TradeIndex
+
+def test_answer_takes_parsed_query(synthetic_trades):
+    index = TradeIndex(synthetic_trades)
+    parsed = parse_query("type=매수 amount>=1억")
+    args = SimpleNamespace(sort="amount", limit=5, format="csv", columns=list(COLUMNS))
+    out = io.StringIO()
+    answer(index, parsed, args, out)
+    rows = run_query(index, parsed)
+    assert rows and len(out.getvalue().splitlines()) == 1 + min(5, len(rows))
+
+def test_main_parses_once(monkeypatch, capsys):
+    calls = []
+    parse = query.parse_query
+    monkeypatch.setattr(query, "parse_query", lambda text, today=None: calls.append(text) or parse(text, today))
+    monkeypatch.setattr(query, "load_trades", lambda start=None, end=None: [])
+    assert query.main(["type=매수", "--format", "json"]) == 0
+    assert calls == ["type=매수"]
+    assert query.main(["date=어제"]) == 2
+    assert "알 수 없는 기간" in capsys.readouterr().err
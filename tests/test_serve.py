@@ -0,0 +1,25 @@
+from serve import HASHED_CACHE, HTML_CACHE, App, load_site
+from site_data import write_site
+from trade_index import TradeIndex
+
+def make_app(make_trade, tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>", encoding="utf-8")
+    data = {"lastUpdated": "2026-01-15 09:00", "trades": [make_trade("20260115000001", "갑")]}
+    manifest = write_site(data, tmp_path / "site")
+    return App(load_site(tmp_path, tmp_path / "site"), TradeIndex([])), manifest
+
+def test_site_files_are_served(make_trade, tmp_path):
+    app, manifest = make_app(make_trade, tmp_path)
+    for path in ("/", "/app.html", "/sw.js", "/manifest.json"):
+        status, asset = app.route(path)
+        assert status == 200 and asset.cache_control == HTML_CACHE
+    assert app.route("/sw.js")[1].content_type.startswith("text/javascript")
+
+def test_hashed_files_are_immutable(make_trade, tmp_path):
+    app, manifest = make_app(make_trade, tmp_path)
+    paths = [f"/days/{day}.{digest}.json" for day, digest in manifest["days"].items()]
+    paths.append(f"/sections.{manifest['sections']}.html")
+    for path in paths:
+        status, asset = app.route(path)
+        assert status == 200 and asset.cache_control == HASHED_CACHE
+    assert app.route("/days/missing.json")[0] == 404
@@ -0,0 +1,67 @@
+from store import load_data, load_trades, partition_path, read_partition, save_data, sync_trades, trade_key
+
+def save(trades, tmp_path, checked=("00000001",), cutoff="2026-01-01"):
+    path = tmp_path / "insider.json"
+    save_data({"lastUpdated": "", "trades": trades}, path, tmp_path / "trades", checked, cutoff)
+    return load_data(path, tmp_path / "trades")["trades"]
+
+def test_corrected_filing_keeps_same_key(make_trade):
+    assert trade_key(make_trade("1", "갑", change=100)) == trade_key(make_trade("1", "갑", change=300))
+    assert trade_key(make_trade("1", "갑")) != trade_key(make_trade("1", "을"))
+
+def test_withdrawn_and_corrected_filings(make_trade, tmp_path):
+    kept = make_trade("20260115000001", "갑")
+    withdrawn = make_trade("20260115000002", "을")
+    corrected = make_trade("20260115000003", "병", change=100)
+    assert save([kept, withdrawn, corrected], tmp_path) == [kept, withdrawn, corrected]
+
+    fixed = make_trade("20260115000003", "병", change=250)
+    assert save([kept, fixed], tmp_path) == [kept, fixed]
+    assert read_partition(partition_path("2026-01-15", tmp_path / "trades")) == [kept, fixed]
+
+    # 다시 저장해도 그대로 (철회/정정된 줄이 되살아나지 않음)
+    assert save([kept, fixed], tmp_path) == [kept, fixed]
+
+def test_withdrawn_day_partition_is_removed(make_trade, tmp_path):
+    first = make_trade("20260115000001", "갑", day="2026-01-15")
+    later = make_trade("20260116000001", "을", day="2026-01-16")
+    save([first, later], tmp_path)
+    assert save([first], tmp_path) == [first]
+    assert not partition_path("2026-01-16", tmp_path / "trades").exists()
+
+def test_partitions_before_window_are_kept(make_trade, tmp_path):
+    old = make_trade("20251001000001", "갑", day="2025-10-01")
+    new = make_trade("20260115000001", "을")
+    sync_trades([old, new], tmp_path / "trades")
+    counts = sync_trades([new], tmp_path / "trades", ["00000001"], "2026-01-01")
+    assert counts == {"added": 0, "changed": 0, "removed": 0}
+    assert read_partition(partition_path("2025-10-01", tmp_path / "trades")) == [old]
+
+def test_unchanged_partition_is_not_rewritten(make_trade, tmp_path):
+    t = make_trade("20260115000001", "갑")
+    sync_trades([t], tmp_path / "trades")
+    path = partition_path("2026-01-15", tmp_path / "trades")
+    stamp = path.stat().st_mtime_ns
+    sync_trades([t], tmp_path / "trades")
+    assert path.stat().st_mtime_ns == stamp
+
+def test_failed_company_partitions_survive(make_trade, tmp_path):
+    ok = make_trade("20260115000001", "갑")
+    failed = [
+        make_trade("20260115000002", "을", corp_code="00000002"),
+        make_trade("20260120000001", "을", day="2026-01-20", corp_code="00000002"),
+    ]
+    save([ok] + failed, tmp_path, ["00000001", "00000002"])
+
+    # 00000002 조회 실패: 이번 목록에는 00000001 거래만 있음
+    counts = sync_trades([ok], tmp_path / "trades", ["00000001"], "2026-01-01")
+    assert counts == {"added": 0, "changed": 0, "removed": 0}
+    assert load_trades(trades_dir=tmp_path / "trades") == [ok] + failed
+
+def test_without_checked_nothing_is_removed(make_trade, tmp_path):
+    first = make_trade("20260115000001", "갑")
+    second = make_trade("20260115000002", "을")
+    sync_trades([first, second], tmp_path / "trades")
+    counts = sync_trades([first], tmp_path / "trades")
+    assert counts == {"added": 0, "changed": 0, "removed": 0}
+    assert read_partition(partition_path("2026-01-15", tmp_path / "trades")) == [first, second]
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import trade
+from trade import FIELDS, Trade, TradeError, as_dict, dumps_trade, loads_trades
+
+RECORD = {
+    "rcept_no": "20260115000001",
+    "corp_name": "테스트",
+    "corp_code": "00000001",
+    "report_date": "20260115",
+    "insider_name": "갑",
+    "position": "이사",
+    "change_reason": "장내매수(+)",
+    "shares_before": "1000",
+    "shares_after": 1100,
+    "shares_change": 100,
+    "trade_type": "매수",
+    "stock_code": "000001",
+    "price": 10000,
+    "amount": 1000000,
+}
+
+def _decoder(backend):
+    """msgspec → orjson → json 순서의 각 디코더 (설치되지 않은 것은 건너뜀)"""
+    if backend == "msgspec":
+        return pytest.importorskip("msgspec").json.decode
+    if backend == "orjson":
+        return pytest.importorskip("orjson").loads
+    return json.loads
+
+def test_from_dict_normalizes_and_classifies():
+    t = Trade.from_dict(RECORD)
+    assert t["report_date"] == "2026-01-15"
+    assert t["shares_before"] == 1000
+    assert t["sector"] == "기타"
+    assert t["category"] == "장내매수"
+    assert Trade.from_dict(t.to_dict()) == t
+
+@pytest.mark.parametrize("field, value", [
+    ("corp_name", None),
+    ("report_date", "2026-13-40"),
+    ("shares_after", True),
+    ("amount", "많음"),
+    ("trade_type", "증여"),
+])
+def test_from_dict_rejects_bad_values(field, value):
+    with pytest.raises(TradeError):
+        Trade.from_dict(dict(RECORD, **{field: value}))
+
+@pytest.mark.parametrize("field", ["corp_name", "corp_code", "report_date", "trade_type", "stock_code", "amount"])
+def test_from_dict_requires_fields(field):
+    record = dict(RECORD)
+    del record[field]
+    with pytest.raises(TradeError):
+        Trade.from_dict(record)
+
+def test_string_lookup_is_limited_to_fields():
+    t = Trade.from_dict(RECORD)
+    assert [t[f] for f in FIELDS] == list(t)
+    assert t[14] == t["amount"] == 1000000
+    for name in ("count", "index", "_fields", "missing"):
+        with pytest.raises(KeyError):
+            t[name]
+        assert t.get(name, "-") == "-"
+
+@pytest.mark.parametrize("backend", ["msgspec", "orjson", "json"])
+def test_round_trip_with_each_backend(monkeypatch, backend):
+    monkeypatch.setattr(trade, "_decode", _decoder(backend))
+    trades = [Trade.from_dict(RECORD), Trade.from_dict(dict(RECORD, rcept_no="2", insider_name="을", sector=None))]
+    raw = ("[" + ",".join(dumps_trade(t) for t in trades) + "]").encode("utf-8")
+    assert loads_trades(raw) == trades
+    assert [as_dict(t) for t in loads_trades(raw)] == [dict(zip(FIELDS, t)) for t in trades]
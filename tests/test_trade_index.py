@@ -0,0 +1,46 @@
+from trade_index import TradeIndex
+
+def naive_select(trades, start=None, end=None, ranges=None, **equals):
+    rows = []
+    for i, t in enumerate(trades):
+        if (start and t["report_date"] < start) or (end and t["report_date"] > end):
+            continue
+        if any(t[f] not in (v if isinstance(v, (tuple, list, set, frozenset)) else (v,)) for f, v in equals.items()):
+            continue
+        if any((lo is not None and t[f] < lo) or (hi is not None and t[f] > hi) for f, (lo, hi) in (ranges or {}).items()):
+            continue
+        rows.append(i)
+    return rows
+
+def test_postings_are_sorted_rows(synthetic_trades):
+    index = TradeIndex(synthetic_trades)
+    assert index.days == sorted(index.days)
+    for field, postings in index.postings.items():
+        for value, rows in postings.items():
+            assert rows == [i for i, t in enumerate(index.trades) if t[field] == value]
+    values, order = index.sorted_values["amount"]
+    assert values == sorted(t["amount"] for t in index.trades)
+    assert [index.trades[i]["amount"] for i in order] == values
+
+def test_select_matches_naive_filter(synthetic_trades):
+    index = TradeIndex(synthetic_trades)
+    trades = index.trades
+    codes = (trades[0]["stock_code"], trades[-1]["stock_code"])
+    median = sorted(t["amount"] for t in trades)[len(trades) // 2]
+    cases = [
+        {},
+        {"start": "2025-12-01", "end": "2026-01-10"},
+        {"stock_code": codes},
+        {"trade_type": "매수", "ranges": {"amount": (median, None)}},
+        {"start": "2025-11-15", "sector": trades[0]["sector"], "ranges": {"amount": (None, median)}},
+        {"start": "2026-02-01"},
+        {"stock_code": "없음"},
+    ]
+    for query in cases:
+        assert list(index.select(**query)) == naive_select(trades, **query)
+
+def test_page_is_newest_first(synthetic_trades):
+    index = TradeIndex(synthetic_trades)
+    rows = index.select(trade_type="매도")
+    assert index.page(rows, 0, 5) == [index.trades[i] for i in list(rows)[::-1][:5]]
+    assert index.page(rows, 3, 2, newest_first=False) == [index.trades[i] for i in list(rows)[3:5]]